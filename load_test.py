@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Load-testing harness for the Instagram Comment Sentiment Analysis API.
+
+Replays a JSONL file of /sentiment/analyze payloads (one {"comments": [...]}
+object per line), or synthesizes payloads with a configurable batch-size
+distribution, at a target request rate. Requests are scheduled open-loop, so
+a server that blocks its event loop shows up as rising latency instead of a
+silently lower send rate.
+
+Against a running server:
+    python load_test.py --url http://localhost:8000 --rps 50 --duration 30
+
+Launching a local server with several workers first:
+    python load_test.py --launch --workers 4 --rps 200 --batch-sizes 1:0.6,10:0.3,100:0.1
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent
+
+
+def parse_batch_sizes(spec):
+    """
+    Parse a batch-size distribution like "1:0.6,10:0.3,100:0.1".
+
+    Args:
+        spec (str): Comma-separated size:weight pairs. Weights are relative.
+
+    Returns:
+        tuple: (sizes, weights) lists suitable for random.choices.
+    """
+    sizes, weights = [], []
+    for part in spec.split(","):
+        size, _, weight = part.strip().partition(":")
+        sizes.append(int(size))
+        weights.append(float(weight) if weight else 1.0)
+    if not sizes or any(size <= 0 for size in sizes) or sum(weights) <= 0:
+        raise ValueError(f"Invalid batch size distribution: {spec!r}")
+    return sizes, weights
+
+
+def load_payloads(path):
+    """
+    Load /sentiment/analyze payloads from a JSONL file.
+
+    Args:
+        path (str): Path to a file with one JSON object per line.
+
+    Returns:
+        list: List of (payload, include_details) tuples.
+    """
+    payloads = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict) or not isinstance(record.get("comments"), list):
+                raise ValueError(f"{path}:{line_number}: expected an object with a 'comments' list")
+            include_details = bool(record.pop("include_details", False))
+            payloads.append(({"comments": record["comments"]}, include_details))
+    if not payloads:
+        raise ValueError(f"No payloads found in {path}")
+    return payloads
+
+
+def load_comment_pool(path=None):
+    """
+    Load the comments used to synthesize payloads.
+
+    Args:
+        path (str): CSV file with a 'comment' column. Defaults to sample_comments.csv.
+
+    Returns:
+        list: List of comment strings.
+    """
+    path = path or project_root / "sample_comments.csv"
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        column = "comment" if "comment" in reader.fieldnames else "Comment"
+        return [row[column] for row in reader if row.get(column)]
+
+
+def synthesize_payload(pool, sizes, weights, rng, details_ratio=0.0):
+    """
+    Build a random payload from the comment pool.
+
+    Args:
+        pool (list): Comments to sample from.
+        sizes (list): Possible batch sizes.
+        weights (list): Relative weights of each batch size.
+        rng (random.Random): Random generator.
+        details_ratio (float): Fraction of requests sent with include_details=true.
+
+    Returns:
+        tuple: (payload, include_details).
+    """
+    size = rng.choices(sizes, weights)[0]
+    return {"comments": rng.choices(pool, k=size)}, rng.random() < details_ratio
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values (list): Values sorted in ascending order.
+        pct (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The percentile value, or 0 for an empty list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(records, elapsed):
+    """
+    Summarize per-request records into a report.
+
+    Args:
+        records (list): Dicts with "latency", "comments" and "error" keys.
+        elapsed (float): Wall-clock duration of the run in seconds.
+
+    Returns:
+        dict: Throughput, latency percentiles (ms) and error rates.
+    """
+    latencies = sorted(r["latency"] for r in records if r["error"] is None)
+    errors = [r for r in records if r["error"] is not None]
+    error_kinds = {}
+    for r in errors:
+        error_kinds[r["error"]] = error_kinds.get(r["error"], 0) + 1
+    ok_comments = sum(r["comments"] for r in records if r["error"] is None)
+
+    return {
+        "requests": len(records),
+        "successful": len(latencies),
+        "errors": len(errors),
+        "error_rate": len(errors) / len(records) if records else 0,
+        "error_kinds": error_kinds,
+        "duration_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0,
+        "throughput_comments_per_s": ok_comments / elapsed if elapsed > 0 else 0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": (latencies[-1] * 1000) if latencies else 0,
+        },
+    }
+
+
+async def _send(client, payload, include_details, records):
+    url = "/sentiment/analyze" + ("?include_details=true" if include_details else "")
+    start = time.perf_counter()
+    error = None
+    try:
+        response = await client.post(url, json=payload)
+        if response.status_code >= 400:
+            error = f"HTTP {response.status_code}"
+    except httpx.HTTPError as e:
+        error = type(e).__name__
+    records.append({
+        "latency": time.perf_counter() - start,
+        "comments": len(payload["comments"]),
+        "error": error,
+    })
+
+
+async def run_load(client, next_payload, rps, duration, max_in_flight=256):
+    """
+    Send requests at a fixed rate for a given duration.
+
+    Args:
+        client (httpx.AsyncClient): Client with base_url set to the server.
+        next_payload (callable): Returns the next (payload, include_details) tuple.
+        rps (float): Target requests per second.
+        duration (float): How long to send requests, in seconds.
+        max_in_flight (int): Upper bound on concurrent requests; when reached,
+            requests are counted as "dropped" instead of queueing client-side.
+
+    Returns:
+        dict: Report produced by `summarize`.
+    """
+    records = []
+    tasks = set()
+    interval = 1.0 / rps
+    start = time.perf_counter()
+    sent = 0
+
+    while True:
+        scheduled = start + sent * interval
+        if scheduled - start >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        sent += 1
+
+        payload, include_details = next_payload()
+        if len(tasks) >= max_in_flight:
+            records.append({"latency": 0.0, "comments": len(payload["comments"]), "error": "dropped"})
+            continue
+        task = asyncio.ensure_future(_send(client, payload, include_details, records))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+    return summarize(records, time.perf_counter() - start)
+
+
+def launch_server(port, workers):
+    """
+    Start a local uvicorn server and wait until it answers.
+
+    Args:
+        port (int): Port to listen on.
+        workers (int): Number of uvicorn worker processes.
+
+    Returns:
+        subprocess.Popen: The server process.
+    """
+    env = dict(os.environ, PYTHONPATH=str(project_root))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.app:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=str(project_root),
+        env=env,
+    )
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+
+    process.terminate()
+    raise RuntimeError("Server did not start within 60 seconds")
+
+
+def print_report(report):
+    """Print a human-readable report."""
+    latency = report["latency_ms"]
+    print(f"\nRequests:    {report['requests']} ({report['successful']} ok, {report['errors']} errors)")
+    print(f"Duration:    {report['duration_s']:.1f}s")
+    print(f"Throughput:  {report['throughput_rps']:.1f} req/s, "
+          f"{report['throughput_comments_per_s']:.1f} comments/s")
+    print(f"Latency:     p50 {latency['p50']:.1f}ms  p95 {latency['p95']:.1f}ms  "
+          f"p99 {latency['p99']:.1f}ms  max {latency['max']:.1f}ms")
+    print(f"Error rate:  {report['error_rate'] * 100:.2f}%")
+    for kind, count in sorted(report["error_kinds"].items()):
+        print(f"  {kind}: {count}")
+
+
+async def _main_async(args):
+    rng = random.Random(args.seed)
+    if args.payloads:
+        payloads = load_payloads(args.payloads)
+
+        order = iter(lambda: rng.choice(payloads), None) if args.shuffle else itertools.cycle(payloads)
+
+        def next_payload():
+            payload, include_details = next(order)
+            return payload, include_details or args.include_details
+    else:
+        pool = load_comment_pool(args.comments_csv)
+        sizes, weights = parse_batch_sizes(args.batch_sizes)
+        details_ratio = 1.0 if args.include_details else args.details_ratio
+
+        def next_payload():
+            return synthesize_payload(pool, sizes, weights, rng, details_ratio)
+
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        if args.warmup > 0:
+            await run_load(client, next_payload, args.rps, args.warmup, args.max_in_flight)
+        return await run_load(client, next_payload, args.rps, args.duration, args.max_in_flight)
+
+
+def main():
+    """Main function to run the load test."""
+    parser = argparse.ArgumentParser(description="Load-test the sentiment analysis API.")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the API")
+    parser.add_argument("--launch", action="store_true", help="Launch a local uvicorn server first")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --launch")
+    parser.add_argument("--workers", type=int, default=1, help="Uvicorn workers for --launch")
+    parser.add_argument("--payloads", help="JSONL file of /sentiment/analyze payloads to replay")
+    parser.add_argument("--shuffle", action="store_true", help="Replay payloads in random order")
+    parser.add_argument("--comments-csv", help="CSV to sample synthetic comments from (default: sample_comments.csv)")
+    parser.add_argument("--batch-sizes", default="1:0.5,10:0.3,100:0.2",
+                        help="Synthetic batch-size distribution as size:weight pairs")
+    parser.add_argument("--include-details", action="store_true", help="Request detailed results")
+    parser.add_argument("--details-ratio", type=float, default=0.0,
+                        help="Fraction of synthetic requests sent with include_details=true")
+    parser.add_argument("--rps", type=float, default=20.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured duration in seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured warm-up duration in seconds")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Maximum concurrent requests")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    server = None
+    if args.launch:
+        print(f"Launching server on port {args.port} with {args.workers} worker(s)...")
+        server = launch_server(args.port, args.workers)
+        args.url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        print(f"Sending {args.rps:g} req/s to {args.url} for {args.duration:g}s...")
+        report = asyncio.run(_main_async(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ setup(
         "fastapi",
         "uvicorn",
         "pydantic",
+        "zstandard",
     ],
     extras_require={
         "dev": [
@@ -4,9 +4,45 @@ from fastapi.staticfiles import StaticFiles
 import nltk
 import ssl
 import os
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+from src.api.controllers.admin_controller import get_profiling_use_case, router as admin_router
+from src.api.controllers.health_controller import router as health_router, warm_up
 from src.api.controllers.sentiment_controller import router as sentiment_router
+from src.api.controllers.upload_controller import router as upload_router
+from src.api.middleware.compression import CompressionMiddleware
+from src.api.middleware.limits import BodySizeLimitMiddleware
+from src.api.middleware.profiling import ProfilingMiddleware
+from src.sentiment_analysis.emoji_utils import EmojiTableWatcher, reload_emoji_table
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load the emoji table file, if configured, and keep it up to date while running.
+    
+    The shared analyzer is built and warmed up in the background, so /health
+    answers right away while /ready only succeeds once warm-up has finished.
+    """
+    watcher = None
+    emoji_table_path = os.environ.get("EMOJI_TABLE_PATH")
+    if emoji_table_path:
+        interval = float(os.environ.get("EMOJI_TABLE_WATCH_INTERVAL", 5))
+        if interval > 0:
+            watcher = EmojiTableWatcher(emoji_table_path, interval)
+            watcher.start()
+        else:
+            reload_emoji_table(emoji_table_path)
+    
+    threading.Thread(target=warm_up, name="analyzer-warm-up", daemon=True).start()
+    
+    yield
+    
+    if watcher is not None:
+        watcher.stop()
+
 
 # Initialize the app
 app = FastAPI(
@@ -14,9 +50,13 @@ app = FastAPI(
     description="API for analyzing the sentiment of Instagram comments",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Count requests of admin-started profiling sessions (a no-op while none is running)
+app.add_middleware(ProfilingMiddleware, profiler=get_profiling_use_case())
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -26,6 +66,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject oversized JSON bodies before parsing. Added before compression so it
+# runs inside it and counts decompressed bytes.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_body_size=int(os.environ.get("MAX_BODY_SIZE", 16 * 1024 * 1024)),
+)
+
+# Add response compression (gzip/zstd) and compressed request body support
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get("COMPRESSION_MIN_SIZE", 500)),
+    max_decompressed_size=int(os.environ.get("MAX_DECOMPRESSED_BODY_SIZE", 16 * 1024 * 1024)),
+)
+
 # Set up NLTK data directory  
 project_root = Path(__file__).parent.parent.parent
 nltk_data_dir = os.path.join(project_root, "nltk_data")
@@ -52,6 +106,9 @@ app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
 # Include routers
 app.include_router(sentiment_router)
+app.include_router(upload_router)
+app.include_router(admin_router)
+app.include_router(health_router)
 
 
 @app.get("/", tags=["root"], include_in_schema=False)
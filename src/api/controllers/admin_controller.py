@@ -0,0 +1,163 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from functools import lru_cache
+from typing import Optional
+import hmac
+import os
+
+from src.api.models.admin_models import EmojiTableInfo, ProfileReport, ProfileStatus
+from src.api.use_cases.profiling_use_case import ProfilingUseCase
+from src.sentiment_analysis.emoji_utils import get_emoji_table, reload_emoji_table
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Only allow requests carrying the admin token.
+    
+    Admin endpoints are disabled unless the ADMIN_TOKEN environment variable is set.
+    """
+    token = os.environ.get("ADMIN_TOKEN")
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+    responses={403: {"description": "Missing or invalid admin token"}},
+)
+
+
+def _emoji_table_info() -> EmojiTableInfo:
+    table = get_emoji_table()
+    return EmojiTableInfo(
+        version=table.version,
+        size=len(table),
+        dropped=len(table.dropped),
+        path=os.environ.get("EMOJI_TABLE_PATH")
+    )
+
+
+@router.get("/emoji-table", response_model=EmojiTableInfo, status_code=200)
+async def get_emoji_table_info() -> EmojiTableInfo:
+    """
+    Get the version of the emoji table in use.
+    
+    Returns:
+        The table's version, size, number of dropped keys and source file.
+    """
+    return _emoji_table_info()
+
+
+@router.post("/emoji-table/reload", response_model=EmojiTableInfo, status_code=200)
+async def reload_emoji_table_file() -> EmojiTableInfo:
+    """
+    Reload the emoji table from EMOJI_TABLE_PATH and swap it in.
+    
+    Cached results scored with the previous table are invalidated as they
+    are looked up.
+    
+    Returns:
+        The new table's version, size, number of dropped keys and source file.
+    """
+    path = os.environ.get("EMOJI_TABLE_PATH")
+    if not path:
+        raise HTTPException(status_code=400, detail="EMOJI_TABLE_PATH is not set")
+    
+    try:
+        reload_emoji_table(path)
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not load emoji table: {e}")
+    
+    return _emoji_table_info()
+
+
+@lru_cache(maxsize=1)
+def get_profiling_use_case() -> ProfilingUseCase:
+    """Dependency injection for the worker's ProfilingUseCase (shared with ProfilingMiddleware)."""
+    return ProfilingUseCase()
+
+
+@router.post("/profile/start", response_model=ProfileStatus, status_code=200)
+async def start_profiling(
+    duration: float = Query(30.0, ge=0, le=3600, description="Seconds to profile for (0 for no time bound)"),
+    requests: int = Query(0, ge=0, description="Number of requests to profile (0 for no bound)"),
+    mode: str = Query(
+        "sample",
+        description="'sample' (collapsed stacks of all threads) or 'cprofile' (pstats of the event loop thread "
+                    "only, so scoring run in the threadpool isn't included)"
+    ),
+    memory: bool = Query(True, description="Trace allocations with tracemalloc"),
+    interval: float = Query(0.005, gt=0, le=1, description="Sampling interval in seconds ('sample' mode)"),
+    profiler: ProfilingUseCase = Depends(get_profiling_use_case)
+) -> ProfileStatus:
+    """
+    Start profiling this worker for a bounded duration and/or number of requests.
+    
+    'cprofile' mode only traces the event loop thread: scoring offloaded to
+    the threadpool (WebSocket messages, streamed responses, chunked uploads,
+    CSV analysis) doesn't show up in its report. 'sample' mode covers every
+    thread.
+    
+    Returns:
+        The status of the new session.
+    """
+    try:
+        return ProfileStatus(**profiler.start(duration=duration, max_requests=requests, mode=mode, memory=memory, interval=interval))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/profile", response_model=ProfileStatus, status_code=200)
+async def get_profiling_status(profiler: ProfilingUseCase = Depends(get_profiling_use_case)) -> ProfileStatus:
+    """
+    Get the state of the profiler.
+    
+    Returns:
+        Whether a session is running and whether a report is available.
+    """
+    return ProfileStatus(**profiler.status())
+
+
+@router.post("/profile/stop", response_model=ProfileReport, status_code=200)
+async def stop_profiling(profiler: ProfilingUseCase = Depends(get_profiling_use_case)) -> ProfileReport:
+    """
+    Stop the running session early and return its report.
+    
+    Returns:
+        The report of the session, or of the last finished session.
+    """
+    report = profiler.stop()
+    if report is None:
+        raise HTTPException(status_code=404, detail="No profiling report available")
+    return ProfileReport(**report)
+
+
+@router.get("/profile/report", response_model=ProfileReport, status_code=200)
+async def get_profiling_report(profiler: ProfilingUseCase = Depends(get_profiling_use_case)) -> ProfileReport:
+    """
+    Get the report of the last finished session.
+    
+    Returns:
+        The CPU and memory profile.
+    """
+    if profiler.last_report is None:
+        raise HTTPException(status_code=404, detail="No profiling report available")
+    return ProfileReport(**profiler.last_report)
+
+
+@router.get("/profile/collapsed", response_class=PlainTextResponse, status_code=200)
+async def get_collapsed_stacks(profiler: ProfilingUseCase = Depends(get_profiling_use_case)) -> str:
+    """
+    Get the last 'sample' session's stacks as text for flamegraph.pl or speedscope.
+    
+    Returns:
+        One "frame;frame;frame count" line per distinct stack.
+    """
+    report = profiler.last_report
+    if report is None or report["collapsed"] is None:
+        raise HTTPException(status_code=404, detail="No sampled profile available")
+    return report["collapsed"]
@@ -0,0 +1,127 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from pathlib import Path
+from typing import List, Optional
+import os
+import threading
+import time
+
+import pandas as pd
+
+from src.api.controllers.sentiment_controller import get_sentiment_analyzer_use_case
+from src.api.models.health_models import HealthResponse, MetricsResponse, ReadinessResponse
+
+# Comments scored at startup unless WARMUP_CSV points elsewhere
+DEFAULT_WARMUP_CSV = Path(__file__).parent.parent.parent.parent / "sample_comments.csv"
+
+router = APIRouter(tags=["health"])
+
+
+class ReadinessState:
+    """Tracks whether this worker's shared analyzer is built and warmed up."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.status = "starting"
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.warmup_comments = 0
+        self.error = None
+    
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+    
+    def update(self, **fields) -> None:
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+
+readiness = ReadinessState()
+
+
+def load_warmup_comments(path: Optional[str]) -> List[str]:
+    """
+    Read the warm-up comments from a CSV with a 'comment' or 'Comment' column.
+    
+    Args:
+        path: Path to the CSV file, or None/empty to skip scoring a warm-up batch.
+        
+    Returns:
+        The warm-up comments.
+    """
+    if not path:
+        return []
+    df = pd.read_csv(path, encoding="utf-8")
+    column = "comment" if "comment" in df.columns else "Comment"
+    return df[column].dropna().astype(str).tolist()
+
+
+def warm_up(path: Optional[str] = None) -> None:
+    """
+    Build the shared analyzer and score the warm-up batch, then flip readiness.
+    
+    Args:
+        path: CSV of warm-up comments. Defaults to the WARMUP_CSV environment
+            variable, or sample_comments.csv; an empty value skips the batch.
+    """
+    if path is None:
+        path = os.environ.get("WARMUP_CSV", str(DEFAULT_WARMUP_CSV))
+    
+    try:
+        readiness.update(status="starting", error=None)
+        start = time.perf_counter()
+        use_case = get_sentiment_analyzer_use_case()
+        readiness.update(status="warming_up", load_seconds=time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        scored = use_case.warm_up(load_warmup_comments(path))
+        readiness.update(status="ready", warmup_seconds=time.perf_counter() - start, warmup_comments=scored)
+    except Exception as e:
+        readiness.update(status="failed", error=str(e))
+
+
+@router.get("/health", response_model=HealthResponse, status_code=200)
+async def health() -> HealthResponse:
+    """
+    Liveness probe: the process is up and serving requests.
+    
+    Returns:
+        A constant 'ok' status.
+    """
+    return HealthResponse(status="ok")
+
+
+@router.get("/ready", response_model=ReadinessResponse, status_code=200)
+async def ready():
+    """
+    Readiness probe: the shared analyzer is built and warmed up.
+    
+    Returns:
+        The warm-up state with load times and cache statistics; 503 until ready.
+    """
+    cache = get_sentiment_analyzer_use_case().get_cache_stats() if readiness.ready else None
+    response = ReadinessResponse(
+        ready=readiness.ready,
+        status=readiness.status,
+        load_seconds=readiness.load_seconds,
+        warmup_seconds=readiness.warmup_seconds,
+        warmup_comments=readiness.warmup_comments,
+        cache=cache,
+        error=readiness.error
+    )
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content=response.model_dump())
+    return response
+
+
+@router.get("/metrics", response_model=MetricsResponse, status_code=200)
+async def metrics() -> MetricsResponse:
+    """
+    Cache and routing statistics of this worker's shared analyzer.
+    
+    Returns:
+        Result cache, response cache, pre-filter route and cascade statistics.
+    """
+    return MetricsResponse(**get_sentiment_analyzer_use_case().get_metrics())
@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Query, Depends, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse, StreamingResponse
-from typing import Optional
+from fastapi import APIRouter, Query, Depends, UploadFile, File, HTTPException, WebSocket, WebSocketDisconnect, Header
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import pandas as pd
 import io
-import csv
+import os
+import asyncio
+import json
+import threading
+from functools import lru_cache
+from starlette.concurrency import run_in_threadpool
 
-from src.api.models.sentiment_models import CommentRequest, SentimentResponse
+from src.api.models.sentiment_models import (
+    CommentRequest,
+    SentimentResponse,
+    StreamSummaryResponse,
+    WeightSweepResponse
+)
+from src.api.middleware.compression import DecompressingReader, DecompressionError, upload_encoding
+from src.api.use_cases.results_csv import infer_column_types, write_results_csv
 from src.api.use_cases.sentiment_analyzer_use_case import SentimentAnalyzerUseCase
 
 router = APIRouter(
@@ -15,30 +27,180 @@ router = APIRouter(
 )
 
 
+# Serializes the first build of the shared use case; lru_cache alone lets the
+# warm-up thread and early requests construct it concurrently
+_use_case_lock = threading.Lock()
+
+
 def get_sentiment_analyzer_use_case() -> SentimentAnalyzerUseCase:
-    """Dependency injection for SentimentAnalyzerUseCase."""
-    return SentimentAnalyzerUseCase(model_type="vader", emoji_weight=0.3)
+    """
+    Dependency injection for SentimentAnalyzerUseCase.
+    
+    The use case is built once and shared across requests so its result
+    cache and statistics persist. Callers that arrive while it is being
+    built wait for that instance instead of building their own.
+    """
+    with _use_case_lock:
+        return _build_sentiment_analyzer_use_case()
+
+
+@lru_cache(maxsize=1)
+def _build_sentiment_analyzer_use_case() -> SentimentAnalyzerUseCase:
+    return SentimentAnalyzerUseCase(
+        model_type=os.environ.get("SENTIMENT_MODEL_TYPE", "vader"),
+        emoji_weight=0.3,
+        model_path=os.environ.get("SENTIMENT_MODEL_PATH"),
+        fast_model_type=os.environ.get("SENTIMENT_FAST_MODEL_TYPE"),
+        fast_model_path=os.environ.get("SENTIMENT_FAST_MODEL_PATH"),
+        uncertainty_band=float(os.environ.get("SENTIMENT_UNCERTAINTY_BAND", 0.1)),
+        cache_size=int(os.environ.get("SENTIMENT_CACHE_SIZE", 10000)),
+        chunk_size=int(os.environ.get("ANALYZE_CHUNK_SIZE", 10000)),
+        response_cache_size=int(os.environ.get("RESPONSE_CACHE_SIZE", 256)),
+        response_cache_max_bytes=int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+        response_cache_max_entry_bytes=int(os.environ.get("RESPONSE_CACHE_MAX_ENTRY_BYTES", 4 * 1024 * 1024)),
+        shared_cache_name=os.environ.get("SHARED_CACHE_NAME") or None,
+        shared_cache_size=int(os.environ.get("SHARED_CACHE_SIZE", 262144))
+    )
+
+
+def request_limit_error(comments: List[str]) -> Optional[Tuple[int, str]]:
+    """
+    Check a comment batch against the MAX_COMMENTS_PER_REQUEST and MAX_COMMENT_LENGTH limits.
+    
+    Args:
+        comments: The comments of one request or message.
+        
+    Returns:
+        None if the batch is allowed, else an (HTTP status, message) tuple.
+    """
+    max_comments = int(os.environ.get("MAX_COMMENTS_PER_REQUEST", 100000))
+    
+    if len(comments) > max_comments:
+        return 413, f"Too many comments: {len(comments)} (maximum {max_comments} per request)"
+    
+    return comment_length_error(comments)
+
+
+def comment_length_error(comments: List[str], offset: int = 0) -> Optional[Tuple[int, str]]:
+    """
+    Check comments against the MAX_COMMENT_LENGTH limit.
+    
+    Args:
+        comments: The comments, e.g. one chunk of a CSV file.
+        offset: Position of the first comment in its request, for the message.
+        
+    Returns:
+        None if every comment is allowed, else an (HTTP status, message) tuple.
+    """
+    max_length = int(os.environ.get("MAX_COMMENT_LENGTH", 10000))
+    
+    for i, comment in enumerate(comments):
+        if len(comment) > max_length:
+            return 422, f"Comment {offset + i} exceeds the maximum length of {max_length} characters"
+    
+    return None
+
+
+def check_request_limits(request: CommentRequest) -> None:
+    """
+    Enforce the per-request limits on JSON comment batches.
+    
+    The body size itself is limited by BodySizeLimitMiddleware before parsing,
+    which is what bounds the parsing work; this checks the
+    MAX_COMMENTS_PER_REQUEST and MAX_COMMENT_LENGTH limits of the parsed
+    request before anything is scored.
+    
+    Args:
+        request: The parsed comment request.
+        
+    Raises:
+        HTTPException: 413 for too many comments, 422 for a too long comment.
+    """
+    error = request_limit_error(request.comments)
+    if error is not None:
+        raise HTTPException(status_code=error[0], detail=error[1])
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+    
+    Args:
+        if_none_match: The raw header value, if any.
+        etag: The quoted ETag of the response.
+        
+    Returns:
+        True if the client already has the response.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
 
 
 @router.post("/analyze", response_model=SentimentResponse, status_code=200)
 async def analyze_sentiment(
     request: CommentRequest,
     include_details: bool = Query(False, description="Include detailed analysis for each comment"),
+    group_by: Optional[List[str]] = Query(None, description="Request columns to compute per-group summaries over"),
+    top_k: int = Query(0, ge=0, le=1000, description="Report the top-K most positive/negative comments and emoji statistics"),
+    if_none_match: Optional[str] = Header(None),
     use_case: SentimentAnalyzerUseCase = Depends(get_sentiment_analyzer_use_case)
 ) -> SentimentResponse:
     """
     Analyze the sentiment of a list of Instagram comments.
     
+    Responses carry an ETag derived from the request and analyzer
+    configuration. Repeated identical requests are answered from a bounded
+    cache of serialized responses, and requests whose If-None-Match matches
+    get a 304 without a body. Detailed responses to requests of more than
+    ANALYZE_CHUNK_SIZE comments are streamed, one chunk of results at a
+    time, and not cached.
+    
     Args:
-        request: Request object containing a list of comments.
+        request: Request object containing a list of comments and, optionally,
+            extra per-comment columns.
         include_details: Whether to include detailed results for each comment.
+        group_by: Names of request columns to compute per-group summaries over.
+        top_k: Number of most positive/negative comments to report, along with
+            emoji statistics. 0 disables these insights.
+        if_none_match: ETags of responses the client already has.
         use_case: Sentiment analyzer use case (injected).
         
     Returns:
         A response containing sentiment analysis results.
     """
+    check_request_limits(request)
+    
+    etag = use_case.response_etag(request, include_details, group_by, top_k)
+    if etag_matches(if_none_match, etag):
+        use_case.not_modified += 1
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    body = use_case.response_cache.get(etag)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+    
+    if include_details and len(request.comments) > use_case.chunk_size:
+        try:
+            stream = use_case.analyze_comments_stream(request, group_by, top_k)
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+        return StreamingResponse(stream, media_type="application/json", headers={"ETag": etag})
+    
     try:
-        return use_case.analyze_comments(request, include_details)
+        response = use_case.analyze_comments(request, include_details, group_by, top_k)
+        body = response.model_dump_json().encode("utf-8")
+        use_case.response_cache.put(etag, body)
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": str(e)}
+        )
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -46,9 +208,56 @@ async def analyze_sentiment(
         )
 
 
+def _comment_column(df: pd.DataFrame) -> str:
+    """
+    Find the comment column of a CSV file.
+    
+    Args:
+        df: The CSV file, or a chunk of it.
+        
+    Returns:
+        The name of the 'comment' or 'Comment' column.
+    """
+    if 'comment' in df.columns:
+        return 'comment'
+    if 'Comment' in df.columns:
+        return 'Comment'
+    raise HTTPException(
+        status_code=400, 
+        detail="CSV must contain a 'comment' or 'Comment' column"
+    )
+
+
+def _csv_comment_chunks(reader: Iterable[pd.DataFrame]) -> Iterator[List[str]]:
+    """
+    Yield the non-empty comments of each chunk of a CSV file.
+    
+    Args:
+        reader: The CSV file, read in chunks.
+        
+    Yields:
+        The comments of each chunk, checked against MAX_COMMENT_LENGTH.
+    """
+    offset = 0
+    for chunk in reader:
+        comments = chunk[_comment_column(chunk)].dropna().astype(str).tolist()
+        error = comment_length_error(comments, offset)
+        if error is not None:
+            raise HTTPException(status_code=error[0], detail=error[1])
+        offset += len(comments)
+        yield comments
+
+
 @router.post("/analyze-csv", response_model=SentimentResponse, status_code=200)
 async def analyze_csv(
     file: UploadFile = File(...),
+    group_by: Optional[List[str]] = Query(None, description="CSV columns to compute per-group summaries over"),
+    top_k: int = Query(0, ge=0, le=1000, description="Report the top-K most positive/negative comments and emoji statistics"),
+    approximate: bool = Query(False, description="Estimate the summary from a random sample of the comments"),
+    tolerance: float = Query(1.0, ge=0, le=100, description="Target margin of error of approximate percentages"),
+    confidence: float = Query(0.95, gt=0, lt=1, description="Confidence level of approximate margins of error"),
+    max_samples: Optional[int] = Query(None, ge=1, description="Maximum number of comments scored in approximate mode"),
+    infer_group_types: bool = Query(True, description="Parse numeric group_by values as numbers; false keeps them as written"),
     use_case: SentimentAnalyzerUseCase = Depends(get_sentiment_analyzer_use_case)
 ) -> SentimentResponse:
     """
@@ -56,49 +265,293 @@ async def analyze_csv(
     
     Args:
         file: CSV file containing comments (should have a 'comment' column).
+            May be gzip (.csv.gz) or zstd (.csv.zst) compressed.
+        group_by: CSV columns (e.g. post ID or date) to compute per-group summaries over.
+        top_k: Number of most positive/negative comments to report, along with
+            emoji statistics. 0 disables these insights.
+        approximate: Score a random sample until the percentages are within
+            `tolerance` percentage points at the `confidence` level, and return
+            the estimated summary with its error bounds instead of detailed results.
+        tolerance: Target margin of error of the percentages in approximate mode.
+        confidence: Confidence level of the margins of error in approximate mode.
+        max_samples: Maximum number of comments scored in approximate mode.
+        infer_group_types: Type the group_by values over the whole file, like
+            read_csv does. Set it to false to get the values as written, e.g.
+            when the file is one shard of a larger one whose types are
+            inferred once all shards are merged.
         use_case: Sentiment analyzer use case (injected).
         
     Returns:
         A response containing sentiment analysis results.
     """
-    if not file.filename.endswith('.csv'):
+    if approximate and (group_by or top_k):
+        raise HTTPException(
+            status_code=400,
+            detail="group_by and top_k are not supported in approximate mode"
+        )
+    
+    if not file.filename.endswith(('.csv', '.csv.gz', '.csv.zst')):
         raise HTTPException(status_code=400, detail="File must be a CSV")
     
     try:
-        # Read CSV file
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode('utf-8')))
-        
-        # Check if 'comment' or 'Comment' column exists
-        comment_column = None
-        if 'comment' in df.columns:
-            comment_column = 'comment'
-        elif 'Comment' in df.columns:
-            comment_column = 'Comment'
-        else:
-            raise HTTPException(
-                status_code=400, 
-                detail="CSV must contain a 'comment' or 'Comment' column"
+        # Read CSV file, decompressing it on the fly if the upload is compressed
+        stream = file.file
+        encoding = upload_encoding(file.filename)
+        if encoding is not None:
+            stream = DecompressingReader(stream, encoding)
+        # Comments are kept verbatim even when they look like numbers
+        dtype = {'comment': str, 'Comment': str}
+        # Group columns are typed over the whole file below, not per chunk
+        dtype.update({column: str for column in group_by or []})
+        reader = pd.read_csv(stream, encoding='utf-8', dtype=dtype, chunksize=use_case.chunk_size)
+        
+        if approximate:
+            # Sample while reading, so huge uploads are never held in memory;
+            # the reservoir bounds the work, so only comment lengths are limited
+            response = use_case.estimate_comment_chunks(
+                _csv_comment_chunks(reader), tolerance, confidence, max_samples
             )
+            if response.summary.total_comments == 0:
+                raise HTTPException(status_code=400, detail="No valid comments found in CSV")
+            return response
         
-        # Extract comments and filter out empty ones
-        comments = df[comment_column].dropna().astype(str).tolist()
+        # Filter out empty comments, keeping the group_by columns aligned.
+        # Limits are checked chunk by chunk, so an oversized file is rejected
+        # before it's parsed whole
+        max_comments = int(os.environ.get("MAX_COMMENTS_PER_REQUEST", 100000))
+        frames = []
+        total = 0
+        for chunk in reader:
+            comment_column = _comment_column(chunk)
+            if not frames:
+                missing = [column for column in group_by or [] if column not in chunk.columns]
+                if missing:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"CSV has no column(s): {', '.join(missing)}"
+                    )
+            chunk = chunk[chunk[comment_column].notna()]
+            error = comment_length_error(chunk[comment_column].astype(str).tolist(), total)
+            if error is not None:
+                raise HTTPException(status_code=error[0], detail=error[1])
+            total += len(chunk)
+            if total > max_comments:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Too many comments: more than {max_comments} (maximum {max_comments} per request)"
+                )
+            frames.append(chunk)
+        
+        if not frames:
+            raise HTTPException(status_code=400, detail="No valid comments found in CSV")
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        comments = df[comment_column].astype(str).tolist()
         
         if not comments:
             raise HTTPException(status_code=400, detail="No valid comments found in CSV")
         
         # Create request object and analyze
-        request = CommentRequest(comments=comments)
-        return use_case.analyze_comments(request, include_details=True)
+        columns = None
+        if group_by:
+            df = infer_column_types(df[group_by]) if infer_group_types else df[group_by]
+            columns = {
+                column: df[column].astype(object).where(df[column].notna(), None).tolist()
+                for column in group_by
+            }
+        request = CommentRequest(comments=comments, columns=columns)
+        return use_case.analyze_comments(request, include_details=True, group_by=group_by, top_k=top_k)
         
+    except HTTPException:
+        raise
     except pd.errors.EmptyDataError:
         raise HTTPException(status_code=400, detail="CSV file is empty")
     except pd.errors.ParserError:
         raise HTTPException(status_code=400, detail="Invalid CSV format")
+    except DecompressionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 
+@router.post("/sweep", response_model=WeightSweepResponse, status_code=200)
+async def sweep_emoji_weights(
+    request: CommentRequest,
+    emoji_weights: List[float] = Query([0.1, 0.3, 0.5], description="Emoji weights to compare"),
+    use_case: SentimentAnalyzerUseCase = Depends(get_sentiment_analyzer_use_case)
+) -> WeightSweepResponse:
+    """
+    Compare summary statistics of comments under several emoji weights.
+    
+    Args:
+        request: Request object containing a list of comments.
+        emoji_weights: The emoji weights (0-1) to compare.
+        use_case: Sentiment analyzer use case (injected).
+        
+    Returns:
+        One summary per emoji weight.
+    """
+    check_request_limits(request)
+    
+    try:
+        return use_case.sweep_emoji_weights(request, emoji_weights)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": str(e)}
+        )
+
+
+@router.post("/stream/{stream_id}", response_model=StreamSummaryResponse, status_code=200)
+async def push_stream_comments(
+    stream_id: str,
+    request: CommentRequest,
+    use_case: SentimentAnalyzerUseCase = Depends(get_sentiment_analyzer_use_case)
+) -> StreamSummaryResponse:
+    """
+    Push newly arrived comments of a live post or account.
+    
+    Args:
+        stream_id: Post or account ID the comments belong to.
+        request: Request object containing the new comments.
+        use_case: Sentiment analyzer use case (injected).
+        
+    Returns:
+        Rolling sentiment statistics (last 1 min, 15 min and 1 h) for the stream.
+    """
+    check_request_limits(request)
+    return use_case.push_stream_comments(stream_id, request)
+
+
+@router.get("/stream/{stream_id}", response_model=StreamSummaryResponse, status_code=200)
+async def get_stream_summary(
+    stream_id: str,
+    use_case: SentimentAnalyzerUseCase = Depends(get_sentiment_analyzer_use_case)
+) -> StreamSummaryResponse:
+    """
+    Get the current rolling sentiment statistics of a live post or account.
+    
+    Args:
+        stream_id: Post or account ID.
+        use_case: Sentiment analyzer use case (injected).
+        
+    Returns:
+        Rolling sentiment statistics (last 1 min, 15 min and 1 h) for the stream.
+    """
+    return use_case.get_stream_summary(stream_id)
+
+
+async def _score_ws_message(
+    message: str,
+    sequence: int,
+    use_case: SentimentAnalyzerUseCase
+) -> Dict[str, Any]:
+    """
+    Score one WebSocket message and build its reply.
+    
+    Args:
+        message: Raw text of the message.
+        sequence: Position of the message in the session, used as its ID
+            when the client doesn't send one.
+        use_case: Sentiment analyzer use case.
+        
+    Returns:
+        The reply, carrying the message ID and either results or an error.
+    """
+    try:
+        data = json.loads(message)
+    except json.JSONDecodeError:
+        return {"id": sequence, "error": "Message must be a JSON object"}
+    if not isinstance(data, dict):
+        return {"id": sequence, "error": "Message must be a JSON object"}
+    
+    message_id = data.get("id", sequence)
+    comments = data.get("comments")
+    if comments is None and "comment" in data:
+        comments = [data["comment"]]
+    if not isinstance(comments, list) or not all(isinstance(c, str) for c in comments):
+        return {"id": message_id, "error": "Message must have a 'comment' string or a 'comments' list of strings"}
+    
+    error = request_limit_error(comments)
+    if error is not None:
+        return {"id": message_id, "error": error[1]}
+    
+    # Score off the event loop so other sessions keep being served
+    results = await run_in_threadpool(use_case.score_comments, comments)
+    return {"id": message_id, "results": [result.model_dump(mode="json") for result in results]}
+
+
+@router.websocket("/ws")
+async def sentiment_websocket(
+    websocket: WebSocket,
+    use_case: SentimentAnalyzerUseCase = Depends(get_sentiment_analyzer_use_case)
+) -> None:
+    """
+    Score comments continuously over a WebSocket session.
+    
+    Each message is a JSON object with a 'comment' string or a 'comments'
+    list and an optional 'id'. Every message gets one reply in order,
+    {"id": ..., "results": [...]} or {"id": ..., "error": "..."}, where the
+    ID is the client's or the message's position in the session.
+    
+    At most WS_MAX_PENDING_MESSAGES received messages are queued. Once the
+    queue is full the server stops reading from the socket until replies
+    have been sent, so a client that sends faster than it reads is slowed
+    down by TCP backpressure instead of growing server memory. Queued
+    messages are dropped once the client disconnects, and a binary frame
+    closes the session with code 1003 (1011 for other read errors).
+    
+    Args:
+        websocket: The WebSocket connection.
+        use_case: Sentiment analyzer use case (injected, shared across sessions).
+    """
+    await websocket.accept()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=int(os.environ.get("WS_MAX_PENDING_MESSAGES", 16)))
+    # Set by the reader once the session is over; queued messages are then dropped
+    stopped = asyncio.Event()
+    close_code: Optional[int] = None
+    
+    async def read_messages() -> None:
+        nonlocal close_code
+        sequence = 0
+        try:
+            while True:
+                message = await websocket.receive_text()
+                await queue.put((sequence, message))
+                sequence += 1
+        except WebSocketDisconnect:
+            pass
+        except KeyError:
+            # receive_text() on a binary frame
+            close_code = 1003
+        except Exception:
+            close_code = 1011
+        finally:
+            stopped.set()
+            # Never block here: with a full queue the main loop sees `stopped`
+            try:
+                queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+    
+    reader = asyncio.create_task(read_messages())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None or stopped.is_set():
+                break
+            sequence, message = item
+            reply = await _score_ws_message(message, sequence, use_case)
+            if stopped.is_set():
+                break
+            await websocket.send_json(reply)
+        if close_code is not None:
+            await websocket.close(code=close_code)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
+
+
 @router.post("/download-csv")
 async def download_csv(results: SentimentResponse):
     """
@@ -113,35 +566,7 @@ async def download_csv(results: SentimentResponse):
     try:
         # Create CSV data
         output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['comment', 'sentiment', 'compound_score', 'positive_score', 'negative_score', 'neutral_score', 'emojis'])
-        
-        # Write data rows
-        for result in results.results:
-            emojis_str = ','.join(result.emojis) if result.emojis else ''
-            writer.writerow([
-                result.comment,
-                result.sentiment,
-                result.scores.compound,
-                result.scores.positive,
-                result.scores.negative,
-                result.scores.neutral,
-                emojis_str
-            ])
-        
-        # Add summary row
-        writer.writerow([])  # Empty row
-        writer.writerow(['SUMMARY'])
-        writer.writerow(['Total Comments', results.summary.total_comments])
-        writer.writerow(['Positive Comments', results.summary.positive_comments])
-        writer.writerow(['Negative Comments', results.summary.negative_comments])
-        writer.writerow(['Neutral Comments', results.summary.neutral_comments])
-        writer.writerow(['Positive Percentage', f"{results.summary.positive_percentage:.1f}%"])
-        writer.writerow(['Negative Percentage', f"{results.summary.negative_percentage:.1f}%"])
-        writer.writerow(['Neutral Percentage', f"{results.summary.neutral_percentage:.1f}%"])
-        writer.writerow(['Average Compound Score', results.summary.average_compound])
+        write_results_csv(output, results)
         
         # Create response
         output.seek(0)
@@ -0,0 +1,173 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse, JSONResponse
+from functools import lru_cache
+import os
+from starlette.concurrency import run_in_threadpool
+
+from src.api.controllers.sentiment_controller import get_sentiment_analyzer_use_case
+from src.api.models.sentiment_models import SentimentResponse
+from src.api.models.upload_models import UploadRequest, UploadStatus
+from src.api.use_cases.upload_use_case import UploadNotFoundError, UploadOrderError, UploadUseCase
+
+router = APIRouter(
+    prefix="/sentiment/uploads",
+    tags=["uploads"],
+    responses={404: {"description": "Upload session not found"}},
+)
+
+
+@lru_cache(maxsize=1)
+def get_upload_use_case() -> UploadUseCase:
+    """
+    Dependency injection for UploadUseCase.
+
+    Uploads are scored with the shared sentiment analyzer use case.
+    """
+    return UploadUseCase(
+        get_sentiment_analyzer_use_case(),
+        upload_dir=os.environ.get("UPLOAD_DIR") or None,
+        chunk_size=int(os.environ.get("UPLOAD_CHUNK_SIZE", 1024 * 1024)),
+        max_upload_size=int(os.environ.get("MAX_UPLOAD_SIZE", 1024 * 1024 * 1024)),
+        session_ttl=float(os.environ.get("UPLOAD_SESSION_TTL", 24 * 3600)),
+        max_comment_length=int(os.environ.get("MAX_COMMENT_LENGTH", 10000))
+    )
+
+
+def not_found(upload_id: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Upload {upload_id} not found or expired")
+
+
+@router.post("", response_model=UploadStatus, status_code=201)
+async def create_upload(
+    request: UploadRequest,
+    uploads: UploadUseCase = Depends(get_upload_use_case)
+) -> UploadStatus:
+    """
+    Start a chunked upload of a CSV file.
+
+    Args:
+        request: The file name and size, and the insights to compute.
+        uploads: Upload use case (injected).
+
+    Returns:
+        The session, including the chunk size to split the file by.
+    """
+    try:
+        return UploadStatus(**await run_in_threadpool(uploads.create, request.filename, request.size, request.top_k))
+    except ValueError as e:
+        status_code = 413 if str(e).startswith("File exceeds") else 400
+        raise HTTPException(status_code=status_code, detail=str(e))
+
+
+@router.get("/{upload_id}", response_model=UploadStatus, status_code=200)
+async def get_upload(upload_id: str, uploads: UploadUseCase = Depends(get_upload_use_case)) -> UploadStatus:
+    """
+    Get the progress of an upload, e.g. to resume it from `next_chunk`.
+
+    Args:
+        upload_id: ID of the upload session.
+        uploads: Upload use case (injected).
+
+    Returns:
+        The session status.
+    """
+    try:
+        return UploadStatus(**await run_in_threadpool(uploads.status, upload_id))
+    except UploadNotFoundError:
+        raise not_found(upload_id)
+
+
+@router.put("/{upload_id}/chunks/{index}", response_model=UploadStatus, status_code=200)
+async def put_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    uploads: UploadUseCase = Depends(get_upload_use_case)
+) -> UploadStatus:
+    """
+    Upload the next chunk of a file; its complete CSV records are scored right away.
+
+    The body is the chunk's raw bytes. Chunks must be sent in order;
+    re-sending an already received chunk is accepted and ignored.
+
+    Args:
+        upload_id: ID of the upload session.
+        index: Index of the chunk, starting at 0.
+        request: The request whose body is the chunk.
+        uploads: Upload use case (injected).
+
+    Returns:
+        The session status.
+    """
+    data = bytearray()
+    async for part in request.stream():
+        data.extend(part)
+        if len(data) > uploads.chunk_size:
+            raise HTTPException(status_code=413, detail=f"Chunks are at most {uploads.chunk_size} bytes")
+
+    try:
+        return UploadStatus(**await run_in_threadpool(uploads.put_chunk, upload_id, index, bytes(data)))
+    except UploadNotFoundError:
+        raise not_found(upload_id)
+    except UploadOrderError as e:
+        return JSONResponse(status_code=409, content={"detail": str(e), "next_chunk": e.expected})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/{upload_id}/finalize", response_model=SentimentResponse, status_code=200)
+async def finalize_upload(upload_id: str, uploads: UploadUseCase = Depends(get_upload_use_case)) -> SentimentResponse:
+    """
+    Finish an upload once every chunk is received.
+
+    Args:
+        upload_id: ID of the upload session.
+        uploads: Upload use case (injected).
+
+    Returns:
+        The summary (and insights) of the whole file. Per-comment results are
+        downloaded from /sentiment/uploads/{upload_id}/results.csv.
+    """
+    try:
+        return await run_in_threadpool(uploads.finalize, upload_id)
+    except UploadNotFoundError:
+        raise not_found(upload_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{upload_id}/results.csv", status_code=200)
+async def download_upload_results(upload_id: str, uploads: UploadUseCase = Depends(get_upload_use_case)):
+    """
+    Download the results CSV of a finalized upload.
+
+    Args:
+        upload_id: ID of the upload session.
+        uploads: Upload use case (injected).
+
+    Returns:
+        The same file /sentiment/download-csv produces for the whole CSV.
+    """
+    try:
+        path = await run_in_threadpool(uploads.results_path, upload_id)
+    except UploadNotFoundError:
+        raise not_found(upload_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return FileResponse(path, media_type="text/csv", filename="sentiment_analysis_results.csv")
+
+
+@router.delete("/{upload_id}", status_code=204)
+async def delete_upload(upload_id: str, uploads: UploadUseCase = Depends(get_upload_use_case)) -> Response:
+    """
+    Delete an upload session and its files.
+
+    Args:
+        upload_id: ID of the upload session.
+        uploads: Upload use case (injected).
+    """
+    try:
+        await run_in_threadpool(uploads.delete, upload_id)
+    except UploadNotFoundError:
+        raise not_found(upload_id)
+    return Response(status_code=204)
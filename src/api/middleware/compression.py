@@ -0,0 +1,420 @@
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional, gzip is always available
+    zstandard = None
+
+
+def supported_encodings() -> List[str]:
+    """Return the content encodings this server can produce and accept, in order of preference."""
+    if zstandard is not None:
+        return ["zstd", "gzip"]
+    return ["gzip"]
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into a mapping of coding -> q-value.
+
+    Args:
+        header: Raw Accept-Encoding header value.
+
+    Returns:
+        Dictionary mapping lower-cased content codings to their quality values.
+    """
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(header: str) -> Optional[str]:
+    """
+    Pick the best response encoding for an Accept-Encoding header.
+
+    Args:
+        header: Raw Accept-Encoding header value.
+
+    Returns:
+        The chosen encoding ("zstd" or "gzip"), or None if the response should be sent uncompressed.
+    """
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _Compressor:
+    """Incremental compressor with a common interface for gzip and zstd."""
+
+    def __init__(self, encoding: str, gzip_level: int, zstd_level: int):
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+        else:
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+# A zstd block inflates to at most 128 KiB and an RLE block takes only 4 bytes
+_ZSTD_MAX_BLOCK_SIZE = 128 * 1024
+_ZSTD_MIN_BLOCK_BYTES = 4
+# Smallest zstd input slice, which inflates to at most 2 MiB of RLE blocks;
+# smaller slices make decompression call-bound
+_ZSTD_MIN_STEP = 64
+
+
+class _Decompressor:
+    """
+    Incremental decompressor with a common interface for gzip and zstd.
+
+    Like ``zlib.decompressobj``, ``decompress`` takes a ``max_length`` and
+    leaves the input it didn't get to in ``unconsumed_tail``, so a small
+    compressed chunk can't inflate into an unbounded buffer.
+    """
+
+    def __init__(self, encoding: str):
+        self.unconsumed_tail = b""
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdDecompressor().decompressobj()
+            self._flush = None
+        else:
+            # 32 + MAX_WBITS auto-detects gzip and zlib headers
+            self._obj = zlib.decompressobj(32 + zlib.MAX_WBITS)
+            self._flush = self._obj.flush
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        if self._flush is not None:
+            output = self._obj.decompress(data, max_length)
+            self.unconsumed_tail = self._obj.unconsumed_tail
+            return output
+        if not max_length:
+            self.unconsumed_tail = b""
+            return self._obj.decompress(data)
+        # zstandard has no max_length, so feed slices whose worst-case output
+        # still fits. Output comes in whole blocks, so max_length may be
+        # overshot by one block, or by one minimal slice of RLE blocks
+        pieces = []
+        produced = 0
+        view = memoryview(data)
+        while view and produced < max_length:
+            blocks = (max_length - produced) // _ZSTD_MAX_BLOCK_SIZE
+            step = max(blocks * _ZSTD_MIN_BLOCK_BYTES, _ZSTD_MIN_STEP)
+            piece = self._obj.decompress(view[:step].tobytes())
+            pieces.append(piece)
+            produced += len(piece)
+            view = view[step:]
+        self.unconsumed_tail = view.tobytes()
+        return b"".join(pieces)
+
+    def flush(self) -> bytes:
+        return self._flush() if self._flush is not None else b""
+
+
+class DecompressionError(ValueError):
+    """Raised when a compressed stream is corrupt or exceeds the allowed size."""
+
+
+class DecompressingReader:
+    """
+    File-like wrapper that lazily decompresses a gzip or zstd stream.
+
+    Data is pulled from the underlying file object in fixed-size chunks, so
+    consumers such as ``pd.read_csv`` can parse a compressed upload without the
+    decompressed payload ever being held in memory at once.
+    """
+
+    def __init__(self, fileobj, encoding: str, chunk_size: int = 64 * 1024):
+        self._fileobj = fileobj
+        self._decompressor = _Decompressor(encoding)
+        self._chunk_size = chunk_size
+        self._buffer = b""
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self, size: int) -> None:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = self._decompressor.unconsumed_tail or self._fileobj.read(self._chunk_size)
+            try:
+                if not chunk:
+                    self._buffer += self._decompressor.flush()
+                    self._eof = True
+                else:
+                    wanted = size - len(self._buffer) if size >= 0 else 0
+                    self._buffer += self._decompressor.decompress(chunk, max(wanted, self._chunk_size))
+            except (zlib.error, getattr(zstandard, "ZstdError", zlib.error)) as e:
+                raise DecompressionError(f"Invalid compressed data: {e}") from e
+
+    def read(self, size: int = -1) -> bytes:
+        self._fill(size)
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        while b"\n" not in self._buffer and not self._eof:
+            self._fill(len(self._buffer) + self._chunk_size)
+        if not self._buffer:
+            raise StopIteration
+        line, sep, rest = self._buffer.partition(b"\n")
+        self._buffer = rest
+        return line + sep
+
+
+def upload_encoding(filename: str, content_type: Optional[str] = None) -> Optional[str]:
+    """
+    Detect whether an uploaded file is itself compressed.
+
+    Args:
+        filename: Name of the uploaded file.
+        content_type: Content type declared for the multipart part, if any.
+
+    Returns:
+        "gzip" or "zstd" for compressed uploads, None for plain files.
+    """
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith(".gz") or content_type in ("application/gzip", "application/x-gzip"):
+        return "gzip"
+    if name.endswith(".zst") or content_type == "application/zstd":
+        return "zstd"
+    return None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware for negotiated response compression and compressed request bodies.
+
+    Responses larger than ``minimum_size`` are compressed with zstd or gzip
+    according to the client's Accept-Encoding, and their ETags are weakened
+    since they no longer identify the uncompressed bytes. Request bodies sent with a
+    ``Content-Encoding`` of gzip or zstd are decompressed incrementally as the
+    application reads them, so multipart parsing and CSV ingestion stay streamed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        max_decompressed_size: Optional[int] = None,
+        decompress_chunk_size: int = 64 * 1024,
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application.
+            minimum_size: Responses smaller than this many bytes are sent uncompressed.
+            gzip_level: Compression level for gzip (1-9).
+            zstd_level: Compression level for zstd (1-22).
+            max_decompressed_size: Upper bound on the decompressed request body size in bytes.
+            decompress_chunk_size: Largest decompressed request body chunk passed to the
+                application at once.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.max_decompressed_size = max_decompressed_size
+        self.decompress_chunk_size = decompress_chunk_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+
+        request_encoding = headers.get("content-encoding", "").strip().lower()
+        if request_encoding and request_encoding != "identity":
+            if request_encoding not in supported_encodings():
+                response = PlainTextResponse(
+                    f"Unsupported Content-Encoding: {request_encoding}", status_code=415
+                )
+                await response(scope, receive, send)
+                return
+            scope, receive = self._decompress_request(scope, receive, request_encoding)
+
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            app_send = send
+        else:
+            app_send = _CompressionResponder(self, encoding, send, headers.get("if-none-match", "")).send
+
+        response_started = False
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await app_send(message)
+
+        try:
+            await self.app(scope, receive, tracking_send)
+        except DecompressionError as e:
+            if response_started:
+                raise
+            response = PlainTextResponse(str(e), status_code=400)
+            await response(scope, receive, send)
+
+    def _decompress_request(self, scope: Scope, receive: Receive, encoding: str) -> Tuple[Scope, Receive]:
+        """Strip encoding headers from the scope and wrap receive() to inflate body chunks."""
+        scope = dict(scope)
+        scope["headers"] = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        decompressor = _Decompressor(encoding)
+        limit = self.max_decompressed_size
+        chunk_size = self.decompress_chunk_size
+        total = 0
+        pending = b""
+        more_body = True
+        finished = False
+
+        async def decompressing_receive() -> Message:
+            nonlocal total, pending, more_body, finished
+            if finished:
+                return await receive()
+            if not pending:
+                message = await receive()
+                if message["type"] != "http.request":
+                    return message
+                pending = message.get("body", b"")
+                more_body = message.get("more_body", False)
+            try:
+                # Inflate at most chunk_size bytes and keep the rest of the input
+                # for the next call, so a bomb never materializes in memory
+                body = decompressor.decompress(pending, chunk_size)
+                pending = decompressor.unconsumed_tail
+                if not more_body and not pending:
+                    body += decompressor.flush()
+                    finished = True
+            except (zlib.error, getattr(zstandard, "ZstdError", zlib.error)) as e:
+                raise DecompressionError(f"Invalid compressed request body: {e}") from e
+            total += len(body)
+            if limit is not None and total > limit:
+                raise DecompressionError("Decompressed request body exceeds the allowed size")
+            return {"type": "http.request", "body": body, "more_body": not finished}
+
+        return scope, decompressing_receive
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    """
+    Turn a strong ETag into a weak one.
+
+    A strong ETag identifies exact bytes, so it can't be shared by the
+    compressed and uncompressed bodies of a response. If-None-Match uses weak
+    comparison, so clients still get 304s with the weakened tag.
+    """
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class _CompressionResponder:
+    """Per-response state for CompressionMiddleware."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send, if_none_match: str = ""):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.if_none_match = if_none_match
+        self.initial_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.started = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers
+            if not self.passthrough and message["status"] == 304:
+                # Revalidates the body the client holds: answer with the weak
+                # tag if that's the compressed one it got from us
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if etag is not None and f"W/{etag}" in self.if_none_match:
+                    _weaken_etag(headers)
+                headers.add_vary_header("Accept-Encoding")
+                self.passthrough = True
+            if self.passthrough:
+                await self.downstream(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if not more_body and len(body) < self.middleware.minimum_size:
+                # Small responses are not worth the compression overhead
+                await self.downstream(self.initial_message)
+                await self.downstream(message)
+                self.passthrough = True
+                return
+
+            self.compressor = _Compressor(
+                self.encoding, self.middleware.gzip_level, self.middleware.zstd_level
+            )
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            _weaken_etag(headers)
+            compressed = self.compressor.compress(body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                compressed += self.compressor.flush()
+                headers["Content-Length"] = str(len(compressed))
+            await self.downstream(self.initial_message)
+            await self.downstream({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            return
+
+        compressed = self.compressor.compress(body)
+        if not more_body:
+            compressed += self.compressor.flush()
+        await self.downstream({"type": "http.response.body", "body": compressed, "more_body": more_body})
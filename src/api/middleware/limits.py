@@ -0,0 +1,106 @@
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodyTooLargeError(HTTPException):
+    """
+    Raised when a request body grows past the configured limit while being read.
+
+    It is an HTTPException so frameworks that wrap body-reading errors (FastAPI
+    turns them into 400s) pass it through as a 413.
+    """
+
+    def __init__(self, max_body_size: int):
+        super().__init__(
+            status_code=413,
+            detail=f"Request body exceeds the maximum size of {max_body_size} bytes",
+        )
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware rejecting oversized request bodies before they are parsed.
+
+    A declared Content-Length above the limit is rejected with 413 without
+    reading the body at all; chunked or decompressed bodies are counted as
+    they are received and rejected as soon as they pass the limit, so the
+    application never buffers more than ``max_body_size`` bytes.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_size: Optional[int] = None,
+        content_types: Tuple[str, ...] = ("application/json",),
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application.
+            max_body_size: Maximum request body size in bytes. None disables the limit.
+            content_types: Media types the limit applies to. It also applies to
+                `+json` media types and bodies without a Content-Type, which
+                FastAPI parses as JSON too. Uploads (multipart, raw chunks) are
+                streamed to disk and bounded elsewhere.
+        """
+        self.app = app
+        self.max_body_size = max_body_size
+        self.content_types = content_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.max_body_size is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if not self._is_limited(media_type):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            await self._reject(scope, receive, send)
+            return
+
+        limit = self.max_body_size
+        total = 0
+
+        async def limited_receive() -> Message:
+            nonlocal total
+            message = await receive()
+            if message["type"] == "http.request":
+                total += len(message.get("body", b""))
+                if total > limit:
+                    raise BodyTooLargeError(limit)
+            return message
+
+        response_started = False
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except BodyTooLargeError:
+            if response_started:
+                raise
+            await self._reject(scope, receive, send)
+
+    def _is_limited(self, media_type: str) -> bool:
+        """Whether bodies of a media type are parsed as JSON and so subject to the limit."""
+        return not media_type or media_type in self.content_types or media_type.endswith("+json")
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = PlainTextResponse(
+            f"Request body exceeds the maximum size of {self.max_body_size} bytes", status_code=413
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,36 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.api.use_cases.profiling_use_case import ProfilingUseCase
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware counting requests towards a profiling session's request limit.
+
+    When no session is running it only checks one attribute per request;
+    admin requests (which control the profiler) are never counted.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: ProfilingUseCase, excluded_prefix: str = "/admin"):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application.
+            profiler: The worker's profiler.
+            excluded_prefix: Path prefix of requests that aren't counted.
+        """
+        self.app = app
+        self.profiler = profiler
+        self.excluded_prefix = excluded_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.profiler.session is None or scope["type"] != "http" \
+                or scope["path"].startswith(self.excluded_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.profiler.request_finished()
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class EmojiTableInfo(BaseModel):
+    version: str = Field(..., description="Version of the emoji table in use")
+    size: int = Field(..., description="Number of emojis in the table")
+    dropped: int = Field(0, description="Number of table keys ignored because they aren't single emojis")
+    path: Optional[str] = Field(None, description="File the table is reloaded from (EMOJI_TABLE_PATH)")
+
+
+class ProfileStatus(BaseModel):
+    active: bool = Field(..., description="Whether a profiling session is running")
+    mode: Optional[str] = Field(None, description="Mode of the running session")
+    elapsed_seconds: Optional[float] = Field(None, description="Time since the running session started")
+    requests: int = Field(0, description="Requests handled during the running session")
+    report_available: bool = Field(..., description="Whether a finished session's report can be fetched")
+
+
+class AllocationSite(BaseModel):
+    location: str = Field(..., description="File and line of the allocation site")
+    size_kb: float = Field(..., description="Memory allocated there and still alive, in KiB")
+    count: int = Field(..., description="Number of live allocations")
+
+
+class ProfileReport(BaseModel):
+    mode: str = Field(..., description="'sample' (all threads) or 'cprofile' (event loop thread only)")
+    duration_seconds: float = Field(..., description="How long the session ran")
+    requests: int = Field(..., description="Requests handled during the session")
+    samples: int = Field(..., description="Number of stack samples taken ('sample' mode)")
+    pstats: Optional[str] = Field(None, description="pstats listing sorted by cumulative time ('cprofile' mode)")
+    collapsed: Optional[str] = Field(None, description="Collapsed stacks for flamegraph tools ('sample' mode)")
+    memory: Optional[List[AllocationSite]] = Field(None, description="Top allocation sites from tracemalloc")
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional, Union
+
+
+class HealthResponse(BaseModel):
+    status: str = Field(..., description="Always 'ok' while the process is serving requests")
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool = Field(..., description="Whether the analyzer is built and warmed up")
+    status: str = Field(..., description="'starting', 'warming_up', 'ready' or 'failed'")
+    load_seconds: Optional[float] = Field(None, description="Time taken to build the shared analyzer")
+    warmup_seconds: Optional[float] = Field(None, description="Time taken to score the warm-up batch")
+    warmup_comments: int = Field(0, description="Number of comments scored during warm-up")
+    cache: Optional[Dict[str, Union[int, float]]] = Field(None, description="Result cache statistics of the shared analyzer")
+    error: Optional[str] = Field(None, description="Why warm-up failed, if it did")
+
+
+class MetricsResponse(BaseModel):
+    result_cache: Dict[str, Union[int, float]] = Field(..., description="Per-comment result cache statistics")
+    response_cache: Dict[str, Union[int, float]] = Field(
+        ..., description="Serialized /sentiment/analyze response cache statistics, including 304 replies"
+    )
+    routes: Dict[str, int] = Field(
+        ..., description="Number of comments scored by each pre-filter route; reused results aren't routed"
+    )
+    reused: int = Field(
+        0, description="Number of comments answered from the result cache or an identical comment of their batch"
+    )
+    cascade: Dict[str, Any] = Field(..., description="Cascade mode statistics")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Union
+from typing import Any, List, Dict, Optional, Union
 from enum import Enum
 
 
@@ -11,6 +11,9 @@ class SentimentType(str, Enum):
 
 class CommentRequest(BaseModel):
     comments: List[str] = Field(..., description="List of comments to analyze")
+    columns: Optional[Dict[str, List[Any]]] = Field(
+        None, description="Extra per-comment columns (one value per comment) that can be used with group_by"
+    )
 
 
 class SentimentScores(BaseModel):
@@ -38,6 +41,73 @@ class SentimentSummary(BaseModel):
     average_compound: float = Field(..., description="Average compound sentiment score")
 
 
+class GroupSummary(BaseModel):
+    group: Dict[str, Any] = Field(..., description="Values of the group_by columns for this group")
+    summary: SentimentSummary = Field(..., description="Summary statistics of the group's comments")
+
+
+class ExtremeComment(BaseModel):
+    comment: str = Field(..., description="The original comment text")
+    compound: float = Field(..., description="The comment's compound sentiment score")
+
+
+class EmojiStats(BaseModel):
+    emoji: str = Field(..., description="The emoji")
+    count: int = Field(..., description="Number of occurrences across all comments")
+    comments: int = Field(..., description="Number of comments containing the emoji")
+    contribution: float = Field(..., description="Summed contribution of the emoji to compound scores")
+    average_compound: float = Field(..., description="Average compound score of comments containing the emoji")
+
+
+class CommentInsights(BaseModel):
+    most_positive: List[ExtremeComment] = Field(..., description="Most positive comments, highest score first")
+    most_negative: List[ExtremeComment] = Field(..., description="Most negative comments, lowest score first")
+    emojis: List[EmojiStats] = Field(..., description="Emoji statistics, most frequent first")
+
+
+class SummaryMargins(BaseModel):
+    positive_percentage: float = Field(..., description="Margin of error of the positive percentage (percentage points)")
+    negative_percentage: float = Field(..., description="Margin of error of the negative percentage (percentage points)")
+    neutral_percentage: float = Field(..., description="Margin of error of the neutral percentage (percentage points)")
+    average_compound: float = Field(..., description="Margin of error of the average compound score")
+
+
+class SummaryEstimate(BaseModel):
+    sampled_comments: int = Field(..., description="Number of comments actually scored")
+    population: int = Field(..., description="Total number of comments the summary is estimated for")
+    confidence: float = Field(..., description="Confidence level of the margins of error")
+    exact: bool = Field(..., description="Whether every comment was scored, making the summary exact")
+    margins: SummaryMargins = Field(..., description="Half-widths of the confidence intervals")
+
+
 class SentimentResponse(BaseModel):
     summary: SentimentSummary = Field(..., description="Summary statistics of sentiment analysis")
-    results: Optional[List[CommentAnalysis]] = Field(None, description="Individual comment analysis results")
\ No newline at end of file
+    results: Optional[List[CommentAnalysis]] = Field(None, description="Individual comment analysis results")
+    groups: Optional[List[GroupSummary]] = Field(None, description="Summary statistics per group_by group")
+    insights: Optional[CommentInsights] = Field(None, description="Top-K extreme comments and emoji statistics")
+    estimate: Optional[SummaryEstimate] = Field(None, description="Sampling details when the summary is approximate")
+
+
+class WeightSummary(SentimentSummary):
+    emoji_weight: float = Field(..., description="Emoji weight the summary was computed with")
+
+
+class WeightSweepResponse(BaseModel):
+    configs: List[WeightSummary] = Field(..., description="Summary statistics for each emoji weight")
+
+
+class WindowSummary(BaseModel):
+    window_seconds: int = Field(..., description="Length of the sliding window in seconds")
+    total_comments: int = Field(..., description="Number of comments received in the window")
+    positive_comments: int = Field(..., description="Number of positive comments in the window")
+    negative_comments: int = Field(..., description="Number of negative comments in the window")
+    neutral_comments: int = Field(..., description="Number of neutral comments in the window")
+    positive_percentage: float = Field(..., description="Percentage of positive comments in the window")
+    negative_percentage: float = Field(..., description="Percentage of negative comments in the window")
+    neutral_percentage: float = Field(..., description="Percentage of neutral comments in the window")
+    average_compound: float = Field(..., description="Average compound sentiment score in the window")
+
+
+class StreamSummaryResponse(BaseModel):
+    stream_id: str = Field(..., description="Post or account ID the comments belong to")
+    windows: List[WindowSummary] = Field(..., description="Rolling statistics for each sliding window")
\ No newline at end of file
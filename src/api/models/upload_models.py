@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class UploadRequest(BaseModel):
+    filename: str = Field(..., description="Name of the CSV file being uploaded")
+    size: int = Field(..., ge=0, description="Size of the file in bytes")
+    top_k: int = Field(0, ge=0, le=1000, description="Report the top-K most positive/negative comments and emoji statistics")
+
+
+class UploadStatus(BaseModel):
+    upload_id: str = Field(..., description="ID of the upload session")
+    filename: str = Field(..., description="Name of the CSV file being uploaded")
+    size: int = Field(..., description="Size of the file in bytes")
+    chunk_size: int = Field(..., description="Bytes per chunk; every chunk but the last must be exactly this size")
+    total_chunks: int = Field(..., description="Number of chunks the file is split into")
+    next_chunk: int = Field(..., description="Index of the next chunk to upload")
+    received_bytes: int = Field(..., description="Bytes received so far")
+    scored_comments: int = Field(..., description="Comments scored so far")
+    complete: bool = Field(..., description="Whether the upload has been finalized")
@@ -0,0 +1,462 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import csv
+import gzip
+import mmap
+import os
+import shutil
+import tempfile
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from src.api.models.sentiment_models import (
+    CommentInsights,
+    GroupSummary,
+    SentimentResponse,
+    SentimentSummary
+)
+from src.api.use_cases.results_csv import (
+    RESULT_CSV_HEADER,
+    infer_column_types,
+    write_result_rows,
+    write_summary_rows
+)
+
+# Bytes scanned at a time when looking for record boundaries
+SCAN_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Error a worker answers with when a shard has no non-empty comments
+NO_COMMENTS_DETAIL = "No valid comments found in CSV"
+
+_QUOTE = ord('"')
+_NEWLINE = ord("\n")
+
+
+class ShardError(Exception):
+    """Raised when a shard is rejected by a worker or fails on every attempt."""
+
+
+def _count_quotes(mapping: mmap.mmap, start: int, end: int) -> int:
+    count = 0
+    for offset in range(start, end, SCAN_BLOCK_SIZE):
+        block = np.frombuffer(mapping, dtype=np.uint8, count=min(SCAN_BLOCK_SIZE, end - offset), offset=offset)
+        count += int(np.count_nonzero(block == _QUOTE))
+        del block
+    return count
+
+
+def _record_end(mapping: mmap.mmap, position: int, quotes: int) -> int:
+    """
+    Find the end of the CSV record containing `position`.
+
+    Args:
+        mapping: The memory-mapped file.
+        position: Offset to search from.
+        quotes: Number of quote characters between the start of the record
+            containing `position` (or any earlier record boundary) and `position`.
+
+    Returns:
+        The offset just past the first newline at or after `position` that is
+        outside a quoted field, or the file size if there is none.
+    """
+    size = len(mapping)
+    parity = quotes % 2
+    for offset in range(position, size, SCAN_BLOCK_SIZE):
+        block = np.frombuffer(mapping, dtype=np.uint8, count=min(SCAN_BLOCK_SIZE, size - offset), offset=offset)
+        is_quote = block == _QUOTE
+        # A newline ends a record when an even number of quotes precede it
+        outside = (parity + np.cumsum(is_quote)) % 2 == 0
+        ends = np.flatnonzero((block == _NEWLINE) & outside)
+        if len(ends):
+            return offset + int(ends[0]) + 1
+        parity = (parity + int(np.count_nonzero(is_quote))) % 2
+        del block, is_quote, outside
+    return size
+
+
+def split_csv(path: str, shard_bytes: int) -> Tuple[int, List[Tuple[int, int, int]]]:
+    """
+    Split a CSV file into byte ranges of whole records.
+
+    Boundaries are moved forward to the next newline outside a quoted field,
+    so comments spanning several lines are never cut in two.
+
+    Args:
+        path: Path to the CSV file.
+        shard_bytes: Approximate size of each shard in bytes.
+
+    Returns:
+        The length of the header record, and one (index, start, end) byte
+        range per shard covering the records after the header.
+
+    Raises:
+        ValueError: If the file is empty or the shard size isn't positive.
+    """
+    if shard_bytes <= 0:
+        raise ValueError("shard_bytes must be positive")
+    size = os.path.getsize(path)
+    if size == 0:
+        raise ValueError("CSV file is empty")
+
+    shards = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+        header_end = _record_end(mapping, 0, 0)
+        start = header_end
+        while start < size:
+            target = start + shard_bytes
+            end = size if target >= size else _record_end(mapping, target, _count_quotes(mapping, start, target))
+            shards.append((len(shards), start, end))
+            start = end
+    return header_end, shards
+
+
+class _ShardResult:
+    """What is kept of a scored shard once its rows are on disk."""
+
+    def __init__(self, response: Optional[SentimentResponse] = None):
+        results = (response.results or []) if response is not None else []
+        self.compounds = np.fromiter((r.scores.compound for r in results), dtype=float, count=len(results))
+        self.counts = {"positive": 0, "negative": 0, "neutral": 0}
+        for result in results:
+            self.counts[result.sentiment.value] += 1
+        self.groups = response.groups if response is not None else None
+        self.insights = response.insights if response is not None else None
+
+
+class CsvCoordinatorUseCase:
+    """
+    Score one large CSV file across several API instances.
+
+    The file is split into byte-range shards of whole records, each shard is
+    uploaded with the CSV header to a worker's /sentiment/analyze-csv, failed
+    shards are retried on other workers, and the per-shard results are merged
+    into the response and results file a single /analyze-csv and
+    /download-csv call would produce.
+    """
+
+    def __init__(
+        self,
+        workers: Sequence[str],
+        shard_bytes: int = 16 * 1024 * 1024,
+        max_attempts: int = 3,
+        retry_delay: float = 0.5,
+        timeout: float = 600.0,
+        shards_per_worker: int = 1,
+        compress: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize the coordinator.
+
+        Args:
+            workers: Base URLs of the API instances, e.g. "http://10.0.0.2:8000".
+            shard_bytes: Approximate size of each shard in bytes.
+            max_attempts: Attempts per shard before the run fails.
+            retry_delay: Seconds before the first retry, doubled on every further retry.
+            timeout: Seconds a worker may take to score one shard.
+            shards_per_worker: Shards scored concurrently by each worker.
+            compress: Upload shards gzip-compressed.
+            transport: httpx transport to send requests through (for tests).
+        """
+        if not workers:
+            raise ValueError("At least one worker is required")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.workers = [worker.rstrip("/") for worker in workers]
+        self.shard_bytes = shard_bytes
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.shards_per_worker = max(1, shards_per_worker)
+        self.compress = compress
+        self.transport = transport
+        self.stats: Dict[str, Any] = {}
+        self._down = set()
+
+    def score_csv(
+        self,
+        path: str,
+        output_path: Optional[str] = None,
+        group_by: Optional[List[str]] = None,
+        top_k: int = 0
+    ) -> SentimentResponse:
+        """
+        Score a CSV file on the workers.
+
+        Args:
+            path: Path to the CSV file (uncompressed, with a 'comment' or 'Comment' column).
+            output_path: Where to write the results file /sentiment/download-csv
+                would produce. The per-comment results are only kept on disk,
+                so the returned response never includes them.
+            group_by: CSV columns to compute per-group summaries over.
+            top_k: Number of most positive/negative comments to report, along
+                with emoji statistics.
+
+        Returns:
+            The merged summary, groups and insights. Summaries are exact;
+            group averages may differ from a single call by float rounding.
+
+        Raises:
+            ShardError: If a worker rejects a shard or a shard fails on every attempt.
+            ValueError: If the file is empty or has no comments.
+        """
+        return asyncio.run(self.score_csv_async(path, output_path, group_by, top_k))
+
+    async def score_csv_async(
+        self,
+        path: str,
+        output_path: Optional[str] = None,
+        group_by: Optional[List[str]] = None,
+        top_k: int = 0
+    ) -> SentimentResponse:
+        """Async counterpart of `score_csv`."""
+        header_end, shards = await asyncio.to_thread(split_csv, path, self.shard_bytes)
+        with open(path, "rb") as f:
+            header = f.read(header_end)
+
+        self._down = set()
+        self.stats = {
+            "shards": len(shards),
+            "attempts": 0,
+            "retries": 0,
+            "shards_per_worker": {worker: 0 for worker in self.workers}
+        }
+        slots = {worker: asyncio.Semaphore(self.shards_per_worker) for worker in self.workers}
+        # Shards report group values as written; their types are inferred over
+        # the whole file when the groups are merged
+        params = {"group_by": group_by or [], "top_k": top_k, "infer_group_types": False}
+
+        part_dir = None
+        if output_path is not None:
+            part_dir = tempfile.mkdtemp(prefix=".shards-", dir=os.path.dirname(os.path.abspath(output_path)))
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout, transport=self.transport) as client:
+                tasks = [
+                    asyncio.create_task(self._score_shard(client, slots, path, header, shard, params, part_dir))
+                    for shard in shards
+                ]
+                try:
+                    shard_results = await asyncio.gather(*tasks)
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    raise
+
+            response = self._merge(shard_results, top_k, group_by)
+            if output_path is not None:
+                await asyncio.to_thread(self._write_output, output_path, part_dir, len(shards), response.summary)
+            return response
+        finally:
+            if part_dir is not None:
+                shutil.rmtree(part_dir, ignore_errors=True)
+
+    def _pick_worker(self, position: int) -> str:
+        # Skip workers that just failed to connect, unless all of them did
+        healthy = [worker for worker in self.workers if worker not in self._down] or self.workers
+        return healthy[position % len(healthy)]
+
+    async def _score_shard(
+        self,
+        client: httpx.AsyncClient,
+        slots: Dict[str, asyncio.Semaphore],
+        path: str,
+        header: bytes,
+        shard: Tuple[int, int, int],
+        params: Dict[str, Any],
+        part_dir: Optional[str]
+    ) -> _ShardResult:
+        index, start, end = shard
+        part_path = os.path.join(part_dir, f"{index:08d}.csv") if part_dir is not None else None
+        error = None
+
+        for attempt in range(self.max_attempts):
+            if attempt > 0:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+            worker = self._pick_worker(index + attempt)
+            async with slots[worker]:
+                # Read the shard only once a worker is free, so at most one shard
+                # per in-flight request is held in memory
+                payload = await asyncio.to_thread(self._read_shard, path, header, start, end)
+                filename = f"shard-{index}.csv.gz" if self.compress else f"shard-{index}.csv"
+                self.stats["attempts"] += 1
+                try:
+                    response = await client.post(
+                        f"{worker}/sentiment/analyze-csv",
+                        params=params,
+                        files={"file": (filename, payload, "text/csv")}
+                    )
+                except httpx.TransportError as e:
+                    self._down.add(worker)
+                    error = f"{worker}: {type(e).__name__}: {e}"
+                    continue
+                finally:
+                    del payload
+
+            self._down.discard(worker)
+            if response.status_code == 200:
+                self.stats["shards_per_worker"][worker] += 1
+                return await asyncio.to_thread(self._collect_shard, response.content, part_path)
+
+            detail = _error_detail(response)
+            if response.status_code == 400 and detail == NO_COMMENTS_DETAIL:
+                # Every comment of the shard is empty; a single call would just skip them
+                return await asyncio.to_thread(self._collect_shard, None, part_path)
+            if response.status_code < 500 and response.status_code != 429:
+                raise ShardError(f"Shard {index} was rejected by {worker} ({response.status_code}): {detail}")
+            error = f"{worker} ({response.status_code}): {detail}"
+
+        raise ShardError(f"Shard {index} failed after {self.max_attempts} attempt(s); last error: {error}")
+
+    def _read_shard(self, path: str, header: bytes, start: int, end: int) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(start)
+            payload = header + f.read(end - start)
+        return gzip.compress(payload, compresslevel=1) if self.compress else payload
+
+    def _collect_shard(self, content: Optional[bytes], part_path: Optional[str]) -> _ShardResult:
+        response = SentimentResponse.model_validate_json(content) if content is not None else None
+        if part_path is not None:
+            with open(part_path, "w", encoding="utf-8", newline="") as part:
+                write_result_rows(part, (response.results or []) if response is not None else [])
+        return _ShardResult(response)
+
+    def _write_output(self, output_path: str, part_dir: str, n_shards: int, summary: SentimentSummary) -> None:
+        with open(output_path, "w", encoding="utf-8", newline="") as output:
+            csv.writer(output).writerow(RESULT_CSV_HEADER)
+            for index in range(n_shards):
+                with open(os.path.join(part_dir, f"{index:08d}.csv"), "r", encoding="utf-8", newline="") as part:
+                    shutil.copyfileobj(part, output)
+            write_summary_rows(output, summary)
+
+    def _merge(
+        self,
+        shard_results: List[_ShardResult],
+        top_k: int,
+        group_by: Optional[List[str]]
+    ) -> SentimentResponse:
+        compounds = np.concatenate([result.compounds for result in shard_results])
+        total = len(compounds)
+        if total == 0:
+            raise ValueError(NO_COMMENTS_DETAIL)
+
+        counts = {
+            sentiment: sum(result.counts[sentiment] for result in shard_results)
+            for sentiment in ("positive", "negative", "neutral")
+        }
+        # Same arithmetic as SentimentAnalyzer.get_summary_stats over the whole file
+        summary = SentimentSummary(
+            total_comments=total,
+            positive_comments=counts["positive"],
+            negative_comments=counts["negative"],
+            neutral_comments=counts["neutral"],
+            positive_percentage=(counts["positive"] / total) * 100,
+            negative_percentage=(counts["negative"] / total) * 100,
+            neutral_percentage=(counts["neutral"] / total) * 100,
+            average_compound=float(compounds.mean())
+        )
+        response = SentimentResponse(summary=summary)
+
+        if group_by:
+            response.groups = _merge_groups([result.groups or [] for result in shard_results], group_by)
+        if top_k > 0:
+            response.insights = _merge_insights(
+                [result.insights for result in shard_results if result.insights is not None], top_k
+            )
+        return response
+
+
+def _error_detail(response: httpx.Response) -> str:
+    try:
+        body = response.json()
+    except ValueError:
+        return response.text[:200]
+    if isinstance(body, dict):
+        return str(body.get("detail", body.get("error", body)))
+    return str(body)
+
+
+def _merge_groups(shard_groups: List[List[GroupSummary]], group_by: List[str]) -> List[GroupSummary]:
+    """Add up per-shard group summaries, ordered like a single groupby over the file."""
+    written = [group for groups in shard_groups for group in groups]
+    if not written:
+        return []
+    # Type the values over all shards at once, so e.g. "7" and "007" are the
+    # same group when the column is numeric, like in a single read of the file
+    df = infer_column_types(pd.DataFrame(
+        [[group.group.get(column) for column in group_by] for group in written], columns=group_by
+    ))
+    values = [df[column].astype(object).where(df[column].notna(), None).tolist() for column in group_by]
+
+    merged = {}
+    for group, key in zip(written, zip(*values)):
+        totals = merged.setdefault(key, [dict(zip(group_by, key)), 0, 0, 0, 0, 0.0])
+        summary = group.summary
+        totals[1] += summary.total_comments
+        totals[2] += summary.positive_comments
+        totals[3] += summary.negative_comments
+        totals[4] += summary.neutral_comments
+        totals[5] += summary.average_compound * summary.total_comments
+
+    keys = list(merged)
+    try:
+        # Missing values sort last, like pandas
+        keys.sort(key=lambda key: tuple((value is None, value if value is not None else 0) for value in key))
+    except TypeError:
+        pass
+
+    merged_groups = []
+    for key in keys:
+        group, total, positive, negative, neutral, compound_sum = merged[key]
+        merged_groups.append(GroupSummary(
+            group=group,
+            summary=SentimentSummary(
+                total_comments=total,
+                positive_comments=positive,
+                negative_comments=negative,
+                neutral_comments=neutral,
+                positive_percentage=(positive / total) * 100 if total > 0 else 0,
+                negative_percentage=(negative / total) * 100 if total > 0 else 0,
+                neutral_percentage=(neutral / total) * 100 if total > 0 else 0,
+                average_compound=compound_sum / total if total > 0 else 0
+            )
+        ))
+    return merged_groups
+
+
+def _merge_insights(shard_insights: List[CommentInsights], top_k: int) -> CommentInsights:
+    """Combine per-shard top-K comments and emoji statistics."""
+    # Shards are in file order, so sorting on the score alone keeps the earliest comment first on ties
+    positive = [comment for insights in shard_insights for comment in insights.most_positive]
+    negative = [comment for insights in shard_insights for comment in insights.most_negative]
+    positive.sort(key=lambda comment: -comment.compound)
+    negative.sort(key=lambda comment: comment.compound)
+
+    emojis = {}
+    for insights in shard_insights:
+        for stats in insights.emojis:
+            totals = emojis.setdefault(stats.emoji, [0, 0, 0.0, 0.0])
+            totals[0] += stats.count
+            totals[1] += stats.comments
+            totals[2] += stats.contribution
+            totals[3] += stats.average_compound * stats.comments
+    ranked = sorted(emojis.items(), key=lambda item: (-item[1][0], -abs(item[1][2]), item[0]))
+
+    return CommentInsights(
+        most_positive=positive[:top_k],
+        most_negative=negative[:top_k],
+        emojis=[
+            {
+                "emoji": emoji_char,
+                "count": occurrences,
+                "comments": n_comments,
+                "contribution": contribution,
+                "average_compound": compound_sum / n_comments
+            }
+            for emoji_char, (occurrences, n_comments, contribution, compound_sum) in ranked
+        ]
+    )
@@ -0,0 +1,239 @@
+from typing import Any, Dict, Optional
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+PROFILE_MODES = ("sample", "cprofile")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class _StackSampler:
+    """Background thread recording the stacks of all other threads at a fixed interval."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiling-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Return the stacks in the collapsed format read by flamegraph tools."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class _ProfilingSession:
+    """One bounded profiling run."""
+
+    def __init__(self, mode: str, duration: float, max_requests: int, memory: bool, interval: float):
+        self.mode = mode
+        self.duration = duration
+        self.max_requests = max_requests
+        self.memory = memory
+        self.requests = 0
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._profile = cProfile.Profile() if mode == "cprofile" else None
+        self._sampler = _StackSampler(interval) if mode == "sample" else None
+        self._started_tracemalloc = False
+        self._timer = None
+
+    def start(self) -> None:
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            self._started_tracemalloc = True
+        if self._profile is not None:
+            # cProfile only sees the thread it is enabled on: the event loop thread
+            self._profile.enable()
+        if self._sampler is not None:
+            self._sampler.start()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def finish(self, top: int) -> Dict[str, Any]:
+        if self._timer is not None:
+            self._timer.cancel()
+        report: Dict[str, Any] = {
+            "mode": self.mode,
+            "duration_seconds": self.elapsed(),
+            "requests": self.requests,
+            "samples": 0,
+            "pstats": None,
+            "collapsed": None,
+            "memory": None
+        }
+
+        if self._profile is not None:
+            self._profile.disable()
+            output = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=output)
+            stats.sort_stats("cumulative").print_stats(top)
+            report["pstats"] = output.getvalue()
+
+        if self._sampler is not None:
+            self._sampler.stop()
+            report["samples"] = self._sampler.samples
+            report["collapsed"] = self._sampler.collapsed()
+
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            report["memory"] = [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_kb": stat.size / 1024,
+                    "count": stat.count
+                }
+                for stat in snapshot.statistics("lineno")[:top]
+            ]
+
+        return report
+
+
+class ProfilingUseCase:
+    """
+    On-demand CPU and memory profiling of a worker.
+
+    Nothing is hooked in until a session is started: the request hook only
+    checks whether a session exists. A session runs for a bounded duration
+    and/or number of requests, then its report is kept for retrieval.
+    """
+
+    def __init__(self, top: int = 50):
+        """
+        Initialize the profiler.
+
+        Args:
+            top: Number of functions and allocation sites listed in reports.
+        """
+        self.top = top
+        self.session: Optional[_ProfilingSession] = None
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def start(
+        self,
+        duration: float = 30.0,
+        max_requests: int = 0,
+        mode: str = "sample",
+        memory: bool = True,
+        interval: float = 0.005
+    ) -> Dict[str, Any]:
+        """
+        Start a profiling session.
+
+        Args:
+            duration: Seconds after which the session stops (0 for no time bound).
+            max_requests: Number of requests after which the session stops (0 for no bound).
+            mode: "sample" records collapsed stacks of all threads every
+                `interval` seconds; "cprofile" traces every call on the event
+                loop thread and reports pstats.
+            memory: Whether to trace allocations and report the top allocation sites.
+            interval: Sampling interval in seconds for "sample" mode.
+
+        Returns:
+            The session status.
+
+        Raises:
+            ValueError: If the options are invalid or a session is already running.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Invalid mode. Supported modes are: {', '.join(PROFILE_MODES)}")
+        if duration <= 0 and max_requests <= 0:
+            raise ValueError("A profiling session needs a duration or a request limit")
+
+        with self._lock:
+            if self.session is not None:
+                raise ValueError("A profiling session is already running")
+            session = _ProfilingSession(mode, duration, max_requests, memory, interval)
+            session.start()
+            self.session = session
+
+        if duration > 0:
+            try:
+                # Stop on the event loop thread, where cProfile was enabled
+                session._timer = asyncio.get_running_loop().call_later(duration, self._expire, session)
+            except RuntimeError:
+                session._timer = threading.Timer(duration, self._expire, (session,))
+                session._timer.daemon = True
+                session._timer.start()
+
+        return self.status()
+
+    def _expire(self, session: _ProfilingSession) -> None:
+        if self.session is session:
+            self.stop()
+
+    def request_finished(self) -> None:
+        """Count a finished request against the session's request limit."""
+        session = self.session
+        if session is None:
+            return
+        session.requests += 1
+        if 0 < session.max_requests <= session.requests:
+            self._expire(session)
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """
+        Stop the running session, if any.
+
+        Returns:
+            The report of the session, or the last report if none was running.
+        """
+        with self._lock:
+            # The session is cleared only once its report is in place, so a
+            # stopped session always has a report
+            if self.session is not None:
+                self.last_report = self.session.finish(self.top)
+                self.session = None
+        return self.last_report
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the state of the profiler.
+
+        Returns:
+            Whether a session is running, its mode, elapsed time and requests,
+            and whether a report is available.
+        """
+        session = self.session
+        return {
+            "active": session is not None,
+            "mode": session.mode if session else None,
+            "elapsed_seconds": session.elapsed() if session else None,
+            "requests": session.requests if session else 0,
+            "report_available": self.last_report is not None
+        }
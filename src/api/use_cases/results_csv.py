@@ -0,0 +1,84 @@
+from typing import Iterable, TextIO
+import csv
+import io
+
+import pandas as pd
+
+from src.api.models.sentiment_models import CommentAnalysis, SentimentResponse, SentimentSummary
+
+RESULT_CSV_HEADER = ['comment', 'sentiment', 'compound_score', 'positive_score', 'negative_score', 'neutral_score', 'emojis']
+
+
+def infer_column_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Type columns read as strings the way one read_csv call over the whole file would.
+
+    Inferring types per chunk or per shard could parse the same value as a
+    number in one part and a string in another, splitting its group in two.
+
+    Args:
+        df: The columns, read as strings.
+
+    Returns:
+        The columns with inferred types.
+    """
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)))
+
+
+def write_result_rows(output: TextIO, results: Iterable[CommentAnalysis]) -> None:
+    """
+    Write one CSV row per comment result.
+
+    Args:
+        output: Text stream to write to.
+        results: The per-comment results.
+    """
+    writer = csv.writer(output)
+    for result in results:
+        emojis_str = ','.join(result.emojis) if result.emojis else ''
+        writer.writerow([
+            result.comment,
+            result.sentiment.value,
+            result.scores.compound,
+            result.scores.positive,
+            result.scores.negative,
+            result.scores.neutral,
+            emojis_str
+        ])
+
+
+def write_summary_rows(output: TextIO, summary: SentimentSummary) -> None:
+    """
+    Write the summary block that follows the result rows.
+
+    Args:
+        output: Text stream to write to.
+        summary: The summary statistics.
+    """
+    writer = csv.writer(output)
+    writer.writerow([])  # Empty row
+    writer.writerow(['SUMMARY'])
+    writer.writerow(['Total Comments', summary.total_comments])
+    writer.writerow(['Positive Comments', summary.positive_comments])
+    writer.writerow(['Negative Comments', summary.negative_comments])
+    writer.writerow(['Neutral Comments', summary.neutral_comments])
+    writer.writerow(['Positive Percentage', f"{summary.positive_percentage:.1f}%"])
+    writer.writerow(['Negative Percentage', f"{summary.negative_percentage:.1f}%"])
+    writer.writerow(['Neutral Percentage', f"{summary.neutral_percentage:.1f}%"])
+    writer.writerow(['Average Compound Score', summary.average_compound])
+
+
+def write_results_csv(output: TextIO, response: SentimentResponse) -> None:
+    """
+    Write the results file offered by /sentiment/download-csv.
+
+    The header, the result rows and the summary block can also be written
+    separately, so results can be streamed out before the summary is known.
+
+    Args:
+        output: Text stream to write to.
+        response: The analysis results.
+    """
+    csv.writer(output).writerow(RESULT_CSV_HEADER)
+    write_result_rows(output, response.results or [])
+    write_summary_rows(output, response.summary)
@@ -1,40 +1,135 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+import hashlib
+import json
 import pandas as pd
 from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.cache import ResultCache
+from src.sentiment_analysis.emoji_utils import get_emoji_table
+from src.sentiment_analysis.shared_cache import SharedResultCache
+from src.sentiment_analysis.insights import SentimentInsights
+from src.sentiment_analysis.windows import RollingSentimentAggregator
 from src.api.models.sentiment_models import (
     CommentRequest,
     SentimentResponse,
     SentimentSummary,
     CommentAnalysis,
     SentimentScores,
-    SentimentType
+    SentimentType,
+    StreamSummaryResponse,
+    WindowSummary,
+    GroupSummary,
+    CommentInsights,
+    SummaryEstimate,
+    WeightSummary,
+    WeightSweepResponse
 )
 
 
 class SentimentAnalyzerUseCase:
     """Use case for analyzing sentiment of comments."""
     
-    def __init__(self, model_type: str = "vader", emoji_weight: float = 0.3):
+    def __init__(
+        self,
+        model_type: str = "vader",
+        emoji_weight: float = 0.3,
+        model_path: Optional[str] = None,
+        fast_model_type: Optional[str] = None,
+        fast_model_path: Optional[str] = None,
+        uncertainty_band: float = 0.1,
+        cache_size: int = 10000,
+        chunk_size: int = 10000,
+        response_cache_size: int = 256,
+        response_cache_max_bytes: int = 64 * 1024 * 1024,
+        response_cache_max_entry_bytes: int = 4 * 1024 * 1024,
+        shared_cache_name: Optional[str] = None,
+        shared_cache_size: int = 262144
+    ):
         """
         Initialize the sentiment analyzer use case.
         
         Args:
             model_type: The type of sentiment analysis model to use.
             emoji_weight: Weight to give to emoji sentiment (0-1).
+            model_path: Path to a trained model artifact (required for "linear").
+            fast_model_type: Cheaper model to score with first (enables cascade mode).
+            fast_model_path: Path to the trained artifact for the fast model.
+            uncertainty_band: Distance from the classification thresholds within
+                which fast results are escalated to the main model.
+            cache_size: Maximum number of cached per-comment results (0 disables caching).
+            chunk_size: Larger requests are scored and converted in pieces of
+                this many comments, so intermediate results stay bounded.
+            response_cache_size: Maximum number of serialized /analyze responses
+                kept for repeated identical requests (0 disables the cache).
+            response_cache_max_bytes: Maximum total size of the cached responses
+                in bytes; least recently used responses are evicted beyond it.
+            response_cache_max_entry_bytes: Responses larger than this are not cached.
+            shared_cache_name: Name of a shared memory result cache that all
+                worker processes on the host attach to. Replaces the per-process
+                result cache of cache_size entries when set.
+            shared_cache_size: Number of entries of the shared cache, if this
+                process is the one creating it.
         """
-        self.analyzer = SentimentAnalyzer(model_type=model_type, emoji_weight=emoji_weight)
+        # Everything besides the request that determines a response
+        self.config = {
+            "model_type": model_type,
+            "emoji_weight": emoji_weight,
+            "model_path": model_path,
+            "fast_model_type": fast_model_type,
+            "fast_model_path": fast_model_path,
+            "uncertainty_band": uncertainty_band
+        }
+        cache = None
+        if shared_cache_name:
+            # Workers configured differently may share the segment but never each other's results
+            cache = SharedResultCache(
+                shared_cache_name, shared_cache_size, namespace=json.dumps(self.config, sort_keys=True)
+            )
+        self.analyzer = SentimentAnalyzer(
+            model_type=model_type,
+            emoji_weight=emoji_weight,
+            model_path=model_path,
+            fast_model_type=fast_model_type,
+            fast_model_path=fast_model_path,
+            uncertainty_band=uncertainty_band,
+            cache_size=cache_size,
+            cache=cache
+        )
+        self.aggregator = RollingSentimentAggregator()
+        self.chunk_size = max(1, chunk_size)
+        self.response_cache = ResultCache(
+            maxsize=response_cache_size,
+            max_bytes=response_cache_max_bytes,
+            max_entry_bytes=response_cache_max_entry_bytes
+        )
+        self.not_modified = 0
     
-    def analyze_comments(self, request: CommentRequest, include_details: bool = False) -> SentimentResponse:
+    def analyze_comments(
+        self,
+        request: CommentRequest,
+        include_details: bool = False,
+        group_by: Optional[List[str]] = None,
+        top_k: int = 0
+    ) -> SentimentResponse:
         """
         Analyze the sentiment of a list of comments.
         
         Args:
             request: The comment request containing the list of comments to analyze.
             include_details: Whether to include detailed results for each comment.
+            group_by: Names of request columns to compute per-group summaries over.
+            top_k: Number of most positive/negative comments to report along with
+                emoji statistics. 0 disables these insights.
             
         Returns:
-            A sentiment response containing summary statistics and optionally detailed results.
+            A sentiment response containing summary statistics and optionally
+            detailed results, per-group summaries and insights.
+            
+        Raises:
+            ValueError: If a group_by column is missing or doesn't have one value per comment.
         """
+        groups = self._group_columns(request, group_by) if group_by else None
+        insights = SentimentInsights(top_k, self.analyzer.emoji_weight) if top_k > 0 else None
+        
         # Handle empty comment list
         if not request.comments:
             empty_summary = {
@@ -47,24 +142,334 @@ class SentimentAnalyzerUseCase:
                 "neutral_percentage": 0,
                 "average_compound": 0
             }
-            return SentimentResponse(summary=SentimentSummary(**empty_summary))
+            return SentimentResponse(
+                summary=SentimentSummary(**empty_summary),
+                groups=[] if groups is not None else None,
+                insights=CommentInsights(**insights.to_dict()) if insights is not None else None
+            )
             
-        # Analyze the comments using the analyzer
-        df_results = self.analyzer.analyze_comments(request.comments)
+        # Analyze the comments chunk by chunk, keeping only the columns the
+        # summaries need from each chunk's full results
+        scored_chunks = []
+        results = [] if include_details else None
+        for start in range(0, len(request.comments), self.chunk_size):
+            chunk = request.comments[start:start + self.chunk_size]
+            df_chunk = self.analyzer.analyze_comments(chunk, insights=insights)
+            scored_chunks.append(df_chunk[["sentiment", "compound"]])
+            if include_details:
+                results.extend(self._convert_to_comment_analysis_list(df_chunk))
+        
+        return self._build_response(scored_chunks, results, groups, insights)
+    
+    def analyze_comments_stream(
+        self,
+        request: CommentRequest,
+        group_by: Optional[List[str]] = None,
+        top_k: int = 0
+    ) -> Iterator[bytes]:
+        """
+        Analyze comments with detailed results, serialized chunk by chunk.
+        
+        Each piece of `chunk_size` comments is scored, converted and written
+        as part of the JSON results array before the next one is scored, so
+        neither the detailed results nor their serialization are held in
+        memory for the whole request. The summary, groups and insights
+        follow the results array.
+        
+        Args:
+            request: The comment request containing the list of comments to analyze.
+            group_by: Names of request columns to compute per-group summaries over.
+            top_k: Number of most positive/negative comments to report along with
+                emoji statistics. 0 disables these insights.
+            
+        Returns:
+            An iterator over the pieces of the JSON response body.
+            
+        Raises:
+            ValueError: If a group_by column is missing or doesn't have one value
+                per comment (raised before anything is scored).
+        """
+        groups = self._group_columns(request, group_by) if group_by else None
+        insights = SentimentInsights(top_k, self.analyzer.emoji_weight) if top_k > 0 else None
+        return self._stream_response(request, groups, insights)
+    
+    def _stream_response(
+        self,
+        request: CommentRequest,
+        groups: Optional[pd.DataFrame],
+        insights: Optional[SentimentInsights]
+    ) -> Iterator[bytes]:
+        """Yield the response body, one piece per scored chunk."""
+        scored_chunks = []
+        yield b'{"results":['
+        for start in range(0, len(request.comments), self.chunk_size):
+            chunk = request.comments[start:start + self.chunk_size]
+            df_chunk = self.analyzer.analyze_comments(chunk, insights=insights)
+            scored_chunks.append(df_chunk[["sentiment", "compound"]])
+            results = b",".join(
+                result.model_dump_json().encode("utf-8")
+                for result in self._convert_to_comment_analysis_list(df_chunk)
+            )
+            yield (b"," if start > 0 else b"") + results
+        
+        # The rest of the response, as an object without its opening brace
+        tail = self._build_response(scored_chunks, None, groups, insights).model_dump_json(exclude={"results"})
+        yield b"]," + tail[1:].encode("utf-8")
+    
+    def _build_response(
+        self,
+        scored_chunks: List[pd.DataFrame],
+        results: Optional[List[CommentAnalysis]],
+        groups: Optional[pd.DataFrame],
+        insights: Optional[SentimentInsights]
+    ) -> SentimentResponse:
+        """Summarize the scored chunks of a request into its response."""
+        df_results = pd.concat(scored_chunks, ignore_index=True)
         
         # Get summary statistics
         summary_stats = self.analyzer.get_summary_stats(df_results)
         summary = SentimentSummary(**summary_stats)
         
         # Create response
-        response = SentimentResponse(summary=summary)
+        response = SentimentResponse(summary=summary, results=results)
         
-        # Include detailed results if requested
-        if include_details:
-            response.results = self._convert_to_comment_analysis_list(df_results)
+        if groups is not None:
+            response.groups = [
+                GroupSummary(**group_summary)
+                for group_summary in self.analyzer.get_group_summary_stats(df_results, groups)
+            ]
+        
+        if insights is not None:
+            response.insights = CommentInsights(**insights.to_dict())
         
         return response
     
+    def response_etag(
+        self,
+        request: CommentRequest,
+        include_details: bool = False,
+        group_by: Optional[List[str]] = None,
+        top_k: int = 0
+    ) -> str:
+        """
+        Compute the ETag of an /analyze response before producing it.
+        
+        The tag hashes the canonical request, its options, the analyzer
+        configuration and the emoji table version, so identical requests
+        get the same tag for as long as they would get the same response.
+        
+        Args:
+            request: The comment request.
+            include_details: Whether detailed results are included.
+            group_by: Names of request columns to group by.
+            top_k: Number of extreme comments reported.
+            
+        Returns:
+            A quoted strong ETag.
+        """
+        canonical = json.dumps(
+            {
+                "comments": request.comments,
+                "columns": request.columns,
+                "include_details": include_details,
+                "group_by": group_by,
+                "top_k": top_k,
+                "config": self.config,
+                "emoji_table": get_emoji_table().version
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return '"' + hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32] + '"'
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the analyzer and response cache statistics.
+        
+        Returns:
+            Dictionary with result cache, response cache, route, reuse and cascade statistics.
+        """
+        response_cache = self.response_cache.stats()
+        response_cache["not_modified"] = self.not_modified
+        return {
+            "result_cache": self.analyzer.get_cache_stats(),
+            "response_cache": response_cache,
+            "routes": self.analyzer.get_route_stats(),
+            "reused": self.analyzer.get_reuse_count(),
+            "cascade": self.analyzer.get_cascade_stats()
+        }
+    
+    def estimate_comments(
+        self,
+        request: CommentRequest,
+        tolerance: float = 1.0,
+        confidence: float = 0.95,
+        max_samples: Optional[int] = None
+    ) -> SentimentResponse:
+        """
+        Estimate the summary statistics of a list of comments from a random sample.
+        
+        Args:
+            request: The comment request containing the list of comments to summarize.
+            tolerance: Target margin of error of the percentages, in percentage points.
+            confidence: Confidence level of the margins of error (0-1).
+            max_samples: Upper bound on the number of comments scored.
+            
+        Returns:
+            A sentiment response with the estimated summary and its error bounds.
+        """
+        estimate = self.analyzer.estimate_summary_stats(
+            request.comments,
+            tolerance=tolerance,
+            confidence=confidence,
+            max_samples=max_samples
+        )
+        return SentimentResponse(
+            summary=SentimentSummary(**estimate["summary"]),
+            estimate=SummaryEstimate(**estimate["estimate"])
+        )
+    
+    def estimate_comment_chunks(
+        self,
+        chunks: Iterable[List[str]],
+        tolerance: float = 1.0,
+        confidence: float = 0.95,
+        max_samples: Optional[int] = None
+    ) -> SentimentResponse:
+        """
+        Estimate the summary statistics of comments read in chunks.
+        
+        Only a random sample of the comments is kept in memory while reading.
+        
+        Args:
+            chunks: Lists of comments, e.g. one per chunk of a CSV file.
+            tolerance: Target margin of error of the percentages, in percentage points.
+            confidence: Confidence level of the margins of error (0-1).
+            max_samples: Upper bound on the number of comments scored.
+            
+        Returns:
+            A sentiment response with the estimated summary and its error bounds.
+        """
+        estimate = self.analyzer.estimate_summary_stats_from_chunks(
+            chunks,
+            tolerance=tolerance,
+            confidence=confidence,
+            max_samples=max_samples
+        )
+        return SentimentResponse(
+            summary=SentimentSummary(**estimate["summary"]),
+            estimate=SummaryEstimate(**estimate["estimate"])
+        )
+    
+    def _group_columns(self, request: CommentRequest, group_by: List[str]) -> pd.DataFrame:
+        """
+        Collect the group_by columns of a request into a DataFrame.
+        
+        Args:
+            request: The comment request carrying the extra columns.
+            group_by: Names of the columns to group by.
+            
+        Returns:
+            DataFrame with one column per group_by name, aligned with the comments.
+        """
+        columns = request.columns or {}
+        missing = [name for name in group_by if name not in columns]
+        if missing:
+            raise ValueError(f"Unknown group_by column(s): {', '.join(missing)}")
+        
+        for name in group_by:
+            if len(columns[name]) != len(request.comments):
+                raise ValueError(f"Column '{name}' must have one value per comment")
+        
+        return pd.DataFrame({name: columns[name] for name in group_by})
+    
+    def sweep_emoji_weights(self, request: CommentRequest, emoji_weights: List[float]) -> WeightSweepResponse:
+        """
+        Summarize comments under several emoji weights, scoring each comment once.
+        
+        Args:
+            request: The comment request containing the list of comments to analyze.
+            emoji_weights: The emoji weights (0-1) to compare.
+            
+        Returns:
+            A response with one summary per emoji weight.
+            
+        Raises:
+            ValueError: If no weights are given or a weight is outside 0-1.
+        """
+        if not emoji_weights:
+            raise ValueError("At least one emoji weight is required")
+        if any(not 0 <= weight <= 1 for weight in emoji_weights):
+            raise ValueError("Emoji weights must be between 0 and 1")
+        
+        table = self.analyzer.sweep_emoji_weights(request.comments, emoji_weights)
+        return WeightSweepResponse(configs=[WeightSummary(**row) for row in table.to_dict("records")])
+    
+    def score_comments(self, comments: List[str], insights: Optional[SentimentInsights] = None) -> List[CommentAnalysis]:
+        """
+        Score comments and return their detailed results without a summary.
+        
+        Args:
+            comments: The comments to score.
+            insights: Running insights to add the comments to, when they are
+                accumulated over several calls.
+            
+        Returns:
+            One CommentAnalysis per comment, in input order.
+        """
+        if not comments:
+            return []
+        return self._convert_to_comment_analysis_list(self.analyzer.analyze_comments(comments, insights=insights))
+    
+    def warm_up(self, comments: List[str]) -> int:
+        """
+        Score a batch of comments so lazily loaded state is ready before real traffic.
+        
+        Args:
+            comments: The warm-up comments.
+            
+        Returns:
+            The number of comments scored.
+        """
+        if comments:
+            self.analyzer.analyze_comments(comments)
+        return len(comments)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Return the result cache statistics of the analyzer."""
+        return self.analyzer.get_cache_stats()
+    
+    def push_stream_comments(self, stream_id: str, request: CommentRequest) -> StreamSummaryResponse:
+        """
+        Score comments arriving on a live stream and add them to its rolling windows.
+        
+        Args:
+            stream_id: Post or account ID the comments belong to.
+            request: The comment request containing the newly arrived comments.
+            
+        Returns:
+            The stream's updated window summaries.
+        """
+        if request.comments:
+            df_results = self.analyzer.analyze_comments(request.comments)
+            self.aggregator.add_many(stream_id, df_results["sentiment"].tolist(), df_results["compound"].tolist())
+        
+        return self.get_stream_summary(stream_id)
+    
+    def get_stream_summary(self, stream_id: str) -> StreamSummaryResponse:
+        """
+        Get the current rolling window summaries of a stream.
+        
+        Args:
+            stream_id: Post or account ID.
+            
+        Returns:
+            The stream's window summaries.
+        """
+        windows = [WindowSummary(**summary) for summary in self.aggregator.summary(stream_id)]
+        return StreamSummaryResponse(stream_id=stream_id, windows=windows)
+    
     def _convert_to_comment_analysis_list(self, df: pd.DataFrame) -> List[CommentAnalysis]:
         """
         Convert analyzer results dataframe to a list of CommentAnalysis objects.
@@ -0,0 +1,473 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import base64
+import csv
+import io
+import json
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.api.models.sentiment_models import CommentInsights, SentimentResponse, SentimentSummary
+from src.api.use_cases.results_csv import RESULT_CSV_HEADER, write_result_rows, write_summary_rows
+from src.api.use_cases.sentiment_analyzer_use_case import SentimentAnalyzerUseCase
+from src.sentiment_analysis.insights import SentimentInsights
+
+try:
+    import fcntl
+except ImportError:  # Without flock, sessions are only locked within one process
+    fcntl = None
+
+_UPLOAD_ID = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+_BOM = b"\xef\xbb\xbf"
+_QUOTE = ord('"')
+_NEWLINE = ord("\n")
+
+
+class UploadNotFoundError(LookupError):
+    """Raised for unknown or expired upload sessions."""
+
+
+class UploadOrderError(ValueError):
+    """Raised when a chunk arrives out of order."""
+
+    def __init__(self, expected: int):
+        super().__init__(f"Expected chunk {expected}")
+        self.expected = expected
+
+
+def _record_ends(data: bytes) -> np.ndarray:
+    """Return the offsets just past every newline of `data` that ends a CSV record."""
+    block = np.frombuffer(data, dtype=np.uint8)
+    outside = np.cumsum(block == _QUOTE) % 2 == 0
+    return np.flatnonzero((block == _NEWLINE) & outside) + 1
+
+
+class _UploadSession:
+    """Persisted state of one upload, saved as JSON after every chunk."""
+
+    def __init__(self, upload_id: str, filename: str, size: int, chunk_size: int, top_k: int, emoji_weight: float):
+        self.upload_id = upload_id
+        self.filename = filename
+        self.size = size
+        self.chunk_size = chunk_size
+        self.next_chunk = 0
+        self.received_bytes = 0
+        # Header record and the bytes of the last, still incomplete record
+        self.header: Optional[bytes] = None
+        self.comment_column: Optional[str] = None
+        self.pending = b""
+        self.counts = {"positive": 0, "negative": 0, "neutral": 0}
+        self.scored = 0
+        # Sizes of the row and score files when the state was saved
+        self.rows_bytes = 0
+        self.insights = SentimentInsights(top_k, emoji_weight) if top_k > 0 else None
+        self.response: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = dict(vars(self))
+        state["header"] = base64.b64encode(self.header).decode("ascii") if self.header is not None else None
+        state["pending"] = base64.b64encode(self.pending).decode("ascii")
+        state["insights"] = self.insights.state() if self.insights is not None else None
+        return state
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "_UploadSession":
+        session = cls.__new__(cls)
+        vars(session).update(state)
+        session.header = base64.b64decode(state["header"]) if state["header"] is not None else None
+        session.pending = base64.b64decode(state["pending"])
+        session.insights = SentimentInsights.from_state(state["insights"]) if state["insights"] is not None else None
+        return session
+
+    @property
+    def total_chunks(self) -> int:
+        return max(1, -(-self.size // self.chunk_size))
+
+    def expected_length(self, index: int) -> int:
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+
+class UploadUseCase:
+    """
+    Resumable chunked CSV uploads scored while they arrive.
+
+    An upload is a session: chunks are PUT in order, and the complete CSV
+    records of each chunk are scored right away, with their result rows
+    appended to a file. Finalizing scores the last record and produces the
+    same summary and results file as /analyze-csv and /download-csv. The
+    session state lives on disk and is saved after every chunk, so an upload
+    can be resumed from the next missing chunk, even after a restart.
+    """
+
+    def __init__(
+        self,
+        sentiment: SentimentAnalyzerUseCase,
+        upload_dir: Optional[str] = None,
+        chunk_size: int = 1024 * 1024,
+        max_upload_size: int = 1024 * 1024 * 1024,
+        session_ttl: float = 24 * 3600,
+        max_comment_length: Optional[int] = None
+    ):
+        """
+        Initialize the upload use case.
+
+        Args:
+            sentiment: The use case that scores the comments.
+            upload_dir: Directory upload sessions are kept in (default: a
+                "sentiment-uploads" directory in the system temp directory).
+                It is created private to the current user and must be owned by it.
+            chunk_size: Bytes per chunk.
+            max_upload_size: Largest accepted file in bytes.
+            session_ttl: Seconds after its last activity a session is deleted.
+            max_comment_length: Longest comment accepted, in characters. None
+                allows any comment a record fits in. The number of comments is
+                bounded by max_upload_size instead of a per-request limit.
+        """
+        self.sentiment = sentiment
+        self.upload_dir = upload_dir or os.path.join(tempfile.gettempdir(), "sentiment-uploads")
+        self.chunk_size = chunk_size
+        self.max_upload_size = max_upload_size
+        self.session_ttl = session_ttl
+        self.max_comment_length = max_comment_length
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._make_private_dir(self.upload_dir)
+
+    @staticmethod
+    def _make_private_dir(path: str) -> None:
+        """Create the upload root readable by the current user only, refusing one planted by another user."""
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        if not hasattr(os, "getuid"):
+            return
+        info = os.lstat(path)
+        if not os.path.isdir(path) or os.path.islink(path) or info.st_uid != os.getuid():
+            raise PermissionError(f"Upload directory {path} must be a directory owned by the current user")
+        if info.st_mode & 0o077:
+            os.chmod(path, 0o700)
+
+    def _session_dir(self, upload_id: str) -> str:
+        if not _UPLOAD_ID.match(upload_id):
+            raise UploadNotFoundError(upload_id)
+        return os.path.join(self.upload_dir, upload_id)
+
+    @contextmanager
+    def _lock(self, upload_id: str) -> Iterator[None]:
+        """
+        Lock a session against concurrent requests.
+
+        The lock is an flock on a file in the session directory, so requests
+        for the same session are serialized across worker processes too.
+        """
+        if fcntl is None:
+            with self._locks_lock:
+                lock = self._locks.setdefault(upload_id, threading.Lock())
+            with lock:
+                yield
+            return
+
+        try:
+            fd = os.open(os.path.join(self._session_dir(upload_id), "lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        except (FileNotFoundError, NotADirectoryError):
+            raise UploadNotFoundError(upload_id)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _load(self, upload_id: str) -> _UploadSession:
+        path = os.path.join(self._session_dir(upload_id), "state.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                session = _UploadSession.from_dict(json.load(f))
+        except FileNotFoundError:
+            raise UploadNotFoundError(upload_id)
+        # Drop rows of a chunk that failed after they were written
+        rows_path = os.path.join(self._session_dir(upload_id), "rows.csv")
+        if os.path.exists(rows_path) and os.path.getsize(rows_path) > session.rows_bytes:
+            os.truncate(rows_path, session.rows_bytes)
+        scores_path = os.path.join(self._session_dir(upload_id), "compounds.f8")
+        if os.path.exists(scores_path) and os.path.getsize(scores_path) > session.scored * 8:
+            os.truncate(scores_path, session.scored * 8)
+        return session
+
+    def _save(self, session: _UploadSession) -> None:
+        session_dir = self._session_dir(session.upload_id)
+        temp_path = os.path.join(session_dir, "state.json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(session.to_dict(), f)
+        os.replace(temp_path, os.path.join(session_dir, "state.json"))
+
+    def expire_sessions(self) -> int:
+        """
+        Delete sessions inactive for longer than the session TTL.
+
+        Returns:
+            The number of deleted sessions.
+        """
+        deadline = time.time() - self.session_ttl
+        expired = 0
+        for upload_id in os.listdir(self.upload_dir):
+            session_dir = os.path.join(self.upload_dir, upload_id)
+            try:
+                # A session being created has no state yet
+                state_path = os.path.join(session_dir, "state.json")
+                last_activity = os.path.getmtime(state_path if os.path.exists(state_path) else session_dir)
+            except FileNotFoundError:
+                continue
+            if last_activity < deadline:
+                shutil.rmtree(session_dir, ignore_errors=True)
+                expired += 1
+        return expired
+
+    def create(self, filename: str, size: int, top_k: int = 0) -> Dict[str, Any]:
+        """
+        Start an upload session.
+
+        Args:
+            filename: Name of the CSV file.
+            size: Size of the file in bytes.
+            top_k: Number of most positive/negative comments to report, along
+                with emoji statistics.
+
+        Returns:
+            The session status.
+
+        Raises:
+            ValueError: If the file isn't a CSV or is too large.
+        """
+        if not filename.endswith(".csv"):
+            raise ValueError("File must be a CSV")
+        if size > self.max_upload_size:
+            raise ValueError(f"File exceeds the maximum upload size of {self.max_upload_size} bytes")
+
+        self.expire_sessions()
+        upload_id = secrets.token_urlsafe(16)
+        os.makedirs(self._session_dir(upload_id), mode=0o700)
+        session = _UploadSession(upload_id, filename, size, self.chunk_size, top_k, self.sentiment.analyzer.emoji_weight)
+        self._save(session)
+        return self._status(session)
+
+    def status(self, upload_id: str) -> Dict[str, Any]:
+        """
+        Get the status of a session, e.g. to find where to resume.
+
+        Raises:
+            UploadNotFoundError: If the session doesn't exist.
+        """
+        with self._lock(upload_id):
+            return self._status(self._load(upload_id))
+
+    def _status(self, session: _UploadSession) -> Dict[str, Any]:
+        return {
+            "upload_id": session.upload_id,
+            "filename": session.filename,
+            "size": session.size,
+            "chunk_size": session.chunk_size,
+            "total_chunks": session.total_chunks,
+            "next_chunk": session.next_chunk,
+            "received_bytes": session.received_bytes,
+            "scored_comments": session.scored,
+            "complete": session.response is not None
+        }
+
+    def put_chunk(self, upload_id: str, index: int, data: bytes) -> Dict[str, Any]:
+        """
+        Receive a chunk and score the CSV records it completes.
+
+        Re-sending an already received chunk is a no-op, so a chunk whose
+        response was lost can simply be sent again.
+
+        Args:
+            upload_id: The session.
+            index: Index of the chunk.
+            data: The chunk's bytes.
+
+        Returns:
+            The session status.
+
+        Raises:
+            UploadNotFoundError: If the session doesn't exist.
+            UploadOrderError: If an earlier chunk is still missing.
+            ValueError: If the chunk has the wrong size or the CSV is invalid.
+        """
+        with self._lock(upload_id):
+            session = self._load(upload_id)
+            if session.response is not None:
+                raise ValueError("Upload is already finalized")
+            if index < session.next_chunk:
+                return self._status(session)
+            if index > session.next_chunk or index * session.chunk_size >= max(session.size, 1):
+                raise UploadOrderError(session.next_chunk)
+            if len(data) != session.expected_length(index):
+                raise ValueError(f"Chunk {index} must be {session.expected_length(index)} bytes, got {len(data)}")
+
+            length = len(data)
+            if index == 0 and data.startswith(_BOM):
+                data = data[len(_BOM):]
+            buffer = session.pending + data
+            ends = _record_ends(buffer)
+            if session.header is None:
+                if not len(ends):
+                    session.pending = buffer
+                else:
+                    self._set_header(session, buffer[:ends[0]])
+                    buffer = buffer[ends[0]:]
+                    ends = ends - ends[0]
+            if session.header is not None:
+                complete = int(ends[-1]) if len(ends) else 0
+                self._score_records(session, buffer[:complete])
+                session.pending = buffer[complete:]
+            if len(session.pending) > max(4 * session.chunk_size, 1024 * 1024):
+                raise ValueError("CSV record too long; is a quoted field left open?")
+
+            session.next_chunk += 1
+            session.received_bytes += length
+            self._save(session)
+            return self._status(session)
+
+    def _set_header(self, session: _UploadSession, header: bytes) -> None:
+        try:
+            columns = pd.read_csv(io.BytesIO(header), encoding="utf-8", nrows=0).columns
+        except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError):
+            raise ValueError("Invalid CSV format")
+        if "comment" in columns:
+            session.comment_column = "comment"
+        elif "Comment" in columns:
+            session.comment_column = "Comment"
+        else:
+            raise ValueError("CSV must contain a 'comment' or 'Comment' column")
+        session.header = header
+
+    def _score_records(self, session: _UploadSession, records: bytes) -> None:
+        if not records.strip():
+            return
+        try:
+            # Parsed exactly like /analyze-csv parses a whole file
+            df = pd.read_csv(
+                io.BytesIO(session.header + records),
+                encoding="utf-8",
+                dtype={"comment": str, "Comment": str}
+            )
+        except (pd.errors.ParserError, UnicodeDecodeError):
+            raise ValueError("Invalid CSV format")
+        comments = df[session.comment_column].dropna().astype(str).tolist()
+        if self.max_comment_length is not None:
+            for i, comment in enumerate(comments):
+                if len(comment) > self.max_comment_length:
+                    raise ValueError(
+                        f"Comment {session.scored + i} exceeds the maximum length of {self.max_comment_length} characters"
+                    )
+        results = self.sentiment.score_comments(comments, insights=session.insights)
+        if not results:
+            return
+
+        session_dir = self._session_dir(session.upload_id)
+        with open(os.path.join(session_dir, "rows.csv"), "a", encoding="utf-8", newline="") as rows:
+            write_result_rows(rows, results)
+            session.rows_bytes = rows.tell()
+        compounds = np.fromiter((result.scores.compound for result in results), dtype=np.float64, count=len(results))
+        with open(os.path.join(session_dir, "compounds.f8"), "ab") as f:
+            f.write(compounds.tobytes())
+        for result in results:
+            session.counts[result.sentiment.value] += 1
+        session.scored += len(results)
+
+    def finalize(self, upload_id: str) -> SentimentResponse:
+        """
+        Score the last record and build the summary and results file.
+
+        Finalizing again returns the same response.
+
+        Args:
+            upload_id: The session.
+
+        Returns:
+            The summary (and insights) of the whole file, without per-comment
+            results; those are in the results file.
+
+        Raises:
+            UploadNotFoundError: If the session doesn't exist.
+            ValueError: If chunks are missing or the file has no comments.
+        """
+        with self._lock(upload_id):
+            session = self._load(upload_id)
+            if session.response is not None:
+                return SentimentResponse(**session.response)
+            if session.received_bytes < session.size:
+                raise ValueError(f"Upload is incomplete; next chunk is {session.next_chunk}")
+            if session.header is None:
+                if not session.pending.strip():
+                    raise ValueError("CSV file is empty")
+                ends = _record_ends(session.pending)
+                self._set_header(session, session.pending[:ends[0]] if len(ends) else session.pending)
+                session.pending = session.pending[ends[0]:] if len(ends) else b""
+            self._score_records(session, session.pending)
+            session.pending = b""
+            if session.scored == 0:
+                raise ValueError("No valid comments found in CSV")
+
+            session_dir = self._session_dir(upload_id)
+            compounds = np.fromfile(os.path.join(session_dir, "compounds.f8"), dtype=np.float64)
+            total = session.scored
+            # Same arithmetic as SentimentAnalyzer.get_summary_stats over the whole file
+            summary = SentimentSummary(
+                total_comments=total,
+                positive_comments=session.counts["positive"],
+                negative_comments=session.counts["negative"],
+                neutral_comments=session.counts["neutral"],
+                positive_percentage=(session.counts["positive"] / total) * 100,
+                negative_percentage=(session.counts["negative"] / total) * 100,
+                neutral_percentage=(session.counts["neutral"] / total) * 100,
+                average_compound=float(pd.Series(compounds).mean())
+            )
+            response = SentimentResponse(summary=summary)
+            if session.insights is not None:
+                response.insights = CommentInsights(**session.insights.to_dict())
+
+            temp_path = os.path.join(session_dir, "results.csv.tmp")
+            with open(temp_path, "w", encoding="utf-8", newline="") as output:
+                csv.writer(output).writerow(RESULT_CSV_HEADER)
+                with open(os.path.join(session_dir, "rows.csv"), "r", encoding="utf-8", newline="") as rows:
+                    shutil.copyfileobj(rows, output)
+                write_summary_rows(output, summary)
+            os.replace(temp_path, os.path.join(session_dir, "results.csv"))
+
+            session.response = response.model_dump(mode="json")
+            self._save(session)
+            return response
+
+    def results_path(self, upload_id: str) -> str:
+        """
+        Get the results file of a finalized upload.
+
+        Raises:
+            UploadNotFoundError: If the session doesn't exist.
+            ValueError: If the upload isn't finalized yet.
+        """
+        with self._lock(upload_id):
+            session = self._load(upload_id)
+            if session.response is None:
+                raise ValueError("Upload is not finalized yet")
+            return os.path.join(self._session_dir(upload_id), "results.csv")
+
+    def delete(self, upload_id: str) -> None:
+        """
+        Delete a session and its files.
+
+        Raises:
+            UploadNotFoundError: If the session doesn't exist.
+        """
+        with self._lock(upload_id):
+            self._load(upload_id)
+            shutil.rmtree(self._session_dir(upload_id), ignore_errors=True)
+        with self._locks_lock:
+            self._locks.pop(upload_id, None)
@@ -0,0 +1,86 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from load_test import launch_server
+from src.api.use_cases.csv_coordinator_use_case import CsvCoordinatorUseCase, ShardError
+
+
+def main():
+    """
+    Score one large CSV file across several API instances.
+    """
+    parser = argparse.ArgumentParser(description="Split a large CSV into shards and score them on several API instances.")
+    parser.add_argument("path", help="CSV file with a 'comment' or 'Comment' column")
+    parser.add_argument("--worker", action="append", default=[], dest="workers",
+                        help="Base URL of an API instance (repeat for several)")
+    parser.add_argument("--launch", type=int, default=0,
+                        help="Launch this many local API instances on consecutive ports instead")
+    parser.add_argument("--port", type=int, default=8765, help="First port for --launch")
+    parser.add_argument("--output", help="Results CSV to write (default: <path>.results.csv)")
+    parser.add_argument("--summary", help="Also write the merged JSON response here")
+    parser.add_argument("--shard-mb", type=float, default=16, help="Approximate shard size in MB")
+    parser.add_argument("--shards-per-worker", type=int, default=1, help="Shards scored concurrently per instance")
+    parser.add_argument("--attempts", type=int, default=3, help="Attempts per shard before giving up")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds an instance may take per shard")
+    parser.add_argument("--gzip", action="store_true", help="Upload shards gzip-compressed")
+    parser.add_argument("--group-by", action="append", help="CSV column to compute per-group summaries over")
+    parser.add_argument("--top-k", type=int, default=0, help="Report the top-K comments and emoji statistics")
+    args = parser.parse_args()
+
+    servers = []
+    if args.launch:
+        print(f"Launching {args.launch} local instance(s) from port {args.port}...")
+        for port in range(args.port, args.port + args.launch):
+            servers.append(launch_server(port, 1))
+            args.workers.append(f"http://127.0.0.1:{port}")
+    if not args.workers:
+        parser.error("give at least one --worker or use --launch")
+
+    output = args.output or args.path + ".results.csv"
+    coordinator = CsvCoordinatorUseCase(
+        args.workers,
+        shard_bytes=int(args.shard_mb * 1024 * 1024),
+        max_attempts=args.attempts,
+        timeout=args.timeout,
+        shards_per_worker=args.shards_per_worker,
+        compress=args.gzip,
+    )
+
+    try:
+        print(f"Scoring {args.path} on {len(args.workers)} instance(s)...")
+        start = time.perf_counter()
+        response = coordinator.score_csv(args.path, output, group_by=args.group_by, top_k=args.top_k)
+        elapsed = time.perf_counter() - start
+    except (ShardError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+
+    summary = response.summary
+    stats = coordinator.stats
+    print(f"Scored {summary.total_comments} comments in {elapsed:.1f}s "
+          f"({summary.total_comments / max(elapsed, 1e-9):.0f} comments/s)")
+    print(f"Shards: {stats['shards']} ({stats['retries']} retried)")
+    for worker, count in stats["shards_per_worker"].items():
+        print(f"  {worker}: {count}")
+    print(f"Positive: {summary.positive_percentage:.1f}%  Negative: {summary.negative_percentage:.1f}%  "
+          f"Neutral: {summary.neutral_percentage:.1f}%  Average compound: {summary.average_compound:.4f}")
+    print(f"Results written to {output}")
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(response.model_dump(mode="json", exclude_none=True), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.sentiment_analysis.corpus import OUTPUT_COLUMNS, score_corpus
+
+
+def main():
+    """
+    Score a newline-delimited comment dump through memory mappings.
+    """
+    parser = argparse.ArgumentParser(description="Score a multi-GB newline-delimited comment file.")
+    parser.add_argument("path", help="File with one comment per line")
+    parser.add_argument("--output", help="Output .npy file (default: <path>.scores.npy)")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-lines", type=int, default=10000, help="Lines scored per task")
+    parser.add_argument("--emoji-weight", type=float, default=0.3, help="Weight of emoji sentiment (0-1)")
+    args = parser.parse_args()
+
+    print(f"Scoring {args.path}...")
+    start = time.perf_counter()
+    scores = score_corpus(
+        args.path,
+        output_path=args.output,
+        workers=args.workers,
+        chunk_lines=args.chunk_lines,
+        analyzer_kwargs={"emoji_weight": args.emoji_weight},
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"Scored {len(scores)} comments in {elapsed:.1f}s ({len(scores) / max(elapsed, 1e-9):.0f} comments/s)")
+    print(f"Columns: {', '.join(OUTPUT_COLUMNS)}")
+    if len(scores):
+        print(f"Average compound: {float(scores[:, 0].mean()):.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,125 @@
-import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
+import asyncio
+import itertools
+
 import pandas as pd
 import numpy as np
 import emoji
 
 from src.sentiment_analysis.emoji_utils import (
     get_emoji_sentiment_scores, 
+    get_emoji_sentiment_scores_batch,
     combine_sentiment_scores, 
     extract_emojis, 
-    EMOJI_SENTIMENT
+    extract_emojis_batch,
+    get_emoji_table
+)
+from src.sentiment_analysis.backends import create_backend
+from src.sentiment_analysis.cache import ResultCache
+from src.sentiment_analysis.normalization import normalize_comment
+from src.sentiment_analysis.sampling import (
+    mean_margin,
+    proportion_margin,
+    required_sample_size,
+    reservoir_sample,
+    z_score
+)
+from src.sentiment_analysis.prefilter import (
+    ROUTES,
+    ROUTE_EMPTY,
+    ROUTE_EMOJI_ONLY,
+    ROUTE_MODEL,
+    classify_comment,
+    is_emoji_only,
+    neutral_vader_scores
 )
 
+# Compound score thresholds for classifying a comment as positive or negative
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+
+async def _async_batches(comments, batch_size):
+    """Group a regular or async iterable of comments into lists of up to batch_size."""
+    batch = []
+    if hasattr(comments, "__aiter__"):
+        async for comment in comments:
+            batch.append(comment)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    else:
+        for comment in comments:
+            batch.append(comment)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
 class SentimentAnalyzer:
     """Class for analyzing the sentiment of Instagram comments."""
     
-    def __init__(self, model_type="vader", emoji_weight=0.3):
+    def __init__(self, model_type="vader", emoji_weight=0.3, prefilter=True, model_path=None,
+                 fast_model_type=None, fast_model_path=None, uncertainty_band=0.1,
+                 normalize=True, cache_size=10000, cache=None):
         """
         Initialize the sentiment analyzer.
         
         Args:
             model_type (str): The type of model to use for sentiment analysis.
-                Currently only supports "vader" (rule-based).
+                "vader" (rule-based) or "linear" (hashing vectorizer + linear
+                classifier trained with src/train_model.py).
             emoji_weight (float): Weight to give to emoji sentiment scores (0-1).
                 Higher values give more importance to emojis.
+            prefilter (bool): Whether to route comments that VADER cannot score
+                (emoji-only, mentions/hashtags/URLs, non-English text) to cheaper
+                scorers instead of running VADER on them.
+            model_path (str): Path to the trained model artifact for "linear".
+            fast_model_type (str): Enables cascade mode. Comments are first scored
+                with this cheaper backend and only escalated to `model_type`
+                when the result is uncertain.
+            fast_model_path (str): Path to the trained artifact for the fast backend.
+            uncertainty_band (float): In cascade mode, fast results whose compound
+                score is within this distance of the +/-0.05 classification
+                thresholds are escalated. Larger values favour accuracy,
+                smaller values favour throughput.
+            normalize (bool): Whether to canonicalize Instagram noise (mentions,
+                URLs, repeated characters and emojis) before scoring, so
+                comments that only differ in noise share one cache entry.
+            cache_size (int): Maximum number of results kept in the result
+                cache. 0 disables caching.
+            cache (ResultCache): Result cache to use instead of a private one
+                of cache_size entries, e.g. a SharedResultCache that all worker
+                processes on a host share.
         """
         self.model_type = model_type
         self.emoji_weight = emoji_weight
+        self.prefilter = prefilter
+        # Comments scored by each route; results reused from the cache or an
+        # identical comment of the batch are counted apart
+        self.route_counts = {route: 0 for route in ROUTES}
+        self.reused_count = 0
+        self.uncertainty_band = uncertainty_band
+        self.cascade_counts = {"fast": 0, "escalated": 0}
+        self.normalize = normalize
+        self.cache = cache if cache is not None else ResultCache(maxsize=cache_size)
         
-        if model_type == "vader":
-            # Download required NLTK resources if not already downloaded
-            try:
-                nltk.data.find('vader_lexicon')
-            except LookupError:
-                nltk.download('vader_lexicon')
-            
-            self.analyzer = SentimentIntensityAnalyzer()
+        self.backend = create_backend(model_type, model_path=model_path)
+        self.fast_backend = None
+        if fast_model_type is not None:
+            self.fast_backend = create_backend(fast_model_type, model_path=fast_model_path)
         
-        else:
-            raise ValueError("Invalid model_type. Currently only 'vader' is supported.")
+        if model_type == "vader":
+            self.analyzer = self.backend.analyzer
+    
+    def _route_comment(self, comment):
+        """Pick the scoring route for a comment, honouring the prefilter setting."""
+        if self.prefilter:
+            return classify_comment(comment, self.backend.lexicon)
+        if not comment or not isinstance(comment, str):
+            return ROUTE_EMPTY
+        return ROUTE_EMOJI_ONLY if is_emoji_only(comment) else ROUTE_MODEL
     
     def analyze_comment(self, comment):
         """
@@ -49,34 +131,255 @@ class SentimentAnalyzer:
         Returns:
             dict: A dictionary containing sentiment scores and classification.
         """
-        if not comment or not isinstance(comment, str):
+        return self._analyze_batch([comment])[0]
+    
+    def _canonical_key(self, comment):
+        """Return the cache key for a comment, or None if it isn't cacheable."""
+        if not isinstance(comment, str):
+            return None
+        return normalize_comment(comment) if self.normalize else comment
+    
+    def _analyze_batch(self, comments, table=None, emoji_components=None):
+        """
+        Analyze a batch of comments, reusing cached results where possible.
+        
+        Comments are canonicalized first; each distinct canonical text is
+        scored at most once, with all comments routed to the model scored in a
+        single backend batch.
+        
+        Args:
+            comments (list): The comments to analyze.
+            table (EmojiTable): Emoji table to score the whole batch with.
+                Defaults to the table currently in use.
+            emoji_components (list): If given, filled with the part of each
+                comment's compound score that comes from its emojis.
+            
+        Returns:
+            list: One result dict per comment, in input order.
+        """
+        keys = [self._canonical_key(comment) for comment in comments]
+        results = [None] * len(comments)
+        # Score the whole batch against one emoji table, even if it's swapped meanwhile
+        table = get_emoji_table() if table is None else table
+        
+        # Look up distinct canonical texts in the cache
+        pending = {}
+        reused = 0
+        for i, key in enumerate(keys):
+            if key is None:
+                continue
+            if key in pending:
+                pending[key].append(i)
+                reused += 1
+                continue
+            cached = self.cache.get(key, table.version)
+            if cached is not None:
+                results[i] = cached
+                reused += 1
+            else:
+                pending[key] = [i]
+        self.reused_count += reused
+        
+        # Route and score the texts that missed the cache
+        texts = list(pending)
+        routes = [self._route_comment(text) for text in texts]
+        for route in routes:
+            self.route_counts[route] += 1
+        
+        # Emojis of all missed texts are found and scored in one vectorized pass
+        emoji_scores = self._emoji_scores(texts, table)
+        emojis = extract_emojis_batch(texts)
+        
+        model_indices = [j for j, route in enumerate(routes) if route == ROUTE_MODEL]
+        model_scores = {}
+        if model_indices:
+            batch_scores = self._score_with_model(
+                [texts[j] for j in model_indices], table, [emoji_scores[j] for j in model_indices]
+            )
+            model_scores = dict(zip(model_indices, batch_scores))
+        
+        for j, text in enumerate(texts):
+            result = self._build_result(text, routes[j], model_scores.get(j), table, emoji_scores[j], emojis[j])
+            self.cache.put(text, result, table.version)
+            for i in pending[text]:
+                results[i] = result
+        
+        if emoji_components is not None:
+            emoji_components.extend(self._emoji_components(keys, table, dict(zip(texts, zip(routes, emoji_scores, emojis)))))
+        
+        output = []
+        for i, comment in enumerate(comments):
+            if keys[i] is None:
+                self.route_counts[ROUTE_EMPTY] += 1
+                result = self._build_result(comment, ROUTE_EMPTY, None, table)
+            else:
+                result = dict(results[i])
+                # Report the emojis actually present in the original comment
+                if comment != keys[i]:
+                    result["emojis"] = extract_emojis(comment)
+                else:
+                    result["emojis"] = list(result["emojis"])
+            output.append(result)
+        
+        return output
+    
+    def _emoji_components(self, keys, table, scored):
+        """
+        Compute the part of each comment's compound score that comes from its emojis.
+        
+        Args:
+            keys (list): Canonical texts of the comments (None for uncacheable ones).
+            table (EmojiTable): The emoji table the comments were scored with.
+            scored (dict): (route, emoji scores, emojis) of the texts scored in
+                this batch; cached texts are routed and scored here.
+                
+        Returns:
+            list: One emoji component per comment.
+        """
+        cached = [key for key in dict.fromkeys(keys) if key is not None and key not in scored]
+        if cached:
+            cached_scores = self._emoji_scores(cached, table)
+            cached_emojis = extract_emojis_batch(cached)
+            for j, key in enumerate(cached):
+                scored[key] = (self._route_comment(key), cached_scores[j], cached_emojis[j])
+        
+        components = []
+        for key in keys:
+            if key is None:
+                components.append(0.0)
+                continue
+            route, emoji_scores, emojis = scored[key]
+            components.append(self._emoji_share(route, emojis, emoji_scores, table) * emoji_scores["compound"])
+        return components
+    
+    def _emoji_share(self, route, emojis, emoji_scores, table):
+        """Weight a comment's emoji scores get in its result: all of it for emoji-only content."""
+        if route == ROUTE_EMPTY:
+            return 0.0
+        if route == ROUTE_EMOJI_ONLY and any(e in table for e in emojis):
+            return 1.0
+        if emoji_scores["pos"] == 0 and emoji_scores["neg"] == 0:
+            return 0.0
+        return self.emoji_weight
+    
+    def _score_with_model(self, comments, table=None, emoji_scores=None):
+        """
+        Score a batch of comments with the model backend(s).
+        
+        In cascade mode, the fast backend scores the whole batch and only the
+        comments whose combined compound score is uncertain are re-scored
+        with the main backend.
+        
+        Args:
+            comments (list): Comments routed to the model.
+            table (EmojiTable): Emoji table to combine scores with. Defaults
+                to the table currently in use.
+            emoji_scores (list): The comments' emoji scores, if already computed.
+            
+        Returns:
+            list: One dict of model scores per comment.
+        """
+        if self.fast_backend is None:
+            return self._backend_scores(self.backend, comments)
+        
+        scores = self._backend_scores(self.fast_backend, comments)
+        if emoji_scores is None:
+            emoji_scores = self._emoji_scores(comments, table)
+        uncertain = [
+            i for i, comment in enumerate(comments)
+            if self.is_uncertain(self._combined_scores(comment, scores[i], emoji_scores[i], table)["compound"])
+        ]
+        
+        if uncertain:
+            escalated = self._backend_scores(self.backend, [comments[i] for i in uncertain])
+            for i, model_scores in zip(uncertain, escalated):
+                scores[i] = model_scores
+        
+        self.cascade_counts["fast"] += len(comments) - len(uncertain)
+        self.cascade_counts["escalated"] += len(uncertain)
+        return scores
+    
+    @staticmethod
+    def _emoji_scores(comments, table=None):
+        """Score the emojis of a batch of comments in one vectorized pass and split them into per-comment dicts."""
+        batch_scores = get_emoji_sentiment_scores_batch(comments, table)
+        return [
+            {key: float(batch_scores[key][i]) for key in ("pos", "neg", "neu", "compound")}
+            for i in range(len(comments))
+        ]
+    
+    @staticmethod
+    def _backend_scores(backend, comments):
+        """Score comments with a backend and split the arrays into per-comment dicts."""
+        batch_scores = backend.score(comments)
+        return [
+            {key: float(values[i]) for key, values in batch_scores.items()}
+            for i in range(len(comments))
+        ]
+    
+    def is_uncertain(self, compound):
+        """
+        Check whether a compound score is too close to a classification threshold to trust.
+        
+        Args:
+            compound (float): The compound score to check.
+            
+        Returns:
+            bool: True if the score lies within the uncertainty band around +/-0.05.
+        """
+        return abs(abs(compound) - POSITIVE_THRESHOLD) <= self.uncertainty_band
+    
+    def _combined_scores(self, comment, model_scores, emoji_scores=None, table=None):
+        """Combine model scores with a comment's emoji scores."""
+        if emoji_scores is None:
+            emoji_scores = get_emoji_sentiment_scores(comment, table)
+        return combine_sentiment_scores(model_scores, emoji_scores, self.emoji_weight)
+    
+    def _build_result(self, comment, route, model_scores, table=None, emoji_scores=None, emojis=None):
+        """
+        Combine model and emoji scores for a routed comment into a result.
+        
+        Args:
+            comment (str): The comment being analyzed.
+            route (str): The pre-filter route chosen for the comment.
+            model_scores (dict): Backend scores for ROUTE_MODEL comments, None otherwise.
+            table (EmojiTable): Emoji table to score with. Defaults to the
+                table currently in use.
+            emoji_scores (dict): The comment's emoji scores, if already computed.
+            emojis (list): The comment's emojis, if already extracted.
+            
+        Returns:
+            dict: A dictionary containing sentiment scores and classification.
+        """
+        if route == ROUTE_EMPTY:
             return {"compound": 0, "positive": 0, "negative": 0, "neutral": 0, "sentiment": "neutral", "emojis": []}
         
         # Extract emojis
-        emojis = extract_emojis(comment)
-        
-        # Get VADER sentiment scores
-        vader_scores = self.analyzer.polarity_scores(comment)
+        if emojis is None:
+            emojis = extract_emojis(comment)
         
         # Get emoji sentiment scores
-        emoji_scores = get_emoji_sentiment_scores(comment)
-        
-        # For emoji-only content, give more weight to emoji scores
-        emojis = extract_emojis(comment)
-        is_emoji_only = len(emojis) > 0 and len(comment.strip()) == len(''.join(emojis))
+        table = get_emoji_table() if table is None else table
+        if emoji_scores is None:
+            emoji_scores = get_emoji_sentiment_scores(comment, table)
         
         # Use emoji scores directly for emoji-only content, or combine for mixed content
-        if is_emoji_only and any(e in EMOJI_SENTIMENT for e in emojis):
+        if route == ROUTE_EMOJI_ONLY and any(e in table for e in emojis):
             # For emoji-only content with known emojis, use emoji scores directly
             scores = emoji_scores
         else:
+            # Only comments routed to the model were scored by it; every other
+            # route is known to get a neutral VADER score
+            if model_scores is None:
+                model_scores = neutral_vader_scores(comment)
+            
             # For mixed content or unknown emojis, combine scores
-            scores = combine_sentiment_scores(vader_scores, emoji_scores, self.emoji_weight)
+            scores = self._combined_scores(comment, model_scores, emoji_scores, table)
         
         # Determine sentiment based on compound score
-        if scores['compound'] >= 0.05:
+        if scores['compound'] >= POSITIVE_THRESHOLD:
             sentiment = "positive"
-        elif scores['compound'] <= -0.05:
+        elif scores['compound'] <= NEGATIVE_THRESHOLD:
             sentiment = "negative"
         else:
             sentiment = "neutral"
@@ -90,24 +393,251 @@ class SentimentAnalyzer:
             "emojis": emojis
         }
     
-    def analyze_comments(self, comments):
+    def _score_components(self, comments):
+        """
+        Compute the weight-independent score components of comments.
+        
+        Args:
+            comments (list): The comments to score.
+            
+        Returns:
+            tuple: (model, emoji, emoji_only, has_emoji_scores, empty) where
+                model and emoji are (n, 4) arrays of compound, positive,
+                negative and neutral scores, emoji_only marks comments scored
+                by their emojis alone, has_emoji_scores marks comments whose
+                emoji scores get combined with the model scores and empty
+                marks comments that always score zero.
+        """
+        n = len(comments)
+        model = np.zeros((n, 4))
+        emoji_components = np.zeros((n, 4))
+        emoji_only = np.zeros(n, dtype=bool)
+        has_emoji_scores = np.zeros(n, dtype=bool)
+        empty = np.zeros(n, dtype=bool)
+        
+        table = get_emoji_table()
+        
+        # Score each distinct canonical text once
+        pending = {}
+        for i, comment in enumerate(comments):
+            key = self._canonical_key(comment)
+            if key is None:
+                empty[i] = True
+            else:
+                pending.setdefault(key, []).append(i)
+        
+        texts = list(pending)
+        routes = [self._route_comment(text) for text in texts]
+        model_indices = [j for j, route in enumerate(routes) if route == ROUTE_MODEL]
+        model_scores = {}
+        if model_indices:
+            # Escalation decisions depend on the emoji weight, so the sweep
+            # always uses the main backend
+            batch_scores = self._backend_scores(self.backend, [texts[j] for j in model_indices])
+            model_scores = dict(zip(model_indices, batch_scores))
+        
+        emoji_scores = get_emoji_sentiment_scores_batch(texts, table)
+        text_emoji_components = np.column_stack(
+            [emoji_scores["compound"], emoji_scores["pos"], emoji_scores["neg"], emoji_scores["neu"]]
+        )
+        
+        for j, text in enumerate(texts):
+            rows = pending[text]
+            if routes[j] == ROUTE_EMPTY:
+                empty[rows] = True
+                continue
+            
+            scores = model_scores.get(j) or neutral_vader_scores(text)
+            model[rows] = [scores["compound"], scores["pos"], scores["neg"], scores["neu"]]
+            emoji_components[rows] = text_emoji_components[j]
+            emoji_only[rows] = routes[j] == ROUTE_EMOJI_ONLY and emoji_scores["count"][j] > 0
+            has_emoji_scores[rows] = emoji_scores["pos"][j] != 0 or emoji_scores["neg"][j] != 0
+        
+        return model, emoji_components, emoji_only, has_emoji_scores, empty
+    
+    def sweep_emoji_weights(self, comments, emoji_weights):
+        """
+        Summarize comments under several emoji weights in one pass.
+        
+        The model and emoji scores of each comment are computed once; the
+        combined scores of every weight are then derived with one vectorized
+        blend, so comparing N weights costs about the same as analyzing once.
+        
+        Args:
+            comments (list): The comments to analyze.
+            emoji_weights (list): The emoji weights (0-1) to compare.
+            
+        Returns:
+            pd.DataFrame: One row per weight with the emoji weight and the
+                summary statistics of `get_summary_stats`.
+        """
+        comments = list(comments)
+        weights = np.asarray(emoji_weights, dtype=float)
+        model, emoji_components, emoji_only, has_emoji_scores, empty = self._score_components(comments)
+        
+        # (weights, comments) compound scores, blended like combine_sentiment_scores
+        blend = model[:, 0] * (1 - weights[:, None]) + emoji_components[:, 0] * weights[:, None]
+        compound = np.where(has_emoji_scores, blend, model[:, 0])
+        compound = np.where(emoji_only, emoji_components[:, 0], compound)
+        compound = np.where(empty, 0.0, compound)
+        
+        total = len(comments)
+        positive = (compound >= POSITIVE_THRESHOLD).sum(axis=1)
+        negative = (compound <= NEGATIVE_THRESHOLD).sum(axis=1)
+        neutral = total - positive - negative
+        
+        rows = []
+        for i, weight in enumerate(weights):
+            rows.append({
+                "emoji_weight": float(weight),
+                "total_comments": total,
+                "positive_comments": int(positive[i]),
+                "negative_comments": int(negative[i]),
+                "neutral_comments": int(neutral[i]),
+                "positive_percentage": (positive[i] / total) * 100 if total > 0 else 0,
+                "negative_percentage": (negative[i] / total) * 100 if total > 0 else 0,
+                "neutral_percentage": (neutral[i] / total) * 100 if total > 0 else 0,
+                "average_compound": float(compound[i].mean()) if total > 0 else 0
+            })
+        
+        return pd.DataFrame(rows)
+    
+    def analyze_comments(self, comments, insights=None):
         """
         Analyze the sentiment of multiple comments.
         
+        Comments that need the model are scored in a single backend batch, and
+        comments with the same canonical text are only scored once.
+        
         Args:
             comments (list): A list of comments to analyze.
+            insights (SentimentInsights): Optional accumulator of top-K extremes
+                and emoji statistics to update with the results.
             
         Returns:
             pd.DataFrame: A DataFrame containing the sentiment analysis results.
         """
-        results = []
+        return pd.DataFrame(self._analyze_with_comments(list(comments), insights))
+    
+    def _analyze_with_comments(self, comments, insights=None):
+        """Analyze a batch of comments into result dicts that include the comment."""
+        table = get_emoji_table()
+        emoji_components = [] if insights is not None else None
+        results = self._analyze_batch(comments, table, emoji_components)
         
-        for comment in comments:
-            result = self.analyze_comment(comment)
+        for result, comment in zip(results, comments):
             result["comment"] = comment
-            results.append(result)
         
-        return pd.DataFrame(results)
+        if insights is not None:
+            insights.update(
+                comments,
+                [result["compound"] for result in results],
+                [result["emojis"] for result in results],
+                emoji_components,
+                table
+            )
+        
+        return results
+    
+    def analyze_iter(self, comments, batch_size=1000, insights=None):
+        """
+        Lazily analyze comments from any iterable, such as a file or database cursor.
+        
+        Comments are pulled and scored `batch_size` at a time, so the batched
+        backend and cache paths are used while memory stays bounded by the
+        batch size regardless of how many comments flow through.
+        
+        Args:
+            comments (iterable): The comments to analyze.
+            batch_size (int): Number of comments scored per internal batch.
+            insights (SentimentInsights): Optional accumulator of top-K extremes
+                and emoji statistics to update with the results.
+            
+        Yields:
+            dict: One result per comment, in input order, with the same keys
+                as the rows of `analyze_comments`.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        iterator = iter(comments)
+        while True:
+            batch = list(itertools.islice(iterator, batch_size))
+            if not batch:
+                return
+            yield from self._analyze_with_comments(batch, insights)
+    
+    async def analyze_iter_async(self, comments, batch_size=1000, insights=None):
+        """
+        Async counterpart of `analyze_iter`.
+        
+        Accepts a regular or an async iterable. Each batch is scored in the
+        default thread pool executor, so the event loop stays responsive.
+        
+        Args:
+            comments (iterable or async iterable): The comments to analyze.
+            batch_size (int): Number of comments scored per internal batch.
+            insights (SentimentInsights): Optional accumulator of top-K extremes
+                and emoji statistics to update with the results.
+            
+        Yields:
+            dict: One result per comment, in input order.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        loop = asyncio.get_running_loop()
+        async for batch in _async_batches(comments, batch_size):
+            results = await loop.run_in_executor(None, self._analyze_with_comments, batch, insights)
+            for result in results:
+                yield result
+    
+    def get_route_stats(self):
+        """
+        Get how many comments each pre-filter route has scored.
+        
+        These count scoring work, not traffic: a comment answered with the
+        result of an identical one (a cache hit or a duplicate in its batch)
+        isn't routed again and is counted by `get_reuse_count` instead.
+        
+        Returns:
+            dict: Dictionary mapping route names to numbers of scored comments.
+        """
+        return dict(self.route_counts)
+    
+    def get_reuse_count(self):
+        """
+        Get how many comments were answered without being scored.
+        
+        Returns:
+            int: Number of comments whose result came from the result cache or
+                from an identical comment of the same batch.
+        """
+        return self.reused_count
+    
+    def get_cache_stats(self):
+        """
+        Get result cache statistics.
+        
+        Returns:
+            dict: Dictionary with cache size, capacity, hits, misses and hit rate.
+        """
+        return self.cache.stats()
+    
+    def get_cascade_stats(self):
+        """
+        Get how often cascade mode had to escalate to the main backend.
+        
+        Returns:
+            dict: Dictionary with the number of comments settled by the fast
+                backend, the number escalated, and the escalation rate (0-1).
+        """
+        total = self.cascade_counts["fast"] + self.cascade_counts["escalated"]
+        return {
+            "fast_comments": self.cascade_counts["fast"],
+            "escalated_comments": self.cascade_counts["escalated"],
+            "escalation_rate": self.cascade_counts["escalated"] / total if total > 0 else 0
+        }
     
     def get_summary_stats(self, df):
         """
@@ -144,4 +674,182 @@ class SentimentAnalyzer:
             "negative_percentage": (negative / total) * 100 if total > 0 else 0,
             "neutral_percentage": (neutral / total) * 100 if total > 0 else 0,
             "average_compound": df["compound"].mean()
-        }
\ No newline at end of file
+        }
+
+    def get_group_summary_stats(self, df, groups):
+        """
+        Get summary statistics per group in a single vectorized pass.
+        
+        Args:
+            df (pd.DataFrame): DataFrame containing sentiment analysis results.
+            groups (pd.DataFrame): Grouping columns, one row per row of `df`.
+            
+        Returns:
+            list: One dict per group with the group's column values under
+                "group" and its summary statistics under "summary".
+        """
+        if df.empty:
+            return []
+        
+        sentiments = df["sentiment"].to_numpy()
+        frame = pd.DataFrame({
+            "compound": df["compound"].to_numpy(dtype=float),
+            "positive": sentiments == "positive",
+            "negative": sentiments == "negative",
+            "neutral": sentiments == "neutral"
+        })
+        keys = [groups[column].reset_index(drop=True).rename(column) for column in groups.columns]
+        
+        aggregated = frame.groupby(keys, dropna=False, sort=True).agg(
+            total=("compound", "size"),
+            positive=("positive", "sum"),
+            negative=("negative", "sum"),
+            neutral=("neutral", "sum"),
+            average_compound=("compound", "mean")
+        )
+        
+        group_summaries = []
+        for values, row in zip(aggregated.index, aggregated.itertuples(index=False)):
+            if not isinstance(values, tuple):
+                values = (values,)
+            total = int(row.total)
+            group_summaries.append({
+                "group": {
+                    column: None if pd.isna(value) else getattr(value, "item", lambda: value)()
+                    for column, value in zip(groups.columns, values)
+                },
+                "summary": {
+                    "total_comments": total,
+                    "positive_comments": int(row.positive),
+                    "negative_comments": int(row.negative),
+                    "neutral_comments": int(row.neutral),
+                    "positive_percentage": (row.positive / total) * 100,
+                    "negative_percentage": (row.negative / total) * 100,
+                    "neutral_percentage": (row.neutral / total) * 100,
+                    "average_compound": float(row.average_compound)
+                }
+            })
+        
+        return group_summaries
+    
+    def estimate_summary_stats(self, comments, tolerance=1.0, confidence=0.95, batch_size=1000,
+                               min_samples=1000, max_samples=None, random_state=None, population=None):
+        """
+        Estimate summary statistics from a random sample of the comments.
+        
+        Comments are scored in batches in a random order (a simple random
+        sample without replacement) until the confidence intervals of all
+        three sentiment percentages are within `tolerance` percentage points,
+        so large inputs only need a fraction of the comments scored.
+        
+        Args:
+            comments (list): The comments to summarize, or a simple random
+                sample of them when `population` is given.
+            tolerance (float): Target margin of error of the percentages, in
+                percentage points. 0 scores every comment.
+            confidence (float): Confidence level of the margins (0-1).
+            batch_size (int): Number of comments scored between checks.
+            min_samples (int): Minimum sample size before stopping early, to
+                keep the normal approximation reasonable.
+            max_samples (int): Upper bound on the sample size. None allows
+                scoring every comment.
+            random_state (int): Seed of the sampling order.
+            population (int): Number of comments `comments` was sampled from.
+                None means `comments` holds all of them.
+            
+        Returns:
+            dict: The estimated summary statistics (counts are scaled to the
+                full population) under "summary", and the sample size,
+                population size, confidence level and margins of error under
+                "estimate".
+        """
+        if population is None:
+            population = len(comments)
+        limit = len(comments) if max_samples is None else min(max_samples, len(comments))
+        z = z_score(confidence)
+        order = np.random.default_rng(random_state).permutation(len(comments))
+        
+        counts = {"positive": 0, "negative": 0, "neutral": 0}
+        compound_sum = 0.0
+        compound_squares = 0.0
+        sampled = 0
+        margins = {}
+        
+        while sampled < limit:
+            batch = order[sampled:min(sampled + batch_size, limit)]
+            df = self.analyze_comments([comments[i] for i in batch])
+            for sentiment, count in df["sentiment"].value_counts().items():
+                counts[sentiment] += int(count)
+            compounds = df["compound"].to_numpy(dtype=float)
+            compound_sum += float(compounds.sum())
+            compound_squares += float(np.dot(compounds, compounds))
+            sampled += len(batch)
+            
+            margins = {
+                f"{sentiment}_percentage": proportion_margin(count / sampled, sampled, population, z) * 100
+                for sentiment, count in counts.items()
+            }
+            if sampled >= min_samples and max(margins.values()) <= tolerance:
+                break
+        
+        if sampled == 0:
+            margins = {f"{sentiment}_percentage": 0.0 for sentiment in counts}
+        # Compound scores lie in [-1, 1], so no margin is wider than the whole range
+        margins["average_compound"] = min(
+            mean_margin(compound_sum, compound_squares, sampled, population, z), 2.0
+        )
+        
+        share = {sentiment: count / sampled if sampled else 0 for sentiment, count in counts.items()}
+        return {
+            "summary": {
+                "total_comments": population,
+                "positive_comments": int(round(share["positive"] * population)),
+                "negative_comments": int(round(share["negative"] * population)),
+                "neutral_comments": int(round(share["neutral"] * population)),
+                "positive_percentage": share["positive"] * 100,
+                "negative_percentage": share["negative"] * 100,
+                "neutral_percentage": share["neutral"] * 100,
+                "average_compound": compound_sum / sampled if sampled else 0
+            },
+            "estimate": {
+                "sampled_comments": sampled,
+                "population": population,
+                "confidence": confidence,
+                "exact": sampled == population,
+                "margins": margins
+            }
+        }
+    
+    def estimate_summary_stats_from_chunks(self, chunks, tolerance=1.0, confidence=0.95, batch_size=1000,
+                                           min_samples=1000, max_samples=None, random_state=None):
+        """
+        Estimate summary statistics of comments read in chunks.
+        
+        A reservoir sample as large as the tolerance can require (or
+        `max_samples`) is kept while reading, so memory doesn't grow with the
+        number of comments, and then scored like `estimate_summary_stats`.
+        
+        Args:
+            chunks (iterable): Lists of comments, e.g. one per chunk of a CSV file.
+            tolerance (float): Target margin of error of the percentages, in
+                percentage points. 0 scores every comment.
+            confidence (float): Confidence level of the margins (0-1).
+            batch_size (int): Number of comments scored between checks.
+            min_samples (int): Minimum sample size before stopping early.
+            max_samples (int): Upper bound on the sample size.
+            random_state (int): Seed of the sample and its scoring order.
+            
+        Returns:
+            dict: The estimate, as returned by `estimate_summary_stats`.
+        """
+        size = required_sample_size(tolerance, confidence)
+        if size is not None:
+            size = max(size, min_samples)
+        if max_samples is not None:
+            size = max_samples if size is None else min(size, max_samples)
+        rng = np.random.default_rng(random_state)
+        sample, population = reservoir_sample(chunks, size, rng)
+        return self.estimate_summary_stats(
+            sample, tolerance=tolerance, confidence=confidence, batch_size=batch_size,
+            min_samples=min_samples, max_samples=max_samples, random_state=rng, population=population
+        )
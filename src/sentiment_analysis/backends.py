@@ -0,0 +1,248 @@
+import abc
+import json
+
+import nltk
+import numpy as np
+import pandas as pd
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+# Keys of the score arrays every backend returns
+SCORE_KEYS = ("pos", "neg", "neu", "compound")
+
+LABELS = ("negative", "neutral", "positive")
+
+
+class SentimentBackend(abc.ABC):
+    """
+    Base class for sentiment scoring backends.
+
+    A backend scores whole batches of texts at once and returns one NumPy array
+    per score, aligned with the input. This lets vectorized backends amortize
+    their work across a batch while per-text backends simply loop.
+    """
+
+    name = None
+
+    # VADER lexicon used by the pre-filter to skip texts the backend can't score.
+    # Backends without a lexicon leave this as None.
+    lexicon = None
+
+    @abc.abstractmethod
+    def score(self, texts):
+        """
+        Score a batch of texts.
+
+        Args:
+            texts (list): A list of strings to score.
+
+        Returns:
+            dict: Dictionary mapping "pos", "neg", "neu" and "compound" to
+                float arrays of the same length as `texts`.
+        """
+
+
+class VaderBackend(SentimentBackend):
+    """Rule-based backend using NLTK's VADER."""
+
+    name = "vader"
+
+    def __init__(self):
+        # Download required NLTK resources if not already downloaded
+        try:
+            nltk.data.find('vader_lexicon')
+        except LookupError:
+            nltk.download('vader_lexicon')
+
+        self.analyzer = SentimentIntensityAnalyzer()
+        self.lexicon = self.analyzer.lexicon
+
+    def score(self, texts):
+        scores = {key: np.empty(len(texts)) for key in SCORE_KEYS}
+        for i, text in enumerate(texts):
+            polarity = self.analyzer.polarity_scores(text)
+            for key in SCORE_KEYS:
+                scores[key][i] = polarity[key]
+        return scores
+
+
+class LinearBackend(SentimentBackend):
+    """
+    Lightweight ML backend: hashing vectorizer + linear classifier.
+
+    Texts are hashed into a sparse feature matrix and scored with a single
+    sparse matrix product against the model weights, so a whole batch costs
+    one vectorization pass plus one matmul. The hashing vectorizer is
+    stateless, so the artifact only stores its parameters and the weights.
+    """
+
+    name = "linear"
+
+    def __init__(self, coef, intercept, classes, vectorizer_params):
+        """
+        Initialize the backend from trained weights.
+
+        Args:
+            coef (np.ndarray): Weight matrix of shape (n_classes, n_features),
+                or (1, n_features) for a binary model.
+            intercept (np.ndarray): Intercepts, one per row of `coef`.
+            classes (list): Class labels, a subset of "negative", "neutral", "positive".
+            vectorizer_params (dict): Parameters for HashingVectorizer.
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        unknown = set(classes) - set(LABELS)
+        if unknown:
+            raise ValueError(f"Unknown sentiment labels in model: {sorted(unknown)}")
+
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.classes = list(classes)
+        self.vectorizer_params = dict(vectorizer_params)
+        self.vectorizer = HashingVectorizer(**self.vectorizer_params)
+
+    def predict_proba(self, texts):
+        """
+        Compute class probabilities for a batch of texts.
+
+        Args:
+            texts (list): A list of strings to score.
+
+        Returns:
+            np.ndarray: Array of shape (len(texts), len(self.classes)).
+        """
+        features = self.vectorizer.transform(texts)
+        logits = np.asarray(features @ self.coef.T) + self.intercept
+
+        if self.coef.shape[0] == 1:
+            # Binary model: the single logit is for the second class
+            positive = 1.0 / (1.0 + np.exp(-logits[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return probabilities
+
+    def score(self, texts):
+        probabilities = self.predict_proba(list(texts))
+        columns = {label: probabilities[:, i] for i, label in enumerate(self.classes)}
+        zeros = np.zeros(len(texts))
+
+        pos = columns.get("positive", zeros)
+        neg = columns.get("negative", zeros)
+        neu = columns.get("neutral", zeros)
+
+        return {"pos": pos, "neg": neg, "neu": neu, "compound": pos - neg}
+
+    @classmethod
+    def train(cls, texts, labels, n_features=2 ** 18, ngram_range=(1, 2), C=1.0):
+        """
+        Train a linear backend from labeled texts.
+
+        Args:
+            texts (list): Training texts.
+            labels (list): Sentiment labels ("negative", "neutral" or "positive").
+            n_features (int): Number of hashed features.
+            ngram_range (tuple): Range of word n-grams to hash.
+            C (float): Inverse regularization strength of the logistic regression.
+
+        Returns:
+            LinearBackend: The trained backend.
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        vectorizer_params = {
+            "n_features": n_features,
+            "ngram_range": tuple(ngram_range),
+            "alternate_sign": False,
+            "lowercase": True,
+            "norm": "l2",
+        }
+        features = HashingVectorizer(**vectorizer_params).transform(texts)
+
+        model = LogisticRegression(C=C, max_iter=1000)
+        model.fit(features, labels)
+
+        return cls(model.coef_, model.intercept_, model.classes_.tolist(), vectorizer_params)
+
+    def save(self, path):
+        """
+        Save the backend to a NumPy archive.
+
+        Args:
+            path (str): Destination path (conventionally ending in .npz).
+        """
+        params = dict(self.vectorizer_params, ngram_range=list(self.vectorizer_params["ngram_range"]))
+        np.savez_compressed(
+            path,
+            coef=self.coef,
+            intercept=self.intercept,
+            classes=np.array(self.classes),
+            vectorizer_params=np.array(json.dumps(params)),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a backend saved with `save`.
+
+        Args:
+            path (str): Path to the saved archive.
+
+        Returns:
+            LinearBackend: The loaded backend.
+        """
+        with np.load(path, allow_pickle=False) as artifact:
+            params = json.loads(str(artifact["vectorizer_params"]))
+            params["ngram_range"] = tuple(params["ngram_range"])
+            return cls(
+                artifact["coef"],
+                artifact["intercept"],
+                [str(label) for label in artifact["classes"]],
+                params,
+            )
+
+
+def train_linear_backend(csv_path, text_column="comment", label_column="sentiment", **kwargs):
+    """
+    Train a linear backend from a labeled CSV file.
+
+    Args:
+        csv_path (str): Path to a CSV file with text and label columns.
+        text_column (str): Name of the column holding the comments.
+        label_column (str): Name of the column holding the sentiment labels.
+        **kwargs: Extra arguments passed to `LinearBackend.train`.
+
+    Returns:
+        LinearBackend: The trained backend.
+    """
+    df = pd.read_csv(csv_path)
+    if text_column not in df.columns or label_column not in df.columns:
+        raise ValueError(f"CSV must contain '{text_column}' and '{label_column}' columns")
+
+    df = df.dropna(subset=[text_column, label_column])
+    labels = df[label_column].astype(str).str.lower().str.strip()
+    return LinearBackend.train(df[text_column].astype(str).tolist(), labels.tolist(), **kwargs)
+
+
+def create_backend(model_type="vader", model_path=None):
+    """
+    Create a scoring backend by name.
+
+    Args:
+        model_type (str): "vader" or "linear".
+        model_path (str): Path to a trained artifact, required for "linear".
+
+    Returns:
+        SentimentBackend: The backend instance.
+    """
+    if model_type == "vader":
+        return VaderBackend()
+
+    if model_type == "linear":
+        if not model_path:
+            raise ValueError("model_path is required for the 'linear' model type.")
+        return LinearBackend.load(model_path)
+
+    raise ValueError("Invalid model_type. Supported types are 'vader' and 'linear'.")
@@ -0,0 +1,130 @@
+from collections import OrderedDict
+import threading
+
+
+class ResultCache:
+    """
+    Bounded LRU cache for per-comment sentiment results.
+
+    Keys are canonical comment texts (see normalization.normalize_comment), so
+    comments that only differ in Instagram noise share one entry. Entries are
+    tagged with the version of the emoji table they were scored with, and an
+    entry looked up under a different version is dropped instead of served.
+
+    Caches of serialized bodies (bytes) can also be bounded by their total
+    size, with bodies above a per-entry limit not cached at all.
+    """
+
+    def __init__(self, maxsize=10000, max_bytes=None, max_entry_bytes=None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries to keep. 0 disables caching.
+            max_bytes (int): Maximum total len() of the cached values, evicting
+                least recently used entries beyond it. None doesn't limit it.
+            max_entry_bytes (int): Values longer than this are not cached.
+                None doesn't limit it.
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.skipped = 0
+        self.bytes = 0
+
+    def _size(self, result):
+        return len(result) if self.max_bytes is not None or self.max_entry_bytes is not None else 0
+
+    def get(self, key, version=None):
+        """
+        Look up a cached result.
+
+        Args:
+            key (str): The canonical comment text.
+            version (str): Version of the emoji table in use.
+
+        Returns:
+            dict: The cached result, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry_version, result = entry
+            if entry_version != version:
+                # Scored with another emoji table; invalidate it
+                del self._entries[key]
+                self.bytes -= self._size(result)
+                self.stale += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result, version=None):
+        """
+        Store a result, evicting the least recently used entry if full.
+
+        Args:
+            key (str): The canonical comment text.
+            result (dict): The result to cache.
+            version (str): Version of the emoji table the result was scored with.
+        """
+        if self.maxsize <= 0:
+            return
+        size = self._size(result)
+        with self._lock:
+            if self.max_entry_bytes is not None and size > self.max_entry_bytes:
+                self.skipped += 1
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= self._size(previous[1])
+            self._entries[key] = (version, result)
+            self.bytes += size
+            while len(self._entries) > self.maxsize or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= self._size(evicted)
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.stale = 0
+            self.skipped = 0
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Dictionary with size, capacity, hits, misses, stale
+                (invalidated) entries and hit rate, plus the cached bytes and
+                the number of values too large to cache for size-bounded caches.
+        """
+        lookups = self.hits + self.misses
+        stats = {
+            "size": len(self._entries),
+            "capacity": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0
+        }
+        if self.max_bytes is not None or self.max_entry_bytes is not None:
+            stats["bytes"] = self.bytes
+            stats["skipped"] = self.skipped
+        return stats
@@ -0,0 +1,191 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Columns of the fixed-width output array, one float32 row per input line
+OUTPUT_COLUMNS = ("compound", "positive", "negative", "neutral")
+
+# Bytes scanned at a time when building the line index
+INDEX_BLOCK_SIZE = 64 * 1024 * 1024
+
+
+def index_path_for(path):
+    """Return where the line index for a corpus file is persisted."""
+    return str(path) + ".idx.npy"
+
+
+def build_line_index(path, block_size=INDEX_BLOCK_SIZE):
+    """
+    Build the line-offset index of a newline-delimited file.
+
+    The file is scanned through a memory mapping in fixed-size blocks, so the
+    index can be built for files much larger than RAM.
+
+    Args:
+        path (str): Path to the corpus file.
+        block_size (int): Number of bytes scanned per block.
+
+    Returns:
+        np.ndarray: int64 array of n_lines + 1 offsets; line i spans bytes
+            offsets[i] to offsets[i + 1] - 1 (the newline is excluded).
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return np.zeros(1, dtype=np.int64)
+
+    starts = [np.zeros(1, dtype=np.int64)]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+        for offset in range(0, size, block_size):
+            count = min(block_size, size - offset)
+            block = np.frombuffer(mapping, dtype=np.uint8, count=count, offset=offset)
+            starts.append(np.flatnonzero(block == ord("\n")).astype(np.int64) + offset + 1)
+            del block
+        ends_with_newline = mapping[size - 1] == ord("\n")
+
+    if not ends_with_newline:
+        # Treat the last line as if it were newline-terminated
+        starts.append(np.array([size + 1], dtype=np.int64))
+    return np.concatenate(starts)
+
+
+def load_line_index(path, rebuild=False):
+    """
+    Load the persisted line index of a corpus file, building it if needed.
+
+    The index is stored next to the file (see `index_path_for`) and rebuilt
+    when it is older than the file or doesn't match its size.
+
+    Args:
+        path (str): Path to the corpus file.
+        rebuild (bool): Force rebuilding the index.
+
+    Returns:
+        np.ndarray: The line-offset index.
+    """
+    index_path = index_path_for(path)
+    size = os.path.getsize(path)
+
+    if not rebuild and os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(path):
+        offsets = np.load(index_path, mmap_mode="r")
+        if len(offsets) > 0 and offsets[-1] in (size, size + 1):
+            return offsets
+
+    offsets = build_line_index(path)
+    np.save(index_path, offsets)
+    return offsets
+
+
+def read_lines(mapping, offsets, start, stop):
+    """
+    Decode lines [start, stop) straight from a memory-mapped corpus.
+
+    Args:
+        mapping (mmap.mmap): Mapping of the corpus file.
+        offsets (np.ndarray): The line-offset index.
+        start (int): First line to read.
+        stop (int): Line to stop before.
+
+    Returns:
+        list: The decoded lines, without line terminators.
+    """
+    lines = []
+    for i in range(start, stop):
+        begin, end = int(offsets[i]), int(offsets[i + 1]) - 1
+        lines.append(mapping[begin:end].decode("utf-8", errors="replace").rstrip("\r"))
+    return lines
+
+
+class _CorpusWorker:
+    """Per-process state: the analyzer plus mappings of the input and output files."""
+
+    def __init__(self, path, output_path, analyzer_kwargs):
+        from src.sentiment_analysis.analyzer import SentimentAnalyzer
+
+        self.analyzer = SentimentAnalyzer(**analyzer_kwargs)
+        self.offsets = load_line_index(path)
+        self._file = open(path, "rb")
+        size = os.path.getsize(path)
+        self.mapping = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.output = np.load(output_path, mmap_mode="r+")
+
+    def score_range(self, start, stop):
+        comments = read_lines(self.mapping, self.offsets, start, stop)
+        results = self.analyzer.analyze_comments(comments)
+        if len(results):
+            self.output[start:stop] = results[list(OUTPUT_COLUMNS)].to_numpy(dtype=np.float32)
+        return stop - start
+
+
+_worker = None
+
+
+def _init_worker(path, output_path, analyzer_kwargs):
+    global _worker
+    _worker = _CorpusWorker(path, output_path, analyzer_kwargs)
+
+
+def _score_range(bounds):
+    scored = _worker.score_range(*bounds)
+    _worker.output.flush()
+    return scored
+
+
+def score_corpus(path, output_path=None, workers=None, chunk_lines=10000, analyzer_kwargs=None):
+    """
+    Score a newline-delimited comment file without loading it into memory.
+
+    The input is memory-mapped and split by the line index into disjoint
+    line ranges; each worker process decodes its ranges directly from the
+    mapping and writes float32 rows (see OUTPUT_COLUMNS) into a memory-mapped
+    .npy output aligned with the index, so row i holds the scores of line i.
+
+    Args:
+        path (str): Path to the corpus file, one comment per line.
+        output_path (str): Where to write the .npy results. Defaults to
+            `path` + ".scores.npy".
+        workers (int): Number of worker processes. Defaults to the CPU count;
+            1 scores in the current process.
+        chunk_lines (int): Number of lines per task.
+        analyzer_kwargs (dict): Arguments for each worker's SentimentAnalyzer.
+
+    Returns:
+        np.memmap: Read-only mapping of the results, shape (n_lines, 4).
+    """
+    path = str(path)
+    output_path = str(output_path or path + ".scores.npy")
+    analyzer_kwargs = analyzer_kwargs or {}
+    workers = workers or os.cpu_count() or 1
+
+    offsets = load_line_index(path)
+    n_lines = len(offsets) - 1
+
+    if n_lines == 0:
+        # numpy can't memory-map an empty array
+        np.save(output_path, np.zeros((0, len(OUTPUT_COLUMNS)), dtype=np.float32))
+        return np.load(output_path)
+
+    output = np.lib.format.open_memmap(
+        output_path, mode="w+", dtype=np.float32, shape=(n_lines, len(OUTPUT_COLUMNS))
+    )
+    output.flush()
+    del output
+
+    ranges = [(start, min(start + chunk_lines, n_lines)) for start in range(0, n_lines, chunk_lines)]
+
+    if workers == 1 or len(ranges) <= 1:
+        worker = _CorpusWorker(path, output_path, analyzer_kwargs)
+        for start, stop in ranges:
+            worker.score_range(start, stop)
+        worker.output.flush()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(path, output_path, analyzer_kwargs),
+        ) as executor:
+            for _ in executor.map(_score_range, ranges):
+                pass
+
+    return np.load(output_path, mmap_mode="r")
@@ -1,5 +1,15 @@
+import hashlib
+import json
+import logging
+import os
 import re
+import threading
+from types import MappingProxyType
+
 import emoji
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 # Dictionary of common emojis and their sentiment scores
 # Format: emoji: (positive_score, negative_score, neutral_score)
@@ -70,14 +80,214 @@ EMOJI_SENTIMENT = {
     '😌': (0.4, 0, 0.6),
     '😏': (0.3, 0.2, 0.5),
     '😬': (0.2, 0.3, 0.5),
-    '🤷': (0.1, 0.1, 0.8),
-    '🤷‍♀️': (0.1, 0.1, 0.8),
-    '🤷‍♂️': (0.1, 0.1, 0.8),
+    '🤷': (0.1, 0.1, 0.8),  # Also scores 🤷‍♀️ and 🤷‍♂️, whose ZWJ sequences count per emoji
     '😮': (0.3, 0.2, 0.5),
     '😯': (0.3, 0.2, 0.5),
     '🧐': (0.4, 0, 0.6),
 }
 
+# Version of the table built from EMOJI_SENTIMENT
+BUILTIN_TABLE_VERSION = "builtin"
+
+# Emoji presentation selector, as in "❤️" and "☺️"
+VARIATION_SELECTOR = "\ufe0f"
+
+
+class EmojiTable:
+    """
+    Immutable, versioned emoji sentiment table.
+
+    Tables are never modified in place: a new table is loaded and swapped in
+    with `set_emoji_table`, so a batch that holds on to a table scores every
+    comment against the same version.
+
+    Comments are scored per codepoint, so each key must be a single emoji
+    once its variation selectors are stripped ("☺️" scores "☺"). Other keys,
+    such as ZWJ or skin tone sequences, could never match and are dropped.
+    """
+
+    def __init__(self, scores, version=BUILTIN_TABLE_VERSION):
+        """
+        Compile a table.
+
+        Args:
+            scores (dict): Mapping of emoji to (positive, negative, neutral) scores.
+            version (str): Version identifier of the table.
+
+        Raises:
+            ValueError: If a score isn't three numbers between 0 and 1.
+        """
+        compiled = {}
+        aliases = {}
+        dropped = []
+        for emoji_char, values in scores.items():
+            if not isinstance(emoji_char, str) or not emoji_char:
+                raise ValueError(f"Invalid emoji key: {emoji_char!r}")
+            if not isinstance(values, (list, tuple)) or len(values) != 3:
+                raise ValueError(f"Scores of {emoji_char} must be (positive, negative, neutral)")
+            values = tuple(float(v) for v in values)
+            if any(not 0 <= v <= 1 for v in values):
+                raise ValueError(f"Scores of {emoji_char} must be between 0 and 1")
+            key = emoji_char.replace(VARIATION_SELECTOR, "")
+            if len(key) != 1 or key not in emoji.EMOJI_DATA:
+                dropped.append(emoji_char)
+                continue
+            # With and without the selector share one entry, the selector spelling's
+            if key not in compiled or emoji_char != key:
+                compiled[key] = values
+            if emoji_char != key:
+                aliases[emoji_char] = key
+
+        singles = sorted(ord(e) for e in compiled)
+        # Selector spellings stay looked up as they're written
+        compiled.update({alias: compiled[key] for alias, key in aliases.items()})
+
+        self.scores = MappingProxyType(compiled)
+        self.version = str(version)
+        self.dropped = tuple(dropped)
+        # Kept as sorted arrays for vectorized lookups
+        self.codepoints = np.array(singles, dtype=np.uint32)
+        self.codepoint_scores = np.array([compiled[chr(c)] for c in singles], dtype=float).reshape(-1, 3)
+
+    def __contains__(self, emoji_char):
+        return emoji_char in self.scores
+
+    def __len__(self):
+        return len(self.scores)
+
+
+def load_emoji_table(path):
+    """
+    Load an emoji table from a JSON file.
+
+    The file holds {"version": "...", "emojis": {"😍": [0.9, 0, 0.1], ...}}.
+    Without a "version", a hash of the file's content is used. Keys that can
+    never be scored (see `EmojiTable`) are dropped with a warning.
+
+    Args:
+        path (str): Path to the JSON file.
+
+    Returns:
+        EmojiTable: The compiled table.
+
+    Raises:
+        ValueError: If the file isn't a valid emoji table, or none of its
+            keys can be scored.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    try:
+        data = json.loads(content.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid emoji table {path}: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get("emojis"), dict):
+        raise ValueError(f"Invalid emoji table {path}: expected an object with an 'emojis' mapping")
+
+    version = data.get("version") or hashlib.sha256(content).hexdigest()[:12]
+    table = EmojiTable(data["emojis"], version)
+    if table.dropped:
+        if len(table.dropped) == len(data["emojis"]):
+            raise ValueError(f"Invalid emoji table {path}: no key is a single emoji")
+        logger.warning(
+            "Dropped %d emoji table key(s) from %s that aren't single emojis: %s",
+            len(table.dropped), path, ", ".join(table.dropped[:10])
+        )
+    return table
+
+
+_current_table = EmojiTable(EMOJI_SENTIMENT)
+
+
+def get_emoji_table():
+    """Return the emoji table currently in use."""
+    return _current_table
+
+
+def set_emoji_table(table):
+    """
+    Atomically replace the emoji table in use.
+
+    Args:
+        table (EmojiTable): The new table.
+    """
+    global _current_table
+    _current_table = table
+
+
+def reload_emoji_table(path):
+    """
+    Load an emoji table from a file and swap it in.
+
+    Args:
+        path (str): Path to the JSON file.
+
+    Returns:
+        EmojiTable: The new table. On error the current table stays in use.
+    """
+    table = load_emoji_table(path)
+    set_emoji_table(table)
+    return table
+
+
+class EmojiTableWatcher:
+    """Background thread that reloads the emoji table when its file changes."""
+
+    def __init__(self, path, interval=5.0):
+        """
+        Initialize the watcher.
+
+        Args:
+            path (str): Path to the JSON emoji table.
+            interval (float): Seconds between checks of the file.
+        """
+        self.path = path
+        self.interval = interval
+        self.last_error = None
+        self._signature = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _file_signature(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self):
+        """
+        Reload the table if the file changed since the last check.
+
+        Returns:
+            bool: True if a new table was swapped in.
+        """
+        try:
+            signature = self._file_signature()
+            if signature == self._signature:
+                return False
+            self._signature = signature
+            reload_emoji_table(self.path)
+            self.last_error = None
+            return True
+        except (OSError, ValueError) as e:
+            # Keep serving the current table until the file is fixed
+            self.last_error = str(e)
+            logger.warning("Could not reload emoji table from %s: %s", self.path, e)
+            return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        """Load the table once and start watching the file."""
+        self.check()
+        self._thread = threading.Thread(target=self._run, name="emoji-table-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching the file."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
 def extract_emojis(text):
     """
     Extract all emojis from text.
@@ -93,12 +303,116 @@ def extract_emojis(text):
     
     return [c for c in text if c in emoji.EMOJI_DATA]
 
-def get_emoji_sentiment_scores(text):
+# Sorted codepoints of the single-codepoint emojis `extract_emojis` finds
+_EMOJI_CODEPOINTS = np.array(sorted(ord(e) for e in emoji.EMOJI_DATA if len(e) == 1), dtype=np.uint32)
+
+
+def encode_codepoints(texts):
+    """
+    Encode a batch of texts into one codepoint array.
+    
+    Args:
+        texts (list): The texts. Non-string entries are treated as empty.
+        
+    Returns:
+        tuple: (codepoints, ends) where codepoints is a uint32 array of every
+            text's codepoints back to back (UTF-32) and ends[i] is the offset
+            just past text i.
+    """
+    texts = [text if isinstance(text, str) else "" for text in texts]
+    ends = np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)))
+    # surrogatepass keeps one unit per character even for lone surrogates
+    encoded = "".join(texts).encode("utf-32-le", "surrogatepass")
+    return np.frombuffer(encoded, dtype=np.uint32), ends
+
+
+def _find_codepoints(codepoints, sorted_set):
+    """Return the positions of codepoints that are in `sorted_set` and their indices in it."""
+    if len(sorted_set) == 0 or len(codepoints) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    # Range mask first: most characters are below the first emoji
+    candidates = np.flatnonzero((codepoints >= sorted_set[0]) & (codepoints <= sorted_set[-1]))
+    indices = np.searchsorted(sorted_set, codepoints[candidates])
+    found = sorted_set[indices] == codepoints[candidates]
+    return candidates[found], indices[found]
+
+
+def extract_emojis_batch(texts):
+    """
+    Vectorized `extract_emojis` over a batch of texts.
+    
+    Args:
+        texts (list): The texts to extract emojis from.
+        
+    Returns:
+        list: One list of emojis per text, equal to `extract_emojis(text)`.
+    """
+    codepoints, ends = encode_codepoints(texts)
+    positions, _ = _find_codepoints(codepoints, _EMOJI_CODEPOINTS)
+    owners = np.searchsorted(ends, positions, side="right")
+    
+    emojis = [[] for _ in range(len(ends))]
+    for owner, codepoint in zip(owners.tolist(), codepoints[positions].tolist()):
+        emojis[owner].append(chr(codepoint))
+    return emojis
+
+
+def get_emoji_sentiment_scores_batch(texts, table=None):
+    """
+    Vectorized `get_emoji_sentiment_scores` over a batch of texts.
+    
+    The batch is encoded into one codepoint array; table emojis are found
+    with a range mask and a sorted lookup, and each text's score sums are
+    segment reductions (`np.add.reduceat`) over its matches, so no Python
+    code runs per character. Like the scalar path, sequences are scored per
+    codepoint: variation selectors and ZWJs are skipped, and each emoji of a
+    ZWJ sequence or skin tone pair counts on its own.
+    
+    Args:
+        texts (list): The texts to score. Non-string entries score as empty.
+        table (EmojiTable): The emoji table to score with. Defaults to the
+            table currently in use.
+        
+    Returns:
+        dict: Arrays with one value per text: "pos", "neg", "neu" and
+            "compound" as `get_emoji_sentiment_scores` computes them, and
+            "count", the number of table emojis in the text.
+    """
+    # An empty table is falsy, so compare with None
+    table = _current_table if table is None else table
+    codepoints, ends = encode_codepoints(texts)
+    n = len(ends)
+    positions, rows = _find_codepoints(codepoints, table.codepoints)
+    
+    # Matches are in text order, so each text's matches form one segment
+    owners = np.searchsorted(ends, positions, side="right")
+    counts = np.bincount(owners, minlength=n)
+    present = counts > 0
+    sums = np.zeros((n, 3))
+    if len(positions):
+        starts = np.cumsum(counts) - counts
+        sums[present] = np.add.reduceat(table.codepoint_scores[rows], starts[present], axis=0)
+    
+    divisor = np.maximum(counts, 1)
+    pos = sums[:, 0] / divisor
+    neg = sums[:, 1] / divisor
+    neu = np.where(present, sums[:, 2] / divisor, 1.0)
+    
+    compound = pos - neg
+    compound = np.where((pos > 0.6) & (compound > 0), np.maximum(compound, 0.05), compound)
+    compound = np.where((neg > 0.6) & (compound < 0), np.minimum(compound, -0.05), compound)
+    
+    return {"pos": pos, "neg": neg, "neu": neu, "compound": compound, "count": counts}
+
+
+def get_emoji_sentiment_scores(text, table=None):
     """
     Calculate sentiment scores based on emojis in the text.
     
     Args:
         text (str): The text containing emojis.
+        table (EmojiTable): The emoji table to score with. Defaults to the
+            table currently in use.
         
     Returns:
         dict: A dictionary with positive, negative, and neutral scores.
@@ -111,6 +425,8 @@ def get_emoji_sentiment_scores(text):
     if not emojis:
         return {"pos": 0, "neg": 0, "neu": 1.0, "compound": 0}
     
+    scores = (_current_table if table is None else table).scores
+    
     pos_score = 0
     neg_score = 0
     neu_score = 0
@@ -118,12 +434,9 @@ def get_emoji_sentiment_scores(text):
     
     for emoji_char in emojis:
         emoji_char_clean = emoji_char.strip()
-        # Handle heart emojis that might be represented differently
-        if emoji_char_clean == "❤" or emoji_char_clean == "❤️":
-            emoji_char_clean = "❤️"  # Use the variant with variation selector
-            
-        if emoji_char_clean in EMOJI_SENTIMENT:
-            pos, neg, neu = EMOJI_SENTIMENT[emoji_char_clean]
+        # Heart variants share one entry in compiled tables
+        if emoji_char_clean in scores:
+            pos, neg, neu = scores[emoji_char_clean]
             pos_score += pos
             neg_score += neg
             neu_score += neu
@@ -0,0 +1,180 @@
+import heapq
+
+import numpy as np
+
+from src.sentiment_analysis.emoji_utils import get_emoji_table
+
+
+class SentimentInsights:
+    """
+    Running top-K extremes and emoji statistics over scored comments.
+
+    Keeps bounded min-heaps of the most positive and most negative comments
+    and a per-emoji counter, so they can be reported for any number of
+    comments without keeping the individual results around.
+    """
+
+    def __init__(self, top_k=10, emoji_weight=0.3):
+        """
+        Initialize the insights.
+
+        Args:
+            top_k (int): Number of most positive/negative comments to keep.
+            emoji_weight (float): Weight the analyzer gives emoji scores, used
+                to attribute each comment's emoji component to its emojis.
+        """
+        self.top_k = top_k
+        self.emoji_weight = emoji_weight
+        # Min-heaps of (score, -position, comment, compound); the input position
+        # breaks ties so the earliest comment wins and comments are never compared.
+        self._positive = []
+        self._negative = []
+        self._sequence = 0
+        # emoji -> [occurrences, comments, contribution, compound sum of comments]
+        self._emojis = {}
+
+    def _push(self, heap, score, position, comment, compound):
+        entry = (score, -position, comment, compound)
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def update(self, comments, compounds, emojis, emoji_components=None, table=None):
+        """
+        Add a batch of scored comments.
+
+        Args:
+            comments (list): The comment texts.
+            compounds (list): Their compound scores.
+            emojis (list): The list of emojis found in each comment.
+            emoji_components (list): The part of each compound score that comes
+                from the comment's emojis, as computed by the analyzer. Without
+                it, emojis are assumed to count with emoji_weight, which
+                under-counts emoji-only comments.
+            table (EmojiTable): The emoji table the comments were scored with.
+                Defaults to the table currently in use.
+        """
+        compounds = np.asarray(compounds, dtype=float)
+
+        if self.top_k > 0 and len(compounds):
+            # Only the batch's own top-K can make it into the heaps. Ties at the
+            # K-th score go to the earliest comments, so the selection doesn't
+            # depend on how the sort happens to order equal scores.
+            k = min(self.top_k, len(compounds))
+            positions = np.arange(len(compounds))
+            for heap, scores in ((self._positive, compounds), (self._negative, -compounds)):
+                for i in np.lexsort((positions, -scores))[:k]:
+                    self._push(heap, float(scores[i]), self._sequence + int(i), comments[i], float(compounds[i]))
+        self._sequence += len(compounds)
+
+        scores = (get_emoji_table() if table is None else table).scores
+        for i, (comment_emojis, compound) in enumerate(zip(emojis, compounds)):
+            if not comment_emojis:
+                continue
+            # Each known emoji gets a share of the comment's emoji component
+            # proportional to its own (positive - negative) score
+            raw = [scores[e.strip()][0] - scores[e.strip()][1] if e.strip() in scores else 0.0 for e in comment_emojis]
+            n_known = sum(1 for e in comment_emojis if e.strip() in scores)
+            if emoji_components is None:
+                scale = self.emoji_weight / n_known if n_known else 0.0
+            else:
+                total = sum(raw)
+                scale = emoji_components[i] / total if total else 0.0
+            for emoji_char, share in zip(comment_emojis, raw):
+                stats = self._emojis.setdefault(emoji_char, [0, 0, 0.0, 0.0])
+                stats[0] += 1
+                stats[2] += scale * share
+            for emoji_char in set(comment_emojis):
+                stats = self._emojis[emoji_char]
+                stats[1] += 1
+                stats[3] += float(compound)
+
+    def state(self):
+        """
+        Get the running state as JSON-serializable data, e.g. to persist it between upload chunks.
+
+        Returns:
+            dict: The state, to be restored with from_state().
+        """
+        return {
+            "top_k": self.top_k,
+            "emoji_weight": self.emoji_weight,
+            "positive": self._positive,
+            "negative": self._negative,
+            "sequence": self._sequence,
+            "emojis": self._emojis
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Restore insights saved with state().
+
+        Args:
+            state (dict): The saved state.
+
+        Returns:
+            SentimentInsights: Insights that continue where the saved ones stopped.
+        """
+        insights = cls(state["top_k"], state["emoji_weight"])
+        # JSON turns the heap entries into lists; they must be tuples to compare
+        insights._positive = [tuple(entry) for entry in state["positive"]]
+        insights._negative = [tuple(entry) for entry in state["negative"]]
+        insights._sequence = state["sequence"]
+        insights._emojis = {emoji_char: list(stats) for emoji_char, stats in state["emojis"].items()}
+        return insights
+
+    def _extremes(self, heap):
+        ranked = sorted(heap, reverse=True)
+        return [{"comment": comment, "compound": compound} for _, _, comment, compound in ranked]
+
+    def most_positive(self):
+        """Return the most positive comments, highest compound score first."""
+        return self._extremes(self._positive)
+
+    def most_negative(self):
+        """Return the most negative comments, lowest compound score first."""
+        return self._extremes(self._negative)
+
+    def emoji_stats(self, limit=None):
+        """
+        Get per-emoji statistics, ordered by number of occurrences.
+
+        Args:
+            limit (int): Maximum number of emojis to return. None returns all.
+
+        Returns:
+            list: Dicts with the emoji, its occurrences, the number of comments
+                containing it, its summed contribution to those comments'
+                compound scores and their average compound score.
+        """
+        ranked = sorted(self._emojis.items(), key=lambda item: (-item[1][0], -abs(item[1][2]), item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [
+            {
+                "emoji": emoji_char,
+                "count": occurrences,
+                "comments": n_comments,
+                "contribution": contribution,
+                "average_compound": compound_sum / n_comments
+            }
+            for emoji_char, (occurrences, n_comments, contribution, compound_sum) in ranked
+        ]
+
+    def to_dict(self, emoji_limit=None):
+        """
+        Get all insights.
+
+        Args:
+            emoji_limit (int): Maximum number of emojis to include. None includes all.
+
+        Returns:
+            dict: The most positive and most negative comments and the emoji statistics.
+        """
+        return {
+            "most_positive": self.most_positive(),
+            "most_negative": self.most_negative(),
+            "emojis": self.emoji_stats(emoji_limit)
+        }
@@ -0,0 +1,54 @@
+import re
+
+import emoji
+
+# VADER caps the emphasis it adds for "!" at 4 and treats any run of more than
+# 3 "?" the same, so runs longer than 4 carry no extra signal
+MAX_PUNCTUATION_RUN = 4
+
+# Repeated identical emojis are kept up to this length as an intensity signal
+MAX_EMOJI_RUN = 3
+
+_URL_RE = re.compile(r"https?://\S+|www\.\S+", re.IGNORECASE)
+_MENTION_RE = re.compile(r"(?<!\w)@[\w.]+")
+# A letter repeated 3 or more times ("sooooo", "gooood")
+_LETTER_RUN_RE = re.compile(r"([^\W\d_])\1{2,}")
+# Any other non-space unit (optionally followed by an emoji variation selector) repeated
+_SYMBOL_RUN_RE = re.compile(r"([^\w\s]\ufe0f?)\1+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _collapse_symbol_run(match):
+    unit = match.group(1)
+    run_length = len(match.group(0)) // len(unit)
+    if unit[0] in emoji.EMOJI_DATA:
+        return unit * min(run_length, MAX_EMOJI_RUN)
+    if unit in ("!", "?"):
+        return unit * min(run_length, MAX_PUNCTUATION_RUN)
+    return match.group(0)
+
+
+def normalize_comment(comment):
+    """
+    Canonicalize Instagram-specific noise in a comment.
+
+    URLs and @mentions are removed, letters repeated three or more times are
+    collapsed to two ("sooooo" -> "soo", "gooood" -> "good"), runs of "!" and
+    "?" are capped at the length VADER stops counting, runs of the same emoji
+    are capped at three, and whitespace is collapsed. Case is preserved
+    because VADER uses ALL CAPS words as an intensity signal.
+
+    Args:
+        comment (str): The comment to normalize.
+
+    Returns:
+        str: The canonical form of the comment.
+    """
+    if not comment:
+        return ""
+
+    text = _URL_RE.sub(" ", comment)
+    text = _MENTION_RE.sub(" ", text)
+    text = _LETTER_RUN_RE.sub(r"\1\1", text)
+    text = _SYMBOL_RUN_RE.sub(_collapse_symbol_run, text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
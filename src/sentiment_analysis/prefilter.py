@@ -0,0 +1,129 @@
+import re
+import string
+
+import emoji
+
+# Routes a comment can take through the analyzer, from cheapest to most expensive
+ROUTE_EMPTY = "empty"                    # Empty, whitespace-only or non-string input
+ROUTE_EMOJI_ONLY = "emoji_only"          # Only emojis: scored from the emoji table
+ROUTE_NOISE_ONLY = "noise_only"          # Only @mentions, #hashtags, URLs and punctuation
+ROUTE_NON_LATIN = "non_latin"            # No Latin-script letters (e.g. Cyrillic, Arabic, CJK)
+ROUTE_NO_LEXICON_MATCH = "no_lexicon_match"  # Latin text with no VADER lexicon words (e.g. Portuguese, Spanish)
+ROUTE_MODEL = "model"                    # Full scoring by the model backend
+
+ROUTES = (
+    ROUTE_EMPTY,
+    ROUTE_EMOJI_ONLY,
+    ROUTE_NOISE_ONLY,
+    ROUTE_NON_LATIN,
+    ROUTE_NO_LEXICON_MATCH,
+    ROUTE_MODEL,
+)
+
+# Characters that glue emoji sequences together without being emojis themselves
+# (variation selectors and the zero-width joiner used in ZWJ sequences)
+EMOJI_JOINERS = {"\ufe0e", "\ufe0f", "\u200d"}
+
+_NOISE_RE = re.compile(r"https?://\S+|www\.\S+|[@#][\w.]+")
+_PUNCTUATION = set(string.punctuation)
+
+
+def is_emoji_only(comment):
+    """
+    Check whether a comment consists only of emojis (and whitespace).
+
+    Args:
+        comment (str): The comment to check.
+
+    Returns:
+        bool: True if the comment contains at least one emoji and nothing else.
+    """
+    found = False
+    for char in comment:
+        if char in emoji.EMOJI_DATA:
+            found = True
+        elif not (char.isspace() or char in EMOJI_JOINERS):
+            return False
+    return found
+
+
+def has_lexicon_match(comment, lexicon):
+    """
+    Check whether any token of a comment could match a VADER lexicon entry.
+
+    Mirrors VADER's tokenization (whitespace split, tokens longer than one
+    character, optional surrounding punctuation), erring on the side of
+    reporting a match, so a False result guarantees VADER would score the
+    comment as neutral.
+
+    Args:
+        comment (str): The comment to check.
+        lexicon (dict): The VADER lexicon.
+
+    Returns:
+        bool: True if VADER could assign a non-zero valence to the comment.
+    """
+    for token in comment.split():
+        if len(token) <= 1:
+            continue
+        token = token.lower()
+        if token in lexicon or token.strip(string.punctuation) in lexicon:
+            return True
+    return False
+
+
+def neutral_vader_scores(comment):
+    """
+    Return the scores VADER produces for a comment without lexicon matches.
+
+    Args:
+        comment (str): The comment (known to have no lexicon matches).
+
+    Returns:
+        dict: VADER-style scores with zero polarity.
+    """
+    # VADER reports neu=1.0 when it saw at least one token, and all zeros otherwise
+    has_tokens = any(len(token) > 1 for token in comment.split())
+    return {"neg": 0.0, "neu": 1.0 if has_tokens else 0.0, "pos": 0.0, "compound": 0.0}
+
+
+def _is_latin_letter(char):
+    # Basic Latin, Latin-1 Supplement and Latin Extended-A/B
+    return char < "\u0250" and char.isalpha()
+
+
+def classify_comment(comment, lexicon):
+    """
+    Pick the cheapest adequate scoring route for a comment.
+
+    Only comments routed to ROUTE_MODEL need a full model pass; every other
+    route is guaranteed to get a neutral VADER score, so the analyzer can skip
+    it and rely on emoji scores alone.
+
+    Args:
+        comment (str): The comment to classify.
+        lexicon (dict): The VADER lexicon, used to detect scorable words. Pass
+            None for backends without a lexicon; only empty and emoji-only
+            comments are then routed away from the model.
+
+    Returns:
+        str: One of the ROUTE_* constants.
+    """
+    if not comment or not isinstance(comment, str) or comment.isspace():
+        return ROUTE_EMPTY
+
+    if is_emoji_only(comment):
+        return ROUTE_EMOJI_ONLY
+
+    if lexicon is None or has_lexicon_match(comment, lexicon):
+        return ROUTE_MODEL
+
+    remainder = _NOISE_RE.sub(" ", comment)
+    if all(char.isspace() or char in _PUNCTUATION or char in emoji.EMOJI_DATA or char in EMOJI_JOINERS
+           for char in remainder):
+        return ROUTE_NOISE_ONLY
+
+    if not any(_is_latin_letter(char) for char in remainder):
+        return ROUTE_NON_LATIN
+
+    return ROUTE_NO_LEXICON_MATCH
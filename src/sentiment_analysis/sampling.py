@@ -0,0 +1,135 @@
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+
+def z_score(confidence):
+    """
+    Two-sided normal critical value for a confidence level.
+
+    Args:
+        confidence (float): Confidence level between 0 and 1, e.g. 0.95.
+
+    Returns:
+        float: The critical value, e.g. 1.96 for 0.95.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def finite_population_correction(sampled, population):
+    """
+    Variance correction for sampling without replacement.
+
+    Args:
+        sampled (int): Sample size.
+        population (int): Population size.
+
+    Returns:
+        float: Factor to multiply the sampling variance by; 0 once the whole
+            population has been sampled.
+    """
+    if population <= 1 or sampled >= population:
+        return 0.0
+    return (population - sampled) / (population - 1)
+
+
+def proportion_margin(proportion, sampled, population, z):
+    """
+    Half-width of the confidence interval of a sampled proportion.
+
+    Args:
+        proportion (float): Observed proportion in the sample (0-1).
+        sampled (int): Sample size.
+        population (int): Population size.
+        z (float): Critical value from `z_score`.
+
+    Returns:
+        float: The margin of error, in the same units as the proportion.
+    """
+    if sampled == 0:
+        return 1.0
+    variance = proportion * (1 - proportion) / sampled
+    return z * math.sqrt(variance * finite_population_correction(sampled, population))
+
+
+def mean_margin(total, total_squares, sampled, population, z):
+    """
+    Half-width of the confidence interval of a sampled mean.
+
+    Args:
+        total (float): Sum of the sampled values.
+        total_squares (float): Sum of the squared sampled values.
+        sampled (int): Sample size.
+        population (int): Population size.
+        z (float): Critical value from `z_score`.
+
+    Returns:
+        float: The margin of error of the mean.
+    """
+    if sampled < 2:
+        return float("inf") if sampled < population else 0.0
+    mean = total / sampled
+    variance = max(total_squares - sampled * mean * mean, 0.0) / (sampled - 1)
+    return z * math.sqrt(variance / sampled * finite_population_correction(sampled, population))
+
+
+def required_sample_size(tolerance, confidence):
+    """
+    Sample size that bounds the margin of any proportion by a tolerance.
+
+    Uses the worst case of a proportion of 0.5 and ignores the finite
+    population correction, so the bound holds for every population size.
+
+    Args:
+        tolerance (float): Target margin of error, in percentage points.
+        confidence (float): Confidence level between 0 and 1.
+
+    Returns:
+        int: The sample size, or None when the tolerance is 0 and every
+            item has to be sampled.
+    """
+    if tolerance <= 0:
+        return None
+    return math.ceil((z_score(confidence) * 0.5 / (tolerance / 100)) ** 2)
+
+
+def reservoir_sample(chunks, size, rng):
+    """
+    Draw a simple random sample from chunks of items in a single pass.
+
+    Implements reservoir sampling (Algorithm R) with the random draws of each
+    chunk vectorized, so at most `size` items are held in memory however many
+    are read.
+
+    Args:
+        chunks (iterable): Sequences of items, e.g. the comments of each chunk
+            of a CSV file.
+        size (int): Sample size. None keeps every item.
+        rng (numpy.random.Generator): Source of the random draws.
+
+    Returns:
+        tuple: The sampled items (in no particular order) and the number of
+            items read.
+    """
+    sample = []
+    seen = 0
+    for chunk in chunks:
+        chunk = list(chunk)
+        if size is None:
+            sample.extend(chunk)
+            seen += len(chunk)
+            continue
+        fill = min(max(size - seen, 0), len(chunk))
+        sample.extend(chunk[:fill])
+        seen += fill
+        rest = chunk[fill:]
+        if rest:
+            # Item t (0-based) replaces a random slot with probability size / (t + 1)
+            slots = rng.integers(0, np.arange(seen + 1, seen + len(rest) + 1))
+            for index in np.flatnonzero(slots < size):
+                sample[slots[index]] = rest[index]
+            seen += len(rest)
+    return sample, seen
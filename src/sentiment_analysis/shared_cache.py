@@ -0,0 +1,396 @@
+import hashlib
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from src.sentiment_analysis.emoji_utils import extract_emojis
+
+try:
+    import fcntl
+except ImportError:  # Cross-process write locks need POSIX record locks
+    fcntl = None
+
+MAGIC = 0x53454E5443414348  # "SENTCACH"
+LAYOUT_VERSION = 1
+
+# Slots per bucket; a key can only live in the bucket its hash points to
+WAYS = 8
+# Stripes of the cross-process write lock; buckets map to stripes by index
+LOCK_STRIPES = 64
+# Stats rows, one per attached worker process
+STAT_ROWS = 64
+STAT_FIELDS = ("pid", "hits", "misses", "stale", "inserts", "evictions")
+# Attempts at a consistent read of a slot that is being written concurrently
+READ_RETRIES = 4
+
+HEADER_BYTES = 64
+STAT_ROW_BYTES = 8 * 8
+STATS_BYTES = STAT_ROWS * STAT_ROW_BYTES
+SLOT_BYTES = 64
+STAMP_OFFSET = 16
+TABLE_OFFSET = HEADER_BYTES + STATS_BYTES
+
+# One 64-byte slot per result. seq is odd while the slot is being written;
+# key is 0 for empty slots; stamp is the last access time used for eviction.
+SLOT_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("key", "<u8"),
+    ("stamp", "<u8"),
+    ("version", "<u4"),
+    ("flags", "<u4"),
+    ("scores", "<f8", (4,)),
+])
+# The same slot layout for reading and writing single slots without numpy's
+# per-call overhead, and the keys and stamps of a whole bucket in one call
+_SLOT = struct.Struct("<QQQIIdddd")
+_BUCKET_KEYS = struct.Struct("<" + "8xQ48x" * WAYS)
+_BUCKET_STAMPS = struct.Struct("<" + "16xQ40x" * WAYS)
+_U64 = struct.Struct("<Q")
+
+SENTIMENTS = ("neutral", "positive", "negative")
+HAS_EMOJIS = 1 << 2
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,200}$")
+
+
+def _key_hash(key):
+    """Hash a canonical comment text to a non-zero 64-bit key."""
+    digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+@lru_cache(maxsize=64)
+def _version_hash(namespace, version):
+    """Hash a cache namespace and emoji table version to 32 bits."""
+    digest = hashlib.blake2b(f"{namespace}\0{version}".encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedResultCache:
+    """
+    Per-comment result cache in POSIX shared memory, shared by all worker
+    processes on a host.
+
+    A drop-in replacement for ResultCache: every process that opens the
+    cache under the same name attaches to one fixed-size, set-associative
+    hash table of comment-text hash -> packed scores, so a comment scored by
+    one worker is a hit in all others and the results are stored once per
+    host instead of once per worker.
+
+    Reads are lock-free: each slot carries a sequence number that writers
+    make odd while they update the slot, and a reader retries (or reports a
+    miss) when the number changed under it. Writers lock one of
+    LOCK_STRIPES byte ranges of a lock file, picked by bucket. When a bucket
+    is full, its least recently accessed entry is evicted.
+
+    Results are stored as their four scores, the sentiment and whether the
+    comment has emojis, which are re-extracted on a hit. Entries are tagged
+    with a hash of the cache's namespace (the analyzer configuration) and the
+    emoji table version, and an entry looked up under a different tag counts
+    as stale and is overwritten by the next put. Workers with different
+    configurations can thus share a segment without serving each other's
+    results.
+
+    The segment outlives the processes using it, so restarted workers keep
+    the cache; call unlink() to remove it.
+    """
+
+    def __init__(self, name, capacity=262144, lock_dir=None, namespace=""):
+        """
+        Create the shared cache, or attach to it if another process already did.
+
+        Args:
+            name (str): Name of the shared memory segment (letters, digits, "_", "." and "-").
+            capacity (int): Number of entries, rounded up to a multiple of WAYS.
+                Ignored when attaching; the capacity of an existing segment wins.
+            lock_dir (str): Directory of the write lock file. Defaults to the
+                system temp directory; every process must use the same one.
+            namespace (str): Identifies everything besides the emoji table that
+                determines results, such as the model and emoji weight.
+
+        Raises:
+            ValueError: If the name or capacity is invalid, or an existing
+                segment with this name isn't a result cache.
+            RuntimeError: If the platform has no POSIX record locks.
+        """
+        if fcntl is None:
+            raise RuntimeError("The shared result cache requires POSIX record locks (fcntl)")
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid shared cache name: {name!r}")
+        if capacity <= 0:
+            raise ValueError("Shared cache capacity must be positive")
+
+        self.name = name
+        self.namespace = namespace
+        self._shm = self._open(name, -(-capacity // WAYS))
+        buffer = self._shm.buf
+        self._header = np.ndarray((8,), dtype="<u8", buffer=buffer)
+        self.buckets = int(self._header[2])
+        self.maxsize = self.buckets * WAYS
+        self._stats = np.ndarray((STAT_ROWS, 8), dtype="<u8", buffer=buffer, offset=HEADER_BYTES)
+        self._table = np.ndarray((self.maxsize,), dtype=SLOT_DTYPE, buffer=buffer, offset=TABLE_OFFSET)
+        self._keys = self._table["key"]
+        self._seqs = self._table["seq"]
+        self._stamps = self._table["stamp"]
+        self._buf = buffer
+
+        lock_dir = lock_dir or tempfile.gettempdir()
+        self._lock_fd = os.open(os.path.join(lock_dir, f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        # fcntl locks are held per process, so threads also take this lock
+        self._lock = threading.Lock()
+        self._row = None
+        self._row_pid = None
+
+    @staticmethod
+    def _segment(name, create, size=0):
+        if sys.version_info >= (3, 13):
+            return SharedMemory(name, create=create, size=size, track=False)
+        shm = SharedMemory(name, create=create, size=size)
+        # Don't let the resource tracker unlink the segment when this process
+        # exits; other workers are still using it
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+    @classmethod
+    def _open(cls, name, buckets):
+        """Create and initialize the segment, or attach to an existing one once it's initialized."""
+        size = TABLE_OFFSET + buckets * WAYS * SLOT_DTYPE.itemsize
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                shm = cls._segment(name, create=True, size=size)
+            except FileExistsError:
+                pass
+            else:
+                header = np.ndarray((8,), dtype="<u8", buffer=shm.buf)
+                header[1:5] = (LAYOUT_VERSION, buckets, WAYS, STAT_ROWS)
+                # Attaching processes wait for the magic number, so write it last
+                header[0] = MAGIC
+                del header
+                return shm
+
+            try:
+                shm = cls._segment(name, create=False)
+            except (FileNotFoundError, ValueError):
+                # Unlinked meanwhile, or created but not sized yet
+                shm = None
+            if shm is not None and shm.size >= HEADER_BYTES:
+                header = np.ndarray((8,), dtype="<u8", buffer=shm.buf)
+                magic, layout, existing, ways = (int(value) for value in header[:4])
+                del header
+                if magic == MAGIC:
+                    if layout != LAYOUT_VERSION or ways != WAYS or shm.size < TABLE_OFFSET + existing * WAYS * SLOT_DTYPE.itemsize:
+                        shm.close()
+                        raise ValueError(f"Shared memory segment {name!r} has an incompatible layout")
+                    return shm
+            if shm is not None:
+                shm.close()
+            if time.monotonic() > deadline:
+                raise ValueError(f"Shared memory segment {name!r} is not a result cache")
+            time.sleep(0.01)
+
+    def _lock_range(self, operation, bucket=None):
+        """Lock or unlock the stripe of a bucket, or the whole lock file if bucket is None."""
+        if bucket is None:
+            fcntl.lockf(self._lock_fd, operation, 0, 0)
+        else:
+            fcntl.lockf(self._lock_fd, operation, 1, bucket % LOCK_STRIPES)
+
+    def _stat_row(self):
+        """Get the offset of this process's stats row, claiming a row on first use (and again after a fork)."""
+        pid = os.getpid()
+        if self._row_pid == pid:
+            return self._row
+        with self._lock:
+            self._lock_range(fcntl.LOCK_EX)
+            try:
+                pids = self._stats[:, 0]
+                rows = np.flatnonzero(pids == pid)
+                if len(rows) == 0:
+                    rows = [i for i in range(STAT_ROWS) if pids[i] == 0 or not _pid_alive(int(pids[i]))]
+                # A row of an exited worker is reused but keeps its counts;
+                # with more workers than rows, the last row is shared
+                row = int(rows[0]) if len(rows) else STAT_ROWS - 1
+                pids[row] = pid
+            finally:
+                self._lock_range(fcntl.LOCK_UN)
+            self._row = HEADER_BYTES + row * STAT_ROW_BYTES
+            self._row_pid = pid
+        return self._row
+
+    def _count(self, field, row=None):
+        """Increment a counter in this process's stats row."""
+        offset = (self._stat_row() if row is None else row) + 8 * STAT_FIELDS.index(field)
+        with self._lock:
+            _U64.pack_into(self._buf, offset, _U64.unpack_from(self._buf, offset)[0] + 1)
+
+    def get(self, key, version=None):
+        """
+        Look up a cached result.
+
+        Args:
+            key (str): The canonical comment text.
+            version (str): Version of the emoji table in use.
+
+        Returns:
+            dict: The cached result, or None on a miss.
+        """
+        key_hash = _key_hash(key)
+        bucket_offset = TABLE_OFFSET + (key_hash % self.buckets) * WAYS * SLOT_BYTES
+        for _ in range(READ_RETRIES):
+            keys = _BUCKET_KEYS.unpack_from(self._buf, bucket_offset)
+            if key_hash not in keys:
+                break
+            offset = bucket_offset + keys.index(key_hash) * SLOT_BYTES
+            seq = _U64.unpack_from(self._buf, offset)[0]
+            if seq & 1:
+                continue
+            slot = _SLOT.unpack_from(self._buf, offset)
+            if _U64.unpack_from(self._buf, offset)[0] != seq or slot[1] != key_hash:
+                # Overwritten while we read it
+                continue
+            if slot[3] != _version_hash(self.namespace, version):
+                self._count("stale")
+                break
+            _U64.pack_into(self._buf, offset + STAMP_OFFSET, time.monotonic_ns())
+            self._count("hits")
+            return self._unpack(key, slot)
+        self._count("misses")
+        return None
+
+    def put(self, key, result, version=None):
+        """
+        Store a result, evicting the least recently accessed entry of its bucket if full.
+
+        Args:
+            key (str): The canonical comment text.
+            result (dict): The result to cache.
+            version (str): Version of the emoji table the result was scored with.
+        """
+        key_hash = _key_hash(key)
+        bucket = key_hash % self.buckets
+        bucket_offset = TABLE_OFFSET + bucket * WAYS * SLOT_BYTES
+        flags = SENTIMENTS.index(result["sentiment"]) | (HAS_EMOJIS if result["emojis"] else 0)
+        tag = _version_hash(self.namespace, version)
+        row = self._stat_row()
+
+        evicted = False
+        with self._lock:
+            self._lock_range(fcntl.LOCK_EX, bucket)
+            try:
+                keys = _BUCKET_KEYS.unpack_from(self._buf, bucket_offset)
+                if key_hash in keys:
+                    way = keys.index(key_hash)
+                elif 0 in keys:
+                    way = keys.index(0)
+                else:
+                    stamps = _BUCKET_STAMPS.unpack_from(self._buf, bucket_offset)
+                    way = stamps.index(min(stamps))
+                    evicted = True
+                offset = bucket_offset + way * SLOT_BYTES
+
+                seq = _U64.unpack_from(self._buf, offset)[0] | 1
+                _U64.pack_into(self._buf, offset, seq)
+                _SLOT.pack_into(
+                    self._buf, offset, seq, key_hash, time.monotonic_ns(), tag, flags,
+                    result["compound"], result["positive"], result["negative"], result["neutral"]
+                )
+                _U64.pack_into(self._buf, offset, seq + 1)
+            finally:
+                self._lock_range(fcntl.LOCK_UN, bucket)
+        self._count("inserts", row)
+        if evicted:
+            self._count("evictions", row)
+
+    @staticmethod
+    def _unpack(key, slot):
+        flags = slot[4]
+        return {
+            "compound": slot[5],
+            "positive": slot[6],
+            "negative": slot[7],
+            "neutral": slot[8],
+            "sentiment": SENTIMENTS[flags & 3],
+            "emojis": extract_emojis(key) if flags & HAS_EMOJIS else []
+        }
+
+    def clear(self):
+        """Remove all entries and reset the statistics of every process."""
+        with self._lock:
+            self._lock_range(fcntl.LOCK_EX)
+            try:
+                # Make every slot's sequence number odd while it's emptied, so
+                # concurrent readers discard what they read
+                seqs = self._seqs | 1
+                self._seqs[:] = seqs
+                self._keys[:] = 0
+                self._stamps[:] = 0
+                self._seqs[:] = seqs + 1
+                self._stats[:, 1:] = 0
+            finally:
+                self._lock_range(fcntl.LOCK_UN)
+
+    def __len__(self):
+        return int(np.count_nonzero(self._keys))
+
+    def stats(self):
+        """
+        Get cache statistics of all processes attached to the cache.
+
+        Returns:
+            dict: Dictionary with size, capacity, hits, misses, stale
+                (invalidated) entries, evictions, the number of processes
+                that used the cache and hit rate.
+        """
+        totals = dict(zip(STAT_FIELDS[1:], (int(total) for total in self._stats[:, 1:len(STAT_FIELDS)].sum(axis=0))))
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "size": len(self),
+            "capacity": self.maxsize,
+            "hits": totals["hits"],
+            "misses": totals["misses"],
+            "stale": totals["stale"],
+            "evictions": totals["evictions"],
+            "workers": int(np.count_nonzero(self._stats[:, 0])),
+            "hit_rate": totals["hits"] / lookups if lookups > 0 else 0
+        }
+
+    def close(self):
+        """Detach this process from the segment; the cache stays available to others."""
+        if self._shm is None:
+            return
+        # The segment can only be unmapped once no array views it
+        self._header = self._stats = self._table = None
+        self._keys = self._seqs = self._stamps = self._buf = self._row = None
+        self._row_pid = None
+        self._shm.close()
+        self._shm = None
+        os.close(self._lock_fd)
+
+    def unlink(self):
+        """Remove the segment from the system; attached processes keep their mapping until they close it."""
+        try:
+            shm = SharedMemory(self.name)
+        except FileNotFoundError:
+            return
+        shm.close()
+        shm.unlink()
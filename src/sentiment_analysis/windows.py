@@ -0,0 +1,157 @@
+from collections import OrderedDict
+import threading
+import time
+
+import numpy as np
+
+# Default sliding windows: last 1 minute, 15 minutes and 1 hour
+DEFAULT_WINDOWS = (60, 900, 3600)
+
+# Each window is split into this many ring-buffer buckets
+BUCKETS_PER_WINDOW = 60
+
+# Per-bucket statistics
+_COUNT, _POSITIVE, _NEGATIVE, _NEUTRAL, _COMPOUND_SUM = range(5)
+_SENTIMENT_FIELDS = {"positive": _POSITIVE, "negative": _NEGATIVE, "neutral": _NEUTRAL}
+
+
+class _KeyWindows:
+    """Ring buffers of one post/account, one ring per window size."""
+
+    def __init__(self, n_windows, n_buckets):
+        self.stats = np.zeros((n_windows, n_buckets, 5))
+        # Epoch (timestamp // bucket width) each bucket currently holds, -1 if unused
+        self.epochs = np.full((n_windows, n_buckets), -1, dtype=np.int64)
+
+
+class RollingSentimentAggregator:
+    """
+    In-memory sliding-window sentiment statistics keyed by post or account ID.
+
+    Every window is a ring of fixed-width buckets (window / BUCKETS_PER_WINDOW
+    seconds each). Adding a comment touches one bucket per window, so updates
+    are O(1) regardless of traffic; a bucket is reset when the ring wraps
+    around to it, and queries only sum buckets still inside the window.
+    """
+
+    def __init__(self, windows=DEFAULT_WINDOWS, buckets_per_window=BUCKETS_PER_WINDOW, max_keys=100000):
+        """
+        Initialize the aggregator.
+
+        Args:
+            windows (tuple): Window sizes in seconds.
+            buckets_per_window (int): Number of ring-buffer buckets per window.
+                More buckets make window edges more precise.
+            max_keys (int): Maximum number of tracked keys; the least recently
+                updated keys are dropped beyond this.
+        """
+        self.windows = tuple(int(w) for w in windows)
+        if not self.windows or any(w <= 0 for w in self.windows):
+            raise ValueError("Window sizes must be positive numbers of seconds")
+        self.buckets_per_window = buckets_per_window
+        self.bucket_widths = np.array([w / buckets_per_window for w in self.windows])
+        self.max_keys = max_keys
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key, sentiment, compound, timestamp=None):
+        """
+        Record one scored comment.
+
+        Args:
+            key (str): Post or account ID.
+            sentiment (str): "positive", "negative" or "neutral".
+            compound (float): The comment's compound score.
+            timestamp (float): Arrival time in seconds since the epoch. Defaults to now.
+        """
+        self.add_many(key, [sentiment], [compound], timestamp)
+
+    def add_many(self, key, sentiments, compounds, timestamp=None):
+        """
+        Record a batch of scored comments that arrived at the same time.
+
+        Args:
+            key (str): Post or account ID.
+            sentiments (list): Sentiment labels of the comments.
+            compounds (list): Compound scores of the comments.
+            timestamp (float): Arrival time in seconds since the epoch. Defaults to now.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        delta = np.zeros(5)
+        delta[_COUNT] = len(sentiments)
+        for sentiment in sentiments:
+            delta[_SENTIMENT_FIELDS[sentiment]] += 1
+        delta[_COMPOUND_SUM] = float(np.sum(compounds))
+
+        epochs = (timestamp // self.bucket_widths).astype(np.int64)
+        slots = epochs % self.buckets_per_window
+        rows = np.arange(len(self.windows))
+
+        with self._lock:
+            state = self._keys.get(key)
+            if state is None:
+                state = _KeyWindows(len(self.windows), self.buckets_per_window)
+                self._keys[key] = state
+                if len(self._keys) > self.max_keys:
+                    # Drop the least recently updated key
+                    self._keys.popitem(last=False)
+            else:
+                self._keys.move_to_end(key)
+
+            held = state.epochs[rows, slots]
+            # Reset buckets the ring has wrapped around to
+            newer = epochs > held
+            if newer.any():
+                state.stats[rows[newer], slots[newer]] = 0
+                state.epochs[rows[newer], slots[newer]] = epochs[newer]
+            # Late arrivals older than a window's ring are dropped for that window
+            current = epochs >= held
+            state.stats[rows[current], slots[current]] += delta
+
+    def summary(self, key, timestamp=None):
+        """
+        Get the current statistics of every window for a key.
+
+        Args:
+            key (str): Post or account ID.
+            timestamp (float): Time to evaluate the windows at. Defaults to now.
+
+        Returns:
+            list: One dict per window with the window size, comment counts,
+                percentages and average compound score.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        current = (timestamp // self.bucket_widths).astype(np.int64)
+        with self._lock:
+            state = self._keys.get(key)
+            if state is None:
+                totals = np.zeros((len(self.windows), 5))
+            else:
+                live = (state.epochs > (current[:, None] - self.buckets_per_window)) & \
+                       (state.epochs <= current[:, None])
+                totals = (state.stats * live[:, :, None]).sum(axis=1)
+
+        summaries = []
+        for window, row in zip(self.windows, totals):
+            total = int(row[_COUNT])
+            summaries.append({
+                "window_seconds": window,
+                "total_comments": total,
+                "positive_comments": int(row[_POSITIVE]),
+                "negative_comments": int(row[_NEGATIVE]),
+                "neutral_comments": int(row[_NEUTRAL]),
+                "positive_percentage": float(row[_POSITIVE] / total) * 100 if total > 0 else 0,
+                "negative_percentage": float(row[_NEGATIVE] / total) * 100 if total > 0 else 0,
+                "neutral_percentage": float(row[_NEUTRAL] / total) * 100 if total > 0 else 0,
+                "average_compound": float(row[_COMPOUND_SUM] / total) if total > 0 else 0
+            })
+        return summaries
+
+    def keys(self):
+        """Return the IDs currently being tracked."""
+        with self._lock:
+            return list(self._keys)
@@ -0,0 +1,46 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.sentiment_analysis.backends import train_linear_backend
+
+
+def main():
+    """
+    Train the linear sentiment model from a labeled CSV file.
+    """
+    parser = argparse.ArgumentParser(description="Train the linear sentiment backend from a labeled CSV file.")
+    parser.add_argument("csv_path", help="CSV file with comment text and sentiment labels")
+    parser.add_argument("--output", default=str(project_root / "models" / "linear_sentiment.npz"),
+                        help="Where to write the trained model artifact")
+    parser.add_argument("--text-column", default="comment", help="Column holding the comments")
+    parser.add_argument("--label-column", default="sentiment",
+                        help="Column holding the labels (negative/neutral/positive)")
+    parser.add_argument("--n-features", type=int, default=2 ** 18, help="Number of hashed features")
+    parser.add_argument("--C", type=float, default=1.0, help="Inverse regularization strength")
+    args = parser.parse_args()
+
+    print(f"Training linear model from {args.csv_path}...")
+    start = time.perf_counter()
+    backend = train_linear_backend(
+        args.csv_path,
+        text_column=args.text_column,
+        label_column=args.label_column,
+        n_features=args.n_features,
+        C=args.C,
+    )
+    print(f"Trained on classes {backend.classes} in {time.perf_counter() - start:.1f}s")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    backend.save(str(output))
+    print(f"Saved model to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import nltk
+import pytest
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.insights import SentimentInsights
+
+
+class TestAnalyzeIter:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.analyzer = SentimentAnalyzer()
+        self.comments = ["I love this! 😍", "This is terrible", "", "It is a chair", "Great job", "@bob"] * 5
+
+    def expected(self):
+        return SentimentAnalyzer().analyze_comments(self.comments).to_dict("records")
+
+    def test_matches_analyze_comments(self):
+        """Test that lazy results equal the DataFrame rows, in order."""
+        results = list(self.analyzer.analyze_iter(iter(self.comments), batch_size=4))
+        assert results == self.expected()
+
+    def test_pulls_lazily(self):
+        """Test that comments are only pulled one batch ahead of the consumer."""
+        pulled = []
+
+        def source():
+            for comment in self.comments:
+                pulled.append(comment)
+                yield comment
+
+        results = self.analyzer.analyze_iter(source(), batch_size=4)
+        next(results)
+        assert len(pulled) == 4
+
+    def test_updates_insights(self):
+        """Test that batches feed the insights accumulator."""
+        insights = SentimentInsights(top_k=1)
+        for _ in self.analyzer.analyze_iter(self.comments, batch_size=7, insights=insights):
+            pass
+        assert insights.most_positive()[0]["comment"] == "I love this! 😍"
+
+    def test_invalid_batch_size(self):
+        """Test that the batch size must be positive."""
+        with pytest.raises(ValueError):
+            list(self.analyzer.analyze_iter(self.comments, batch_size=0))
+
+    def test_async_with_async_iterable(self):
+        """Test the async counterpart over an async source."""
+        async def source():
+            for comment in self.comments:
+                await asyncio.sleep(0)
+                yield comment
+
+        async def collect():
+            return [result async for result in self.analyzer.analyze_iter_async(source(), batch_size=4)]
+
+        assert asyncio.run(collect()) == self.expected()
+
+    def test_async_with_regular_iterable(self):
+        """Test the async counterpart over a regular iterable."""
+        async def collect():
+            return [result async for result in self.analyzer.analyze_iter_async(self.comments, batch_size=50)]
+
+        assert asyncio.run(collect()) == self.expected()
@@ -0,0 +1,138 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.backends import (
+    LinearBackend,
+    SentimentBackend,
+    VaderBackend,
+    create_backend,
+    train_linear_backend
+)
+
+
+TRAINING_DATA = [
+    ("I love this, amazing work", "positive"),
+    ("So beautiful, great photo", "positive"),
+    ("Awesome content, love it", "positive"),
+    ("Great job, very happy", "positive"),
+    ("This is terrible, I hate it", "negative"),
+    ("Awful post, so bad", "negative"),
+    ("Horrible content, hate this", "negative"),
+    ("Worst photo ever, terrible", "negative"),
+    ("Posted at noon today", "neutral"),
+    ("This is a photo of a street", "neutral"),
+    ("The event is on Monday", "neutral"),
+    ("Link in the bio", "neutral"),
+]
+
+
+class TestBackends:
+
+    @pytest.fixture
+    def model_path(self, tmp_path):
+        """Train a small linear model from a labeled CSV and save it."""
+        csv_path = tmp_path / "labeled.csv"
+        pd.DataFrame(TRAINING_DATA, columns=["comment", "sentiment"]).to_csv(csv_path, index=False)
+
+        backend = train_linear_backend(str(csv_path), C=10.0)
+        path = tmp_path / "linear.npz"
+        backend.save(str(path))
+        return str(path)
+
+    def test_vader_backend_batch(self):
+        """Test that the VADER backend returns one score per text."""
+        backend = VaderBackend()
+        scores = backend.score(["I love it", "I hate it", "A table"])
+
+        assert set(scores) == {"pos", "neg", "neu", "compound"}
+        assert all(len(values) == 3 for values in scores.values())
+        assert scores["compound"][0] > 0
+        assert scores["compound"][1] < 0
+
+    def test_linear_backend_round_trip(self, model_path):
+        """Test that a saved linear model scores batches after loading."""
+        backend = create_backend("linear", model_path=model_path)
+        scores = backend.score(["love this amazing photo", "hate this terrible post"])
+
+        assert isinstance(backend, LinearBackend)
+        assert scores["compound"][0] > 0
+        assert scores["compound"][1] < 0
+        total = scores["pos"] + scores["neg"] + scores["neu"]
+        assert np.allclose(total, 1.0)
+        assert np.allclose(scores["compound"], scores["pos"] - scores["neg"])
+
+    def test_linear_matches_predict_proba(self, tmp_path):
+        """Test that the sparse scoring path agrees with scikit-learn."""
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        texts, labels = zip(*TRAINING_DATA)
+        backend = LinearBackend.train(list(texts), list(labels), n_features=2 ** 12)
+        vectorizer = HashingVectorizer(**backend.vectorizer_params)
+        model = LogisticRegression(max_iter=1000).fit(vectorizer.transform(texts), labels)
+
+        expected = model.predict_proba(vectorizer.transform(["love it", "hate it"]))
+        assert np.allclose(backend.predict_proba(["love it", "hate it"]), expected)
+
+    def test_analyzer_with_linear_backend(self, model_path):
+        """Test the analyzer end to end with the linear backend."""
+        analyzer = SentimentAnalyzer(model_type="linear", model_path=model_path)
+        results = analyzer.analyze_comments(["I love this amazing photo", "I hate this, awful", "", "😍😍"])
+
+        assert list(results["sentiment"]) == ["positive", "negative", "neutral", "positive"]
+
+    def test_invalid_backend(self):
+        """Test that unknown model types and missing artifacts are rejected."""
+        with pytest.raises(ValueError):
+            SentimentAnalyzer(model_type="transformer")
+        with pytest.raises(ValueError):
+            SentimentAnalyzer(model_type="linear")
+
+    def test_backend_must_implement_score(self):
+        """Test that a backend without a score method can't be created."""
+        class Incomplete(SentimentBackend):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+        with pytest.raises(TypeError):
+            SentimentBackend()
+
+    def test_cascade_escalation(self, model_path):
+        """Test that cascade mode escalates only uncertain comments."""
+        comments = ["I love this amazing photo", "I hate this, awful", "The event is on Monday", "😍😍"]
+        vader_results = SentimentAnalyzer().analyze_comments(comments)
+
+        # A band wider than the whole score range escalates everything to VADER
+        always = SentimentAnalyzer(fast_model_type="linear", fast_model_path=model_path, uncertainty_band=2.0)
+        results = always.analyze_comments(comments)
+        stats = always.get_cascade_stats()
+
+        assert list(results["compound"]) == list(vader_results["compound"])
+        # Emoji-only comments and comments without lexicon words never reach a model
+        assert stats["escalated_comments"] == 2
+        assert stats["escalation_rate"] == 1.0
+
+        # A zero-width band only escalates scores sitting exactly on a threshold
+        never = SentimentAnalyzer(fast_model_type="linear", fast_model_path=model_path, uncertainty_band=0.0)
+        never.analyze_comments(comments)
+
+        assert never.get_cascade_stats()["fast_comments"] == 2
+
+    def test_is_uncertain(self):
+        """Test the uncertainty band around the classification thresholds."""
+        analyzer = SentimentAnalyzer(uncertainty_band=0.02)
+
+        assert analyzer.is_uncertain(0.06)
+        assert analyzer.is_uncertain(-0.04)
+        assert not analyzer.is_uncertain(0.5)
+        assert not analyzer.is_uncertain(-0.5)
+        assert not analyzer.is_uncertain(0.0)
@@ -0,0 +1,189 @@
+import pytest
+import gzip
+import io
+import json
+import os
+import sys
+from pathlib import Path
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.api.app import app
+from src.api.middleware.compression import (
+    CompressionMiddleware,
+    DecompressingReader,
+    _Decompressor,
+    negotiate_encoding,
+    supported_encodings,
+    zstandard,
+)
+
+
+def compress(data, encoding):
+    """Compress data with gzip or zstd."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data)
+
+
+async def body_chunks(scope, receive, send):
+    """ASGI app that reports the sizes of the request body chunks it receives."""
+    sizes = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        sizes.append(len(message.get("body", b"")))
+        more_body = message.get("more_body", False)
+    await JSONResponse({"sizes": sizes})(scope, receive, send)
+
+
+class TestCompression:
+
+    @pytest.fixture
+    def client(self):
+        """Create a test client for the FastAPI app."""
+        return TestClient(app)
+
+    def setup_method(self):
+        """Set up the test environment before each test method."""
+        self.comments = ["This is amazing! I love it! ❤️", "This is terrible, I hate it."] * 50
+        self.csv_bytes = ("comment\n" + "\n".join(f'"{c}"' for c in self.comments) + "\n").encode("utf-8")
+
+    def test_negotiate_encoding(self):
+        """Test Accept-Encoding negotiation."""
+        assert negotiate_encoding("") is None
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("gzip") == "gzip"
+        assert negotiate_encoding("gzip;q=0") is None
+        assert negotiate_encoding("*") == supported_encodings()[0]
+        if "zstd" in supported_encodings():
+            assert negotiate_encoding("gzip, zstd") == "zstd"
+            assert negotiate_encoding("gzip;q=1.0, zstd;q=0.5") == "gzip"
+
+    def test_gzip_response(self, client):
+        """Test that large responses are gzip compressed when requested."""
+        response = client.post(
+            "/sentiment/analyze?include_details=true",
+            json={"comments": self.comments},
+            headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()["results"]) == len(self.comments)
+
+    def test_small_response_not_compressed(self, client):
+        """Test that responses below the size threshold are sent as-is."""
+        response = client.post(
+            "/sentiment/analyze",
+            json={"comments": ["Nice"]},
+            headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_zstd_response(self, client):
+        """Test that zstd is preferred when the client accepts it."""
+        zstandard = pytest.importorskip("zstandard")
+        response = client.post(
+            "/sentiment/analyze?include_details=true",
+            json={"comments": self.comments},
+            headers={"Accept-Encoding": "zstd, gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "zstd"
+        # Older test clients don't decode zstd themselves
+        body = response.content
+        if not body.startswith(b"{"):
+            body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+        assert b'"total_comments":100' in body
+
+    def test_gzip_request_body(self, client):
+        """Test that gzip-encoded request bodies are decompressed."""
+        body = gzip.compress(json.dumps({"comments": self.comments}).encode("utf-8"))
+        response = client.post(
+            "/sentiment/analyze",
+            content=body,
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["summary"]["total_comments"] == len(self.comments)
+
+    def test_unsupported_request_encoding(self, client):
+        """Test that unknown request encodings are rejected."""
+        response = client.post(
+            "/sentiment/analyze",
+            content=b"{}",
+            headers={"Content-Type": "application/json", "Content-Encoding": "br"}
+        )
+
+        assert response.status_code == 415
+
+    def test_gzip_csv_upload(self, client):
+        """Test uploading a gzip-compressed CSV file."""
+        response = client.post(
+            "/sentiment/analyze-csv",
+            files={"file": ("comments.csv.gz", gzip.compress(self.csv_bytes), "application/gzip")}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["summary"]["total_comments"] == len(self.comments)
+
+    def test_decompressing_reader(self):
+        """Test reading a compressed stream in small pieces."""
+        reader = DecompressingReader(io.BytesIO(gzip.compress(self.csv_bytes)), "gzip", chunk_size=16)
+
+        assert reader.read(7) == b"comment"
+        assert reader.read() == self.csv_bytes[7:]
+        assert reader.read() == b""
+
+    @pytest.mark.parametrize("encoding", supported_encodings())
+    def test_decompressor_max_length(self, encoding):
+        """Test that decompression stops near max_length and keeps the rest of the input."""
+        data = b"\0" * (8 * 1024 * 1024)
+        decompressor = _Decompressor(encoding)
+        pending = compress(data, encoding)
+        pieces = []
+        while pending:
+            pieces.append(decompressor.decompress(pending, 64 * 1024))
+            pending = decompressor.unconsumed_tail
+        pieces.append(decompressor.flush())
+
+        assert b"".join(pieces) == data
+        assert len(pieces) > 2
+        # zstd may overshoot by one minimal input slice
+        assert max(map(len, pieces)) <= 64 * 1024 + 2 * 1024 * 1024
+
+    @pytest.mark.parametrize("encoding", supported_encodings())
+    def test_request_body_inflated_in_chunks(self, encoding):
+        """Test that a compressed request body reaches the app in bounded chunks."""
+        client = TestClient(CompressionMiddleware(body_chunks, max_decompressed_size=1024 * 1024,
+                                                  decompress_chunk_size=4096))
+        body = compress(os.urandom(500000).hex().encode(), encoding)
+        response = client.post("/", content=body, headers={"Content-Encoding": encoding})
+
+        assert response.status_code == 200
+        sizes = response.json()["sizes"]
+        assert sum(sizes) == 1000000
+        assert len(sizes) > 5
+        # zstd only outputs whole blocks of up to 128 KiB
+        assert max(sizes) <= 4096 + 128 * 1024
+
+    @pytest.mark.parametrize("encoding", supported_encodings())
+    def test_decompression_bomb_rejected(self, client, encoding):
+        """Test that a body inflating past the default limit is rejected without inflating it whole."""
+        body = compress(b"\0" * (64 * 1024 * 1024), encoding)
+        response = client.post(
+            "/sentiment/analyze",
+            content=body,
+            headers={"Content-Type": "application/json", "Content-Encoding": encoding}
+        )
+
+        assert response.status_code == 400
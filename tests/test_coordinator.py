@@ -0,0 +1,230 @@
+import csv
+import io
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import nltk
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.api.app import app
+from src.api.use_cases.csv_coordinator_use_case import CsvCoordinatorUseCase, ShardError, split_csv
+
+WORKERS = ["http://worker-a", "http://worker-b", "http://worker-c"]
+
+
+class FlakyTransport(httpx.AsyncBaseTransport):
+    """Routes every worker to the in-process app, failing chosen workers."""
+
+    def __init__(self, down=(), failures=0, status_code=None):
+        self.app_transport = httpx.ASGITransport(app=app)
+        self.down = set(down)
+        self.failures = failures
+        self.status_code = status_code
+        self.requests = []
+
+    async def handle_async_request(self, request):
+        host = f"{request.url.scheme}://{request.url.host}"
+        self.requests.append(host)
+        if host in self.down:
+            raise httpx.ConnectError("Connection refused", request=request)
+        if self.failures > 0:
+            self.failures -= 1
+            if self.status_code is not None:
+                return httpx.Response(self.status_code, json={"detail": "Worker overloaded"})
+            raise httpx.ReadTimeout("Timed out", request=request)
+        return await self.app_transport.handle_async_request(request)
+
+
+def write_csv(path, rows, header=("comment", "post_id")):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def comment_rows(n):
+    comments = [
+        "I love this! 😍",
+        "Terrible,\nwould not buy again 😡",
+        "It's okay I guess",
+        "\"Best\" post ever 👏👏",
+        "",
+        "meh 🤔",
+    ]
+    return [(comments[i % len(comments)], f"post-{i % 4}") for i in range(n)]
+
+
+class TestSplitCsv:
+
+    def test_shards_cover_the_body(self, tmp_path):
+        """Test that shards are contiguous and cover every record after the header."""
+        path = tmp_path / "comments.csv"
+        write_csv(path, comment_rows(200))
+        header_end, shards = split_csv(str(path), 256)
+
+        assert header_end == len(b"comment,post_id\r\n")
+        assert len(shards) > 5
+        assert shards[0][1] == header_end
+        assert shards[-1][2] == os.path.getsize(path)
+        for (_, _, end), (_, start, _) in zip(shards, shards[1:]):
+            assert end == start
+
+    def test_quoted_newlines_are_not_split(self, tmp_path):
+        """Test that every shard parses to whole records."""
+        path = tmp_path / "comments.csv"
+        rows = comment_rows(120)
+        write_csv(path, rows)
+        header_end, shards = split_csv(str(path), 64)
+
+        data = path.read_bytes()
+        parsed = []
+        for _, start, end in shards:
+            parsed.extend(csv.reader(io.StringIO(data[start:end].decode("utf-8"), newline="")))
+        assert [tuple(row) for row in parsed] == rows
+
+    def test_invalid_input(self, tmp_path):
+        """Test that empty files and non-positive shard sizes are rejected."""
+        path = tmp_path / "empty.csv"
+        path.write_bytes(b"")
+
+        with pytest.raises(ValueError):
+            split_csv(str(path), 1024)
+        with pytest.raises(ValueError):
+            split_csv(str(path), 0)
+
+
+class TestCsvCoordinator:
+
+    def setup_method(self):
+        """Set up a client for single-instance reference results."""
+        self.client = TestClient(app)
+
+    def single_instance(self, path, **params):
+        with open(path, "rb") as f:
+            response = self.client.post(
+                "/sentiment/analyze-csv", params=params, files={"file": ("comments.csv", f, "text/csv")}
+            )
+        assert response.status_code == 200
+        return response.json()
+
+    def test_matches_single_instance(self, tmp_path):
+        """Test that the merged summary and results file match a single /analyze-csv + /download-csv."""
+        path = tmp_path / "comments.csv"
+        write_csv(path, comment_rows(300))
+        output = tmp_path / "results.csv"
+
+        coordinator = CsvCoordinatorUseCase(WORKERS, shard_bytes=512, transport=FlakyTransport())
+        response = coordinator.score_csv(str(path), str(output))
+
+        expected = self.single_instance(path)
+        assert response.summary.model_dump() == expected["summary"]
+        assert response.results is None
+        assert coordinator.stats["shards"] > len(WORKERS)
+        assert coordinator.stats["retries"] == 0
+        assert all(count > 0 for count in coordinator.stats["shards_per_worker"].values())
+
+        download = self.client.post("/sentiment/download-csv", json=expected)
+        assert output.read_bytes() == download.content
+        # Temporary shard files are cleaned up
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["comments.csv", "results.csv"]
+
+    def test_merges_groups_and_insights(self, tmp_path):
+        """Test that per-shard groups and insights add up to the single-instance ones."""
+        path = tmp_path / "comments.csv"
+        write_csv(path, comment_rows(300))
+
+        coordinator = CsvCoordinatorUseCase(WORKERS, shard_bytes=700, transport=FlakyTransport(), compress=True)
+        response = coordinator.score_csv(str(path), group_by=["post_id"], top_k=3)
+        expected = self.single_instance(path, group_by="post_id", top_k=3)
+
+        assert [group.group for group in response.groups] == [group["group"] for group in expected["groups"]]
+        for group, expected_group in zip(response.groups, expected["groups"]):
+            merged = group.summary.model_dump()
+            for field, value in expected_group["summary"].items():
+                assert merged[field] == pytest.approx(value)
+
+        insights = response.insights.model_dump()
+        assert insights["most_positive"] == expected["insights"]["most_positive"]
+        assert insights["most_negative"] == expected["insights"]["most_negative"]
+        assert [e["emoji"] for e in insights["emojis"]] == [e["emoji"] for e in expected["insights"]["emojis"]]
+        for merged, single in zip(insights["emojis"], expected["insights"]["emojis"]):
+            assert merged["count"] == single["count"]
+            assert merged["comments"] == single["comments"]
+            assert merged["contribution"] == pytest.approx(single["contribution"])
+            assert merged["average_compound"] == pytest.approx(single["average_compound"])
+
+    def test_retries_failed_shards(self, tmp_path):
+        """Test that shards of a dead worker and transient failures are retried elsewhere."""
+        path = tmp_path / "comments.csv"
+        write_csv(path, comment_rows(100))
+
+        transport = FlakyTransport(down={"http://worker-b"}, failures=2, status_code=503)
+        coordinator = CsvCoordinatorUseCase(WORKERS, shard_bytes=512, retry_delay=0, transport=transport)
+        response = coordinator.score_csv(str(path))
+
+        assert response.summary.model_dump() == self.single_instance(path)["summary"]
+        assert coordinator.stats["retries"] >= 3
+        assert coordinator.stats["shards_per_worker"]["http://worker-b"] == 0
+
+    def test_gives_up_after_max_attempts(self, tmp_path):
+        """Test that a shard failing on every attempt fails the run."""
+        path = tmp_path / "comments.csv"
+        write_csv(path, comment_rows(10))
+
+        transport = FlakyTransport(down=WORKERS)
+        coordinator = CsvCoordinatorUseCase(WORKERS, max_attempts=2, retry_delay=0, transport=transport)
+
+        with pytest.raises(ShardError, match="after 2 attempt"):
+            coordinator.score_csv(str(path), str(tmp_path / "results.csv"))
+        assert len(transport.requests) == 2
+        assert not (tmp_path / "results.csv").exists()
+
+    def test_rejected_shards_are_not_retried(self, tmp_path):
+        """Test that client errors fail the run immediately."""
+        path = tmp_path / "comments.csv"
+        write_csv(path, [("hello",)], header=("text",))
+
+        transport = FlakyTransport()
+        coordinator = CsvCoordinatorUseCase(WORKERS, transport=transport)
+
+        with pytest.raises(ShardError, match="'comment' or 'Comment' column"):
+            coordinator.score_csv(str(path))
+        assert len(transport.requests) == 1
+
+    def test_shards_without_comments(self, tmp_path):
+        """Test that shards whose comments are all empty are skipped like in a single call."""
+        path = tmp_path / "comments.csv"
+        write_csv(path, [("", "post-1")] * 50 + [("Great!", "post-2")])
+
+        coordinator = CsvCoordinatorUseCase(WORKERS, shard_bytes=64, transport=FlakyTransport())
+        response = coordinator.score_csv(str(path))
+        assert response.summary.total_comments == 1
+
+        write_csv(path, [("", "post-1")] * 5)
+        with pytest.raises(ValueError, match="No valid comments"):
+            coordinator.score_csv(str(path))
+
+    def test_group_types_are_inferred_over_the_whole_file(self, tmp_path):
+        """Test that a group value is typed the same in every shard, like in a single read of the file."""
+        path = tmp_path / "comments.csv"
+        for tail in ([], [("Nice", "x")]):
+            write_csv(path, [("Great!", "7")] * 40 + [("Awful", "007")] * 40 + tail)
+
+            coordinator = CsvCoordinatorUseCase(WORKERS, shard_bytes=64, transport=FlakyTransport())
+            response = coordinator.score_csv(str(path), group_by=["post_id"])
+            expected = self.single_instance(path, group_by="post_id")
+
+            assert coordinator.stats["shards"] > 2
+            assert [group.group for group in response.groups] == [group["group"] for group in expected["groups"]]
+            assert [group.summary.total_comments for group in response.groups] == [
+                group["summary"]["total_comments"] for group in expected["groups"]
+            ]
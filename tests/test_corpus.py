@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+import os
+import sys
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.corpus import (
+    build_line_index,
+    index_path_for,
+    load_line_index,
+    score_corpus
+)
+
+
+class TestCorpus:
+
+    def setup_method(self):
+        """Set up the test environment before each test method."""
+        self.comments = [
+            "This is amazing! I love it! ❤️",
+            "This is terrible, I hate it.",
+            "",
+            "obrigado, que lindo!",
+            "👎👎👎",
+        ] * 5
+
+    def write_corpus(self, tmp_path, trailing_newline=True):
+        path = tmp_path / "comments.txt"
+        text = "\n".join(self.comments) + ("\n" if trailing_newline else "")
+        path.write_bytes(text.encode("utf-8"))
+        return str(path)
+
+    def test_build_line_index(self, tmp_path):
+        """Test line offsets with and without a trailing newline."""
+        for trailing_newline in (True, False):
+            path = self.write_corpus(tmp_path, trailing_newline)
+            offsets = build_line_index(path, block_size=7)
+
+            assert len(offsets) - 1 == len(self.comments)
+            data = Path(path).read_bytes()
+            assert data[offsets[1]:offsets[2] - 1].decode("utf-8") == self.comments[1]
+
+    def test_index_is_persisted(self, tmp_path):
+        """Test that the index is saved next to the file and reused."""
+        path = self.write_corpus(tmp_path)
+        offsets = load_line_index(path)
+
+        assert os.path.exists(index_path_for(path))
+        assert np.array_equal(load_line_index(path), offsets)
+
+    def test_score_corpus_matches_analyzer(self, tmp_path):
+        """Test that mmap scoring matches analyze_comments row for row."""
+        path = self.write_corpus(tmp_path)
+        expected = SentimentAnalyzer().analyze_comments(self.comments)
+
+        scores = score_corpus(path, workers=1, chunk_lines=4)
+
+        assert scores.shape == (len(self.comments), 4)
+        assert np.allclose(scores[:, 0], expected["compound"], atol=1e-6)
+        assert np.allclose(scores[:, 1], expected["positive"], atol=1e-6)
+
+    def test_score_corpus_multiprocess(self, tmp_path):
+        """Test that worker processes write disjoint ranges of the output."""
+        path = self.write_corpus(tmp_path)
+        single = np.array(score_corpus(path, output_path=str(tmp_path / "single.npy"), workers=1))
+
+        multi = score_corpus(path, output_path=str(tmp_path / "multi.npy"), workers=2, chunk_lines=3)
+
+        assert np.array_equal(np.array(multi), single)
@@ -0,0 +1,163 @@
+import os
+import random
+import sys
+from pathlib import Path
+
+import nltk
+import pytest
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.emoji_utils import (
+    EMOJI_SENTIMENT,
+    EmojiTable,
+    encode_codepoints,
+    extract_emojis,
+    extract_emojis_batch,
+    get_emoji_sentiment_scores,
+    get_emoji_sentiment_scores_batch
+)
+from src.sentiment_analysis.prefilter import ROUTE_MODEL
+
+# Fragments covering table emojis, emoji sequences, emojis missing from the
+# table, plain text and characters that need care in UTF-32
+FRAGMENTS = [
+    "😍", "😡", "👍", "🤔", "💔", "🔥", "😐",
+    "❤️", "❤", "❤︎",                      # heart with emoji/text variation selectors
+    "🤷‍♀️", "🤷‍♂️", "👨‍👩‍👧",                        # ZWJ sequences
+    "👍🏽", "🇫🇷", "#️⃣",                             # skin tone, flag, keycap
+    "🦄", "🫠", "©", "™",                           # emojis missing from the table
+    "great", "awful", " ", "\n", "é", "日本", "‍", "️",
+    "\ud83d",                                       # lone surrogate
+]
+
+
+def random_texts(n, seed=0):
+    rng = random.Random(seed)
+    texts = ["", None]
+    for _ in range(n):
+        texts.append("".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 15))))
+    return texts
+
+
+def assert_scores_match(texts, table=None):
+    batch = get_emoji_sentiment_scores_batch(texts, table)
+    assert all(len(values) == len(texts) for values in batch.values())
+    for i, text in enumerate(texts):
+        scalar = get_emoji_sentiment_scores(text, table)
+        for key in ("pos", "neg", "neu", "compound"):
+            assert batch[key][i] == pytest.approx(scalar[key], abs=1e-12), (text, key)
+
+
+class TestEmojiBatch:
+
+    def test_encode_codepoints(self):
+        """Test that texts are encoded back to back with their end offsets."""
+        codepoints, ends = encode_codepoints(["a😍", "", None, "❤️"])
+
+        assert codepoints.tolist() == [ord("a"), 0x1F60D, 0x2764, 0xFE0F]
+        assert ends.tolist() == [2, 2, 2, 4]
+
+    def test_extract_parity(self):
+        """Test that batch extraction finds the same emojis as extract_emojis."""
+        texts = random_texts(500)
+
+        assert extract_emojis_batch(texts) == [extract_emojis(text) for text in texts]
+
+    def test_score_parity(self):
+        """Test that batch scores match the scalar scores."""
+        assert_scores_match(random_texts(1000))
+
+    def test_sequences(self):
+        """Test that sequences are scored per codepoint, like the scalar path."""
+        texts = ["❤️", "❤", "🤷‍♀️", "👍🏽👍", "️‍"]
+        batch = get_emoji_sentiment_scores_batch(texts)
+
+        # The variation selector and ZWJ are not emojis and the heart keeps its score
+        assert batch["count"].tolist() == [1, 1, 1, 2, 0]
+        assert batch["pos"][0] == batch["pos"][1] == 0.8
+        assert batch["neu"][4] == 1.0
+        assert_scores_match(texts)
+
+    def test_long_segments(self):
+        """Test comments with many emojis, which take the unrolled reduction path."""
+        rng = random.Random(1)
+        emojis = list(EMOJI_SENTIMENT)
+        texts = ["".join(rng.choice(emojis) for _ in range(rng.randint(8, 300))) for _ in range(50)]
+
+        assert_scores_match(texts)
+
+    def test_custom_table(self):
+        """Test parity with a table holding sequences and non-emoji keys the scalar path never matches."""
+        table = EmojiTable({
+            "🦄": (1, 0, 0),
+            "🤷‍♀️": (0, 1, 0),
+            "x": (0, 1, 0),
+            "❤": (0.5, 0.5, 0),
+        }, version="custom")
+
+        # "x" is not an emoji and the sequence isn't a single codepoint
+        assert sorted(table.codepoints.tolist()) == [ord("❤"), ord("🦄")]
+        assert_scores_match(random_texts(300, seed=2) + ["x🦄", "🤷‍♀️"], table)
+
+    def test_sequence_keys(self):
+        """Test parity with keys spelled with variation selectors and keys that are sequences."""
+        table = EmojiTable({
+            "☺️": (0.8, 0, 0.2),
+            "✌️": (0.7, 0, 0.3),
+            "🤷‍♀️": (0, 1, 0),
+            "👍🏽": (0, 1, 0),
+        }, version="sequences")
+
+        assert table.dropped == ("🤷‍♀️", "👍🏽")
+        assert sorted(table.codepoints.tolist()) == [ord("☺"), ord("✌")]
+        assert table.scores["☺"] == table.scores["☺️"] == (0.8, 0.0, 0.2)
+
+        texts = ["☺️ nice", "☺ nice", "✌️🤷‍♀️", "👍🏽", "peace ✌"]
+        scores = get_emoji_sentiment_scores("☺️ nice", table)
+        assert scores["pos"] == 0.8 and scores["compound"] > 0
+        assert get_emoji_sentiment_scores_batch(texts, table)["count"].tolist() == [1, 1, 1, 0, 1]
+        assert_scores_match(texts + random_texts(100, seed=4), table)
+
+    def test_empty_table_and_batch(self):
+        """Test the degenerate cases."""
+        empty = get_emoji_sentiment_scores_batch([])
+        assert all(len(values) == 0 for values in empty.values())
+        assert extract_emojis_batch([]) == []
+
+        table = EmojiTable({}, version="empty")
+        batch = get_emoji_sentiment_scores_batch(["😍", ""], table)
+        assert batch["count"].tolist() == [0, 0]
+        assert batch["neu"].tolist() == [1.0, 1.0]
+        assert get_emoji_sentiment_scores("😍", table)["pos"] == 0
+
+    def test_analyzer_parity(self):
+        """Test that batch analysis matches scoring each comment with the scalar emoji path."""
+        analyzer = SentimentAnalyzer(cache_size=0)
+        texts = [text for text in random_texts(300, seed=3) if text]
+        results = analyzer.analyze_comments(texts)
+
+        for text, row in zip(texts, results.to_dict("records")):
+            route = analyzer._route_comment(text)
+            model_scores = analyzer._backend_scores(analyzer.backend, [text])[0] if route == ROUTE_MODEL else None
+            expected = analyzer._build_result(text, route, model_scores)
+            assert row["sentiment"] == expected["sentiment"]
+            assert row["emojis"] == expected["emojis"]
+            for key in ("compound", "positive", "negative", "neutral"):
+                assert row[key] == pytest.approx(expected[key], abs=1e-12)
+
+    def test_sweep_parity(self):
+        """Test that the weight sweep's batch emoji components still match analysis."""
+        analyzer = SentimentAnalyzer(emoji_weight=0.3, cache_size=0)
+        texts = random_texts(200, seed=4)[2:]
+        sweep = analyzer.sweep_emoji_weights(texts, [0.3]).iloc[0]
+        summary = analyzer.get_summary_stats(analyzer.analyze_comments(texts))
+
+        assert sweep["positive_comments"] == summary["positive_comments"]
+        assert sweep["negative_comments"] == summary["negative_comments"]
+        assert sweep["average_compound"] == pytest.approx(summary["average_compound"])
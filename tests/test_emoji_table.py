@@ -0,0 +1,187 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import nltk
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.emoji_utils import (
+    BUILTIN_TABLE_VERSION,
+    EmojiTable,
+    EmojiTableWatcher,
+    get_emoji_sentiment_scores,
+    get_emoji_table,
+    load_emoji_table,
+    set_emoji_table
+)
+from src.api.app import app
+
+
+def write_table(path, emojis, version=None):
+    data = {"emojis": emojis}
+    if version is not None:
+        data["version"] = version
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+class TestEmojiTable:
+
+    def setup_method(self):
+        """Remember the table in use so tests can swap it."""
+        self.original = get_emoji_table()
+
+    def teardown_method(self):
+        """Restore the original table."""
+        set_emoji_table(self.original)
+
+    def test_builtin_table(self):
+        """Test that the built-in table is in use by default."""
+        assert self.original.version == BUILTIN_TABLE_VERSION
+        assert "😍" in self.original
+
+    def test_heart_variants_share_an_entry(self):
+        """Test that both heart representations map to the entry of the selector variant."""
+        table = EmojiTable({"❤️": (0.5, 0, 0.5)}, "v1")
+        assert table.scores["❤"] == table.scores["❤️"] == (0.5, 0.0, 0.5)
+
+    def test_invalid_scores(self):
+        """Test that malformed scores are rejected."""
+        with pytest.raises(ValueError):
+            EmojiTable({"😍": (0.9, 0.1)})
+        with pytest.raises(ValueError):
+            EmojiTable({"😍": (1.5, 0, 0)})
+
+    def test_load_versions(self, tmp_path):
+        """Test explicit versions and content-hash versions of table files."""
+        path = tmp_path / "emojis.json"
+        write_table(path, {"😍": [0.9, 0, 0.1]}, version="2024-06-01")
+        assert load_emoji_table(path).version == "2024-06-01"
+
+        write_table(path, {"😍": [0.9, 0, 0.1]})
+        first = load_emoji_table(path).version
+        write_table(path, {"😍": [0.1, 0, 0.9]})
+        assert load_emoji_table(path).version != first
+
+        path.write_text("not json", encoding="utf-8")
+        with pytest.raises(ValueError):
+            load_emoji_table(path)
+
+    def test_load_drops_sequences(self, tmp_path, caplog):
+        """Test that keys that aren't single emojis are dropped with a warning."""
+        path = tmp_path / "emojis.json"
+        write_table(path, {"😍": [0.9, 0, 0.1], "👍🏽": [0.9, 0, 0.1]}, version="v1")
+        table = load_emoji_table(path)
+
+        assert table.dropped == ("👍🏽",)
+        assert "👍🏽" not in table
+        assert "Dropped 1 emoji table key" in caplog.text
+
+    def test_scores_use_swapped_table(self):
+        """Test that emoji scores follow the table in use."""
+        set_emoji_table(EmojiTable({"🦄": (0, 1, 0)}, "v2"))
+        assert get_emoji_sentiment_scores("🦄")["neg"] == 1
+        assert get_emoji_sentiment_scores("😍")["pos"] == 0
+
+    def test_cache_invalidated_on_swap(self):
+        """Test that cached results of an older table aren't served."""
+        analyzer = SentimentAnalyzer()
+        assert analyzer.analyze_comment("🦄")["sentiment"] == "neutral"
+
+        set_emoji_table(EmojiTable({"🦄": (0, 0.9, 0.1)}, "v2"))
+        assert analyzer.analyze_comment("🦄")["sentiment"] == "negative"
+        assert analyzer.get_cache_stats()["stale"] == 1
+
+        # Results of the current table are cached again
+        analyzer.analyze_comment("🦄")
+        assert analyzer.get_cache_stats()["hits"] == 1
+
+    def test_watcher_reloads_changed_file(self, tmp_path):
+        """Test that the watcher swaps in changed files and survives broken ones."""
+        path = tmp_path / "emojis.json"
+        write_table(path, {"🦄": [0.9, 0, 0.1]}, version="v1")
+        watcher = EmojiTableWatcher(str(path), interval=60)
+
+        assert watcher.check()
+        assert get_emoji_table().version == "v1"
+        assert not watcher.check()
+
+        path.write_text("{broken", encoding="utf-8")
+        os.utime(path, ns=(1, 1))
+        assert not watcher.check()
+        assert watcher.last_error is not None
+        assert get_emoji_table().version == "v1"
+
+        write_table(path, {"🦄": [0, 0.9, 0.1]}, version="v2")
+        assert watcher.check()
+        assert get_emoji_table().version == "v2"
+
+
+class TestAdminEmojiTable:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = TestClient(app)
+        self.original = get_emoji_table()
+
+    def teardown_method(self):
+        """Restore the original table."""
+        set_emoji_table(self.original)
+
+    def test_admin_disabled_without_token(self, monkeypatch):
+        """Test that admin endpoints are off unless ADMIN_TOKEN is set."""
+        monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+        assert self.client.get("/admin/emoji-table").status_code == 403
+
+    def test_reload_endpoint(self, tmp_path, monkeypatch):
+        """Test reloading the table through the admin endpoint."""
+        path = tmp_path / "emojis.json"
+        write_table(path, {"🦄": [0.9, 0, 0.1]}, version="v7")
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        monkeypatch.setenv("EMOJI_TABLE_PATH", str(path))
+
+        assert self.client.post("/admin/emoji-table/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+        response = self.client.post("/admin/emoji-table/reload", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 200
+        assert response.json() == {"version": "v7", "size": 1, "dropped": 0, "path": str(path)}
+
+        info = self.client.get("/admin/emoji-table", headers={"X-Admin-Token": "secret"})
+        assert info.json()["version"] == "v7"
+
+    def test_reload_reports_dropped_keys(self, tmp_path, monkeypatch):
+        """Test that keys that can't be scored are counted in the reload response."""
+        path = tmp_path / "emojis.json"
+        write_table(path, {"☺️": [0.8, 0, 0.2], "🤷‍♀️": [0, 1, 0], "ok": [1, 0, 0]}, version="v8")
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        monkeypatch.setenv("EMOJI_TABLE_PATH", str(path))
+
+        response = self.client.post("/admin/emoji-table/reload", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 200
+        assert response.json()["dropped"] == 2
+        assert get_emoji_sentiment_scores("☺️ nice")["pos"] == 0.8
+
+        # A table none of whose keys can be scored is rejected
+        write_table(path, {"🤷‍♀️": [0, 1, 0]}, version="v9")
+        response = self.client.post("/admin/emoji-table/reload", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 400
+        assert get_emoji_table().version == "v8"
+
+    def test_reload_invalid_file(self, tmp_path, monkeypatch):
+        """Test that a broken file is rejected and the current table kept."""
+        path = tmp_path / "emojis.json"
+        path.write_text("{}", encoding="utf-8")
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        monkeypatch.setenv("EMOJI_TABLE_PATH", str(path))
+
+        response = self.client.post("/admin/emoji-table/reload", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 400
+        assert get_emoji_table() is self.original
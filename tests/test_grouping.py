@@ -0,0 +1,114 @@
+import io
+import os
+import sys
+from pathlib import Path
+
+import nltk
+import pandas as pd
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.api.app import app
+
+
+class TestGroupSummaryStats:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.analyzer = SentimentAnalyzer()
+
+    def test_matches_per_group_summaries(self):
+        """Test that grouped stats equal summaries computed on each group separately."""
+        comments = ["I love this!", "This is terrible", "Great job 😍", "Awful 😡", "It is a chair"]
+        posts = ["a", "b", "a", "b", "a"]
+        df = self.analyzer.analyze_comments(comments)
+
+        groups = self.analyzer.get_group_summary_stats(df, pd.DataFrame({"post": posts}))
+
+        assert [g["group"] for g in groups] == [{"post": "a"}, {"post": "b"}]
+        for group in groups:
+            mask = [p == group["group"]["post"] for p in posts]
+            expected = self.analyzer.get_summary_stats(df[mask])
+            for key, value in expected.items():
+                assert group["summary"][key] == value or abs(group["summary"][key] - value) < 1e-9
+
+    def test_multiple_columns_and_missing_values(self):
+        """Test grouping by several columns, with missing values kept as their own group."""
+        df = self.analyzer.analyze_comments(["good", "bad", "fine", "ok"])
+        groups = pd.DataFrame({"post": [1, 1, 2, 2], "day": ["mon", None, "mon", "mon"]})
+
+        result = self.analyzer.get_group_summary_stats(df, groups)
+
+        keys = [(g["group"]["post"], g["group"]["day"]) for g in result]
+        assert sorted(keys, key=str) == sorted([(1, "mon"), (1, None), (2, "mon")], key=str)
+        assert sum(g["summary"]["total_comments"] for g in result) == 4
+        assert all(type(g["group"]["post"]) is int for g in result)
+
+    def test_empty_results(self):
+        """Test that no groups are returned for empty results."""
+        assert self.analyzer.get_group_summary_stats(pd.DataFrame(), pd.DataFrame({"post": []})) == []
+
+
+class TestGroupByAPI:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = TestClient(app)
+
+    def test_analyze_group_by(self):
+        """Test per-group summaries on the batch endpoint."""
+        payload = {
+            "comments": ["I love this!", "This is terrible", "Great job"],
+            "columns": {"post_id": ["p1", "p2", "p1"]}
+        }
+        response = self.client.post("/sentiment/analyze?group_by=post_id", json=payload)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["results"] is None
+        assert [g["group"] for g in data["groups"]] == [{"post_id": "p1"}, {"post_id": "p2"}]
+        assert data["groups"][0]["summary"]["total_comments"] == 2
+        assert data["groups"][0]["summary"]["positive_comments"] == 2
+
+    def test_analyze_group_by_invalid_column(self):
+        """Test that unknown or misaligned group_by columns are rejected."""
+        unknown = self.client.post("/sentiment/analyze?group_by=day", json={"comments": ["hi"]})
+        assert unknown.status_code == 400
+
+        misaligned = self.client.post(
+            "/sentiment/analyze?group_by=day",
+            json={"comments": ["hi", "yo"], "columns": {"day": ["mon"]}}
+        )
+        assert misaligned.status_code == 400
+
+    def test_analyze_csv_group_by(self):
+        """Test per-group summaries on the CSV endpoint, skipping empty comments."""
+        csv_data = "comment,post_id,day\nI love this!,1,mon\n,1,mon\nThis is terrible,2,mon\nGreat job,1,tue\n"
+        response = self.client.post(
+            "/sentiment/analyze-csv?group_by=post_id&group_by=day",
+            files={"file": ("comments.csv", io.BytesIO(csv_data.encode("utf-8")), "text/csv")}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["summary"]["total_comments"] == 3
+        assert [g["group"] for g in data["groups"]] == [
+            {"post_id": 1, "day": "mon"},
+            {"post_id": 1, "day": "tue"},
+            {"post_id": 2, "day": "mon"}
+        ]
+        assert [g["summary"]["total_comments"] for g in data["groups"]] == [1, 1, 1]
+
+    def test_analyze_csv_group_by_unknown_column(self):
+        """Test that grouping by a column the CSV doesn't have is rejected."""
+        response = self.client.post(
+            "/sentiment/analyze-csv?group_by=post_id",
+            files={"file": ("comments.csv", io.BytesIO(b"comment\nhello\n"), "text/csv")}
+        )
+        assert response.status_code == 400
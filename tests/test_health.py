@@ -0,0 +1,99 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import nltk
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.api.app import app
+from src.api.controllers import health_controller, sentiment_controller
+from src.api.controllers.health_controller import ReadinessState, load_warmup_comments, warm_up
+
+
+class TestHealthEndpoints:
+
+    def setup_method(self):
+        """Start every test from a fresh readiness state."""
+        self.original = health_controller.readiness
+        health_controller.readiness = ReadinessState()
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Restore the readiness state."""
+        health_controller.readiness = self.original
+
+    def test_health_always_ok(self):
+        """Test that liveness doesn't depend on warm-up."""
+        response = self.client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_not_ready_before_warm_up(self):
+        """Test that readiness is 503 until warm-up has finished."""
+        response = self.client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+        assert response.json()["status"] == "starting"
+
+    def test_ready_after_warm_up(self):
+        """Test that warm-up scores the sample comments and flips readiness."""
+        warm_up(str(project_root / "sample_comments.csv"))
+
+        response = self.client.get("/ready")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert data["warmup_comments"] == len(load_warmup_comments(str(project_root / "sample_comments.csv")))
+        assert data["load_seconds"] >= 0
+        assert data["warmup_seconds"] >= 0
+        assert data["cache"]["size"] > 0
+
+    def test_failed_warm_up(self, tmp_path):
+        """Test that a failing warm-up keeps the worker unready and reports why."""
+        warm_up(str(tmp_path / "missing.csv"))
+
+        response = self.client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "failed"
+        assert response.json()["error"]
+
+    def test_warm_up_can_be_skipped(self):
+        """Test that an empty warm-up path only builds the analyzer."""
+        warm_up("")
+        assert health_controller.readiness.ready
+        assert health_controller.readiness.warmup_comments == 0
+
+    def test_shared_use_case_built_once(self, monkeypatch):
+        """Test that concurrent first callers share one use case instead of each building one."""
+        built = []
+
+        class SlowUseCase:
+            def __init__(self, **kwargs):
+                time.sleep(0.05)
+                built.append(self)
+
+        monkeypatch.setattr(sentiment_controller, "SentimentAnalyzerUseCase", SlowUseCase)
+        sentiment_controller._build_sentiment_analyzer_use_case.cache_clear()
+        try:
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(sentiment_controller.get_sentiment_analyzer_use_case()))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sentiment_controller._build_sentiment_analyzer_use_case.cache_clear()
+
+        assert len(built) == 1
+        assert all(result is built[0] for result in results)
@@ -0,0 +1,141 @@
+import os
+import random
+import sys
+from pathlib import Path
+
+import nltk
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.emoji_utils import EmojiTable
+from src.sentiment_analysis.insights import SentimentInsights
+from src.api.app import app
+
+
+class TestSentimentInsights:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.insights = SentimentInsights(top_k=3, emoji_weight=0.5)
+
+    def test_top_k_matches_full_sort(self):
+        """Test that batched heap updates keep exactly the global extremes."""
+        rng = random.Random(0)
+        comments = [f"comment {i}" for i in range(500)]
+        compounds = [rng.uniform(-1, 1) for _ in comments]
+        for start in range(0, len(comments), 37):
+            stop = start + 37
+            self.insights.update(comments[start:stop], compounds[start:stop], [[]] * len(comments[start:stop]))
+
+        ranked = sorted(zip(compounds, comments))
+        assert [c["comment"] for c in self.insights.most_positive()] == [c for _, c in ranked[::-1][:3]]
+        assert [c["comment"] for c in self.insights.most_negative()] == [c for _, c in ranked[:3]]
+
+    def test_ties_keep_earliest_comments(self):
+        """Test that equal scores keep the comments seen first."""
+        self.insights.update(["a", "b", "c", "d"], [0.5, 0.5, 0.5, 0.5], [[], [], [], []])
+        assert [c["comment"] for c in self.insights.most_positive()] == ["a", "b", "c"]
+
+    def test_ties_at_boundary(self):
+        """Test that ties at the K-th score keep the earliest comments, however the batches are split."""
+        rng = random.Random(1)
+        comments = [f"comment {i}" for i in range(200)]
+        compounds = [rng.choice([-0.5, 0.5]) for _ in comments]
+        compounds[150] = 0.9
+        compounds[120] = -0.9
+        expected_positive = ["comment 150"] + [c for c, s in zip(comments, compounds) if s == 0.5][:2]
+        expected_negative = ["comment 120"] + [c for c, s in zip(comments, compounds) if s == -0.5][:2]
+
+        for size in (200, 64, 7):
+            insights = SentimentInsights(top_k=3)
+            for start in range(0, len(comments), size):
+                stop = start + size
+                insights.update(comments[start:stop], compounds[start:stop], [[]] * len(comments[start:stop]))
+            assert [c["comment"] for c in insights.most_positive()] == expected_positive
+            assert [c["comment"] for c in insights.most_negative()] == expected_negative
+
+    def test_emoji_stats(self):
+        """Test emoji occurrences, comment counts and score contributions."""
+        self.insights.update(
+            ["😍😍 wow", "😡 no", "😍 and 😡", "🦄"],
+            [0.8, -0.6, 0.0, 0.0],
+            [["😍", "😍"], ["😡"], ["😍", "😡"], ["🦄"]]
+        )
+        stats = {s["emoji"]: s for s in self.insights.emoji_stats()}
+
+        assert self.insights.emoji_stats()[0]["emoji"] == "😍"
+        assert stats["😍"]["count"] == 3
+        assert stats["😍"]["comments"] == 2
+        assert stats["😍"]["average_compound"] == pytest.approx(0.4)
+        # Each comment's emoji component (0.5 * lexicon compound) is shared by its known emojis
+        assert stats["😍"]["contribution"] == pytest.approx(0.5 * 0.9 + 0.5 * 0.9 / 2)
+        assert stats["😡"]["contribution"] == pytest.approx(-0.5 * 0.9 - 0.5 * 0.9 / 2)
+        assert stats["🦄"]["contribution"] == 0
+        assert len(self.insights.emoji_stats(limit=2)) == 2
+
+    def test_analyzer_updates_insights(self):
+        """Test that the analyzer feeds results into an insights accumulator."""
+        analyzer = SentimentAnalyzer()
+        insights = SentimentInsights(top_k=1)
+        analyzer.analyze_comments(["I love this 😍", "I hate this 😡", "It is a chair"], insights=insights)
+
+        assert insights.most_positive()[0]["comment"] == "I love this 😍"
+        assert insights.most_negative()[0]["comment"] == "I hate this 😡"
+        assert {s["emoji"] for s in insights.emoji_stats()} == {"😍", "😡"}
+
+    def test_emoji_only_contribution(self):
+        """Test that emoji-only comments, scored from their emojis alone, count at full weight."""
+        analyzer = SentimentAnalyzer(emoji_weight=0.3)
+        comments = ["😍", "😍😍", "great 😍"]
+        insights = SentimentInsights(top_k=1, emoji_weight=0.3)
+        results = analyzer.analyze_comments(comments, insights=insights)
+        contribution = insights.emoji_stats()[0]["contribution"]
+
+        # The emoji-only comments' compounds are their emoji scores; "great 😍" gets 0.3 of it
+        assert contribution == pytest.approx(0.9 + 0.9 + 0.3 * 0.9)
+        assert contribution == pytest.approx(results["compound"][0] + results["compound"][1] + 0.3 * 0.9)
+
+        # Cached results are attributed the same way
+        cached = SentimentInsights(top_k=1, emoji_weight=0.3)
+        analyzer.analyze_comments(comments, insights=cached)
+        assert cached.emoji_stats() == insights.emoji_stats()
+
+    def test_contribution_uses_scoring_table(self):
+        """Test that contributions use the table the batch was scored with, not the current one."""
+        table = EmojiTable({"🦄": (1, 0, 0)}, version="unicorns")
+        self.insights.update(["🦄"], [1.0], [["🦄"]], [1.0], table)
+
+        assert self.insights.emoji_stats()[0]["contribution"] == pytest.approx(1.0)
+
+
+class TestInsightsAPI:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = TestClient(app)
+
+    def test_analyze_top_k(self):
+        """Test that insights are returned without detailed results."""
+        response = self.client.post(
+            "/sentiment/analyze?top_k=1",
+            json={"comments": ["Amazing, I love it! 😍", "Awful, I hate it 😡", "ok"]}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["results"] is None
+        assert data["insights"]["most_positive"][0]["comment"] == "Amazing, I love it! 😍"
+        assert data["insights"]["most_negative"][0]["comment"] == "Awful, I hate it 😡"
+        assert len(data["insights"]["emojis"]) == 2
+
+    def test_insights_disabled_by_default(self):
+        """Test that insights are only computed when requested."""
+        response = self.client.post("/sentiment/analyze", json={"comments": ["nice"]})
+        assert response.json()["insights"] is None
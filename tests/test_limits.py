@@ -0,0 +1,202 @@
+import gzip
+import json
+import io
+import os
+import sys
+from pathlib import Path
+
+import nltk
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.api.app import app
+from src.api.controllers.sentiment_controller import get_sentiment_analyzer_use_case
+from src.api.middleware.compression import CompressionMiddleware
+from src.api.middleware.limits import BodySizeLimitMiddleware
+from src.api.models.sentiment_models import CommentRequest
+from src.api.use_cases.sentiment_analyzer_use_case import SentimentAnalyzerUseCase
+
+
+def make_limited_app(max_body_size):
+    limited = FastAPI()
+
+    @limited.post("/echo")
+    async def echo(request: CommentRequest):
+        return {"comments": len(request.comments)}
+
+    limited.add_middleware(BodySizeLimitMiddleware, max_body_size=max_body_size)
+    limited.add_middleware(CompressionMiddleware)
+    return limited
+
+
+class TestBodySizeLimit:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = TestClient(make_limited_app(100))
+
+    def test_small_body_passes(self):
+        """Test that bodies within the limit reach the endpoint."""
+        response = self.client.post("/echo", json={"comments": ["hi"]})
+        assert response.status_code == 200
+        assert response.json() == {"comments": 1}
+
+    def test_declared_length_rejected(self):
+        """Test that an oversized Content-Length is rejected with 413."""
+        response = self.client.post("/echo", json={"comments": ["x" * 200]})
+        assert response.status_code == 413
+
+    def test_decompressed_size_counted(self):
+        """Test that compressed bodies are limited by their decompressed size."""
+        body = gzip.compress(json.dumps({"comments": ["x" * 500]}).encode("utf-8"))
+        assert len(body) < 100
+        response = self.client.post(
+            "/echo",
+            content=body,
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        )
+        assert response.status_code == 413
+
+    def test_json_variants_limited(self):
+        """Test that +json media types and bodies without a Content-Type, which FastAPI parses as JSON, are limited."""
+        body = json.dumps({"comments": ["x" * 200]}).encode("utf-8")
+        for content_type in ("application/vnd.api+json", "application/merge-patch+json; charset=utf-8", None):
+            headers = {"Content-Type": content_type} if content_type else {}
+            response = self.client.post("/echo", content=body, headers=headers)
+            assert response.status_code == 413, content_type
+
+        small = json.dumps({"comments": ["hi"]}).encode("utf-8")
+        response = self.client.post("/echo", content=small, headers={"Content-Type": "application/vnd.api+json"})
+        assert response.status_code == 200
+
+    def test_other_content_types_not_limited(self):
+        """Test that uploads aren't subject to the JSON body limit."""
+        limited = FastAPI()
+
+        @limited.post("/raw")
+        async def raw():
+            return {"ok": True}
+
+        client = TestClient(BodySizeLimitMiddleware(limited, max_body_size=10))
+        response = client.post("/raw", content=b"x" * 100, headers={"Content-Type": "text/csv"})
+        assert response.status_code == 200
+
+
+class TestCommentLimits:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = TestClient(app)
+
+    def test_too_many_comments(self, monkeypatch):
+        """Test the maximum number of comments per request."""
+        monkeypatch.setenv("MAX_COMMENTS_PER_REQUEST", "3")
+        response = self.client.post("/sentiment/analyze", json={"comments": ["a", "b", "c", "d"]})
+        assert response.status_code == 413
+
+        response = self.client.post("/sentiment/analyze", json={"comments": ["a", "b", "c"]})
+        assert response.status_code == 200
+
+    def test_comment_too_long(self, monkeypatch):
+        """Test the maximum comment length."""
+        monkeypatch.setenv("MAX_COMMENT_LENGTH", "10")
+        response = self.client.post("/sentiment/analyze", json={"comments": ["short", "x" * 11]})
+        assert response.status_code == 422
+        assert "Comment 1" in response.json()["detail"]
+
+    def post_csv(self, rows, **params):
+        csv_data = "comment,post_id\n" + "".join(f"{comment},{post}\n" for comment, post in rows)
+        return self.client.post(
+            "/sentiment/analyze-csv",
+            params=params,
+            files={"file": ("comments.csv", io.BytesIO(csv_data.encode("utf-8")), "text/csv")}
+        )
+
+    def test_csv_limits(self, monkeypatch):
+        """Test that CSV uploads get the same comment count and length limits, empty rows aside."""
+        monkeypatch.setenv("MAX_COMMENTS_PER_REQUEST", "3")
+        monkeypatch.setenv("MAX_COMMENT_LENGTH", "10")
+        assert self.post_csv([("a", 1), ("", 1), ("b", 1), ("c", 1)]).status_code == 200
+        assert self.post_csv([("a", 1), ("b", 1), ("c", 1), ("d", 1)]).status_code == 413
+
+        response = self.post_csv([("short", 1), ("", 1), ("x" * 11, 1)])
+        assert response.status_code == 422
+        assert "Comment 1" in response.json()["detail"]
+
+        # Approximate mode samples files of any size but still limits comment lengths
+        assert self.post_csv([(c, 1) for c in "abcdef"], approximate="true").status_code == 200
+        assert self.post_csv([("x" * 11, 1)], approximate="true").status_code == 422
+
+    def test_csv_limits_across_chunks(self, monkeypatch):
+        """Test that limits are checked chunk by chunk, with group types inferred over the whole file."""
+        use_case = SentimentAnalyzerUseCase(chunk_size=2)
+        app.dependency_overrides[get_sentiment_analyzer_use_case] = lambda: use_case
+        try:
+            monkeypatch.setenv("MAX_COMMENTS_PER_REQUEST", "5")
+            assert self.post_csv([("a", 1)] * 6).status_code == 413
+
+            monkeypatch.setenv("MAX_COMMENT_LENGTH", "10")
+            response = self.post_csv([("a", 1), ("b", 1), ("c", 1), ("x" * 11, 1)])
+            assert "Comment 3" in response.json()["detail"]
+
+            # "x" makes the whole column strings, though the first chunk is all numbers
+            response = self.post_csv([("a", 7), ("b", 7), ("c", 7), ("d", "x")], group_by="post_id")
+            assert response.status_code == 200
+            groups = response.json()["groups"]
+            assert [g["group"]["post_id"] for g in groups] == ["7", "x"]
+            assert groups[0]["summary"]["total_comments"] == 3
+        finally:
+            app.dependency_overrides.pop(get_sentiment_analyzer_use_case, None)
+
+
+class TestChunkedAnalysis:
+
+    def test_chunked_matches_unchunked(self):
+        """Test that chunked scoring gives the same response as a single pass."""
+        comments = ["I love it 😍", "Terrible", "It is a chair", "Great!!", "", "meh"] * 7
+        request = CommentRequest(comments=comments, columns={"post": [i % 3 for i in range(len(comments))]})
+
+        chunked = SentimentAnalyzerUseCase(chunk_size=4).analyze_comments(request, True, ["post"], 2)
+        single = SentimentAnalyzerUseCase(chunk_size=1000).analyze_comments(request, True, ["post"], 2)
+
+        assert chunked.model_dump() == single.model_dump()
+        assert len(chunked.results) == len(comments)
+
+    def test_streamed_matches_unchunked(self):
+        """Test that streamed detailed responses have the same content as a single pass."""
+        comments = ["I love it 😍", "Terrible", "It is a chair", "Great!!", "", "meh"] * 7
+        request = CommentRequest(comments=comments, columns={"post": [i % 3 for i in range(len(comments))]})
+
+        streamed = SentimentAnalyzerUseCase(chunk_size=4).analyze_comments_stream(request, ["post"], 2)
+        pieces = list(streamed)
+        single = SentimentAnalyzerUseCase(chunk_size=1000).analyze_comments(request, True, ["post"], 2)
+
+        # One piece to open the results array, one per chunk and one for the summary
+        assert len(pieces) == 2 + len(range(0, len(comments), 4))
+        assert json.loads(b"".join(pieces)) == json.loads(single.model_dump_json())
+
+    def test_large_detailed_requests_streamed(self):
+        """Test that the endpoint streams detailed responses of more than one chunk."""
+        use_case = SentimentAnalyzerUseCase(chunk_size=2)
+        app.dependency_overrides[get_sentiment_analyzer_use_case] = lambda: use_case
+        try:
+            client = TestClient(app)
+            payload = {"comments": ["I love it", "Terrible", "Okay"], "columns": {"post": [1, 2, 1]}}
+            response = client.post("/sentiment/analyze?include_details=true&group_by=post", json=payload)
+            assert response.status_code == 200
+            assert "content-length" not in response.headers
+            assert response.headers["etag"]
+            assert len(response.json()["results"]) == 3
+            assert len(response.json()["groups"]) == 2
+            assert len(use_case.response_cache) == 0
+
+            response = client.post("/sentiment/analyze?include_details=true&group_by=missing", json=payload)
+            assert response.status_code == 400
+        finally:
+            app.dependency_overrides.pop(get_sentiment_analyzer_use_case, None)
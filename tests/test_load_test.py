@@ -0,0 +1,71 @@
+import pytest
+import asyncio
+import json
+import random
+import sys
+from pathlib import Path
+
+import httpx
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from load_test import (
+    load_payloads,
+    parse_batch_sizes,
+    percentile,
+    run_load,
+    synthesize_payload
+)
+from src.api.app import app
+
+
+class TestLoadTest:
+
+    def test_parse_batch_sizes(self):
+        """Test parsing batch-size distributions."""
+        assert parse_batch_sizes("1:0.6,10:0.3,100:0.1") == ([1, 10, 100], [0.6, 0.3, 0.1])
+        assert parse_batch_sizes("5") == ([5], [1.0])
+        with pytest.raises(ValueError):
+            parse_batch_sizes("0:1")
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) == 0.0
+
+    def test_load_payloads(self, tmp_path):
+        """Test loading payloads from a JSONL file."""
+        path = tmp_path / "payloads.jsonl"
+        path.write_text(
+            json.dumps({"comments": ["Nice!"]}) + "\n\n"
+            + json.dumps({"comments": ["Bad", "Ok"], "include_details": True}) + "\n"
+        )
+
+        assert load_payloads(str(path)) == [({"comments": ["Nice!"]}, False), ({"comments": ["Bad", "Ok"]}, True)]
+
+    def test_synthesize_payload(self):
+        """Test that synthesized payloads follow the batch-size distribution."""
+        rng = random.Random(0)
+        payload, include_details = synthesize_payload(["a", "b"], [3], [1.0], rng)
+
+        assert len(payload["comments"]) == 3
+        assert include_details is False
+
+    def test_run_load(self):
+        """Test a short run against the app in-process."""
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await run_load(client, lambda: ({"comments": ["Great post!"]}, False), rps=20, duration=0.5)
+
+        report = asyncio.run(run())
+
+        assert report["requests"] == 10
+        assert report["errors"] == 0
+        assert report["latency_ms"]["p50"] > 0
@@ -0,0 +1,75 @@
+import pytest
+import sys
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.cache import ResultCache
+from src.sentiment_analysis.normalization import normalize_comment
+
+
+class TestNormalization:
+
+    def setup_method(self):
+        """Set up the test environment before each test method."""
+        self.analyzer = SentimentAnalyzer()
+
+    def test_normalize_comment(self):
+        """Test canonicalizing Instagram-specific noise."""
+        assert normalize_comment("@john sooooo gooood https://t.co/abc") == "soo good"
+        assert normalize_comment("WOW!!!!!!!! why??????") == "WOW!!!! why????"
+        assert normalize_comment("🔥🔥🔥🔥🔥") == "🔥🔥🔥"
+        assert normalize_comment("❤️❤️❤️❤️") == "❤️❤️❤️"
+        assert normalize_comment("  Love   it  ") == "Love it"
+        assert normalize_comment("me@example.com") == "me@example.com"
+        assert normalize_comment("") == ""
+
+    def test_noise_variants_share_cache_entry(self):
+        """Test that comments differing only in noise are scored once."""
+        comments = [
+            "Love it!!! 🔥🔥🔥",
+            "@anna Love it!!! 🔥🔥🔥🔥🔥",
+            "Love   it!!! 🔥🔥🔥 https://instagram.com/p/xyz",
+        ]
+        results = self.analyzer.analyze_comments(comments)
+
+        assert results["compound"].nunique() == 1
+        assert sum(self.analyzer.get_route_stats().values()) == 1
+        # Emojis are still reported per original comment
+        assert len(results["emojis"][1]) == 5
+        assert list(results["comment"]) == comments
+
+    def test_cache_hits_across_calls(self):
+        """Test that repeated comments are served from the cache."""
+        first = self.analyzer.analyze_comment("This is amazing! I love it!")
+        second = self.analyzer.analyze_comment("This is amazing! I love it!")
+        stats = self.analyzer.get_cache_stats()
+
+        assert first == second
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.5)
+
+    def test_cache_disabled(self):
+        """Test that a zero-size cache never stores results."""
+        analyzer = SentimentAnalyzer(cache_size=0)
+        analyzer.analyze_comment("Great")
+        analyzer.analyze_comment("Great")
+
+        assert analyzer.get_cache_stats()["size"] == 0
+        assert analyzer.get_route_stats()["model"] == 2
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResultCache(maxsize=2)
+        cache.put("a", {"compound": 1})
+        cache.put("b", {"compound": 2})
+        cache.get("a")
+        cache.put("c", {"compound": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"compound": 1}
+        assert len(cache) == 2
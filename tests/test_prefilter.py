@@ -0,0 +1,92 @@
+import pytest
+import sys
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.prefilter import (
+    classify_comment,
+    ROUTE_EMPTY,
+    ROUTE_EMOJI_ONLY,
+    ROUTE_NOISE_ONLY,
+    ROUTE_NON_LATIN,
+    ROUTE_NO_LEXICON_MATCH,
+    ROUTE_MODEL
+)
+
+
+class TestPrefilter:
+
+    def setup_method(self):
+        """Set up the test environment before each test method."""
+        self.analyzer = SentimentAnalyzer()
+        self.analyzer_no_prefilter = SentimentAnalyzer(prefilter=False)
+        self.lexicon = self.analyzer.analyzer.lexicon
+
+    def test_classify_comment(self):
+        """Test routing comments to the cheapest adequate scorer."""
+        assert classify_comment("", self.lexicon) == ROUTE_EMPTY
+        assert classify_comment("   ", self.lexicon) == ROUTE_EMPTY
+        assert classify_comment(None, self.lexicon) == ROUTE_EMPTY
+        assert classify_comment("❤️❤️❤️", self.lexicon) == ROUTE_EMOJI_ONLY
+        assert classify_comment("🤷‍♀️ 👍🏻", self.lexicon) == ROUTE_EMOJI_ONLY
+        assert classify_comment("@john @mary!", self.lexicon) == ROUTE_NOISE_ONLY
+        assert classify_comment("#tbt https://example.com/p/123 😍", self.lexicon) == ROUTE_NOISE_ONLY
+        assert classify_comment("Привет мир", self.lexicon) == ROUTE_NON_LATIN
+        assert classify_comment("obrigado, que lindo!", self.lexicon) == ROUTE_NO_LEXICON_MATCH
+        assert classify_comment("This is amazing!", self.lexicon) == ROUTE_MODEL
+        # Emoticons are part of the VADER lexicon, whatever the script
+        assert classify_comment("Привет мир :)", self.lexicon) == ROUTE_MODEL
+
+    def test_prefilter_matches_full_vader(self):
+        """Test that skipping VADER doesn't change results for non-emoji-only comments."""
+        comments = [
+            "This is amazing! I love it!",
+            "obrigado, que lindo! 😍",
+            "me encanta",
+            "que horrible",
+            "@john @mary 👎",
+            "#tbt https://example.com",
+            "Привет мир",
+            "a",
+            "!!!"
+        ]
+
+        for comment in comments:
+            assert self.analyzer.analyze_comment(comment) == self.analyzer_no_prefilter.analyze_comment(comment)
+
+    def test_route_counters(self):
+        """Test that the analyzer counts how many comments each route handled."""
+        self.analyzer.analyze_comments(["", "😍😍", "#tbt", "This is great", "muito bom"])
+        stats = self.analyzer.get_route_stats()
+
+        assert stats[ROUTE_EMPTY] == 1
+        assert stats[ROUTE_EMOJI_ONLY] == 1
+        assert stats[ROUTE_NOISE_ONLY] == 1
+        assert stats[ROUTE_MODEL] == 1
+        assert stats[ROUTE_NO_LEXICON_MATCH] == 1
+        assert sum(stats.values()) == 5
+
+    def test_route_counters_with_reuse(self):
+        """Test that duplicates and cache hits count as reused instead of routed again."""
+        self.analyzer.analyze_comments(["This is great", "😍😍"])
+        self.analyzer.analyze_comments(["This is great", "This is great", "😍😍", "muito bom", "muito bom", ""])
+        stats = self.analyzer.get_route_stats()
+
+        # Each distinct text is scored once; the empty comment is never cached
+        assert stats[ROUTE_MODEL] == 1
+        assert stats[ROUTE_EMOJI_ONLY] == 1
+        assert stats[ROUTE_NO_LEXICON_MATCH] == 1
+        assert stats[ROUTE_EMPTY] == 1
+        assert self.analyzer.get_reuse_count() == 4
+        assert sum(stats.values()) + self.analyzer.get_reuse_count() == 8
+
+    def test_emoji_only_uses_emoji_table(self):
+        """Test that emoji-only comments are scored from the emoji table."""
+        result = self.analyzer.analyze_comment("❤️❤️❤️")
+
+        assert result["sentiment"] == "positive"
+        assert result["positive"] == pytest.approx(0.8)
@@ -0,0 +1,166 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import nltk
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.api.app import app
+from src.api.controllers.admin_controller import get_profiling_use_case
+from src.api.use_cases.profiling_use_case import ProfilingUseCase
+
+ADMIN_HEADERS = {"X-Admin-Token": "secret"}
+
+
+def busy_work():
+    return sum(i * i for i in range(200000))
+
+
+class TestProfilingUseCase:
+
+    def setup_method(self):
+        """Set up a fresh profiler for each test."""
+        self.profiler = ProfilingUseCase(top=10)
+
+    def teardown_method(self):
+        self.profiler.stop()
+
+    def test_invalid_options(self):
+        """Test that unknown modes and unbounded sessions are rejected."""
+        for kwargs in ({"mode": "perf"}, {"duration": 0, "max_requests": 0}):
+            try:
+                self.profiler.start(**kwargs)
+                assert False, "ValueError not raised"
+            except ValueError:
+                pass
+        assert self.profiler.session is None
+
+    def test_one_session_at_a_time(self):
+        """Test that a second session can't start while one is running."""
+        self.profiler.start(duration=60)
+        try:
+            self.profiler.start(duration=60)
+            assert False, "ValueError not raised"
+        except ValueError:
+            pass
+
+    def test_cprofile_report(self):
+        """Test that cProfile mode reports pstats and allocation sites."""
+        self.profiler.start(duration=60, mode="cprofile", memory=True)
+        busy_work()
+        report = self.profiler.stop()
+
+        assert self.profiler.session is None
+        assert report["mode"] == "cprofile"
+        assert "busy_work" in report["pstats"]
+        assert report["collapsed"] is None
+        assert isinstance(report["memory"], list)
+        assert len(report["memory"]) <= 10
+
+    def test_sample_report(self):
+        """Test that sample mode records collapsed stacks of the busy thread."""
+        self.profiler.start(duration=60, mode="sample", memory=False, interval=0.001)
+        deadline = time.perf_counter() + 0.2
+        while time.perf_counter() < deadline:
+            busy_work()
+        report = self.profiler.stop()
+
+        assert report["samples"] > 0
+        assert "test_profiling.py:busy_work" in report["collapsed"]
+        assert report["pstats"] is None
+        assert report["memory"] is None
+
+    def test_request_limit(self):
+        """Test that a session stops itself after its request limit."""
+        self.profiler.start(duration=0, max_requests=2)
+        self.profiler.request_finished()
+        assert self.profiler.status()["requests"] == 1
+        self.profiler.request_finished()
+
+        assert self.profiler.session is None
+        assert self.profiler.last_report["requests"] == 2
+
+    def test_duration_limit(self):
+        """Test that a session stops itself after its duration."""
+        self.profiler.start(duration=0.05)
+        deadline = time.time() + 5
+        while self.profiler.session is not None and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert self.profiler.session is None
+        assert self.profiler.last_report is not None
+
+
+class TestProfilingEndpoints:
+
+    def setup_method(self):
+        """Set up test client and a clean profiler."""
+        self.client = TestClient(app)
+        self.profiler = get_profiling_use_case()
+        self.profiler.stop()
+        self.profiler.last_report = None
+
+    def teardown_method(self):
+        self.profiler.stop()
+
+    def test_requires_admin_token(self, monkeypatch):
+        """Test that profiling is only available to admins."""
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        assert self.client.post("/admin/profile/start").status_code == 403
+        assert self.client.get("/admin/profile", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    def test_profile_requests(self, monkeypatch):
+        """Test profiling a fixed number of requests end to end."""
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        assert self.client.get("/admin/profile/report", headers=ADMIN_HEADERS).status_code == 404
+
+        response = self.client.post(
+            "/admin/profile/start?requests=2&duration=0&mode=cprofile", headers=ADMIN_HEADERS
+        )
+        assert response.status_code == 200
+        assert response.json()["active"] is True
+
+        for _ in range(2):
+            assert self.client.post("/sentiment/analyze", json={"comments": ["I love it 😍"]}).status_code == 200
+        # Admin requests are not counted, so the session stopped after the two analyses
+        status = self.client.get("/admin/profile", headers=ADMIN_HEADERS).json()
+        assert status["active"] is False
+        assert status["report_available"] is True
+
+        report = self.client.get("/admin/profile/report", headers=ADMIN_HEADERS).json()
+        assert report["requests"] == 2
+        assert "cumulative" in report["pstats"]
+        assert isinstance(report["memory"], list)
+        # No sampled stacks in cProfile mode
+        assert self.client.get("/admin/profile/collapsed", headers=ADMIN_HEADERS).status_code == 404
+
+    def test_stop_returns_collapsed_stacks(self, monkeypatch):
+        """Test stopping a sample session early and downloading its stacks."""
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        response = self.client.post("/admin/profile/start?duration=60&interval=0.001", headers=ADMIN_HEADERS)
+        assert response.status_code == 200
+        self.client.post("/sentiment/analyze", json={"comments": ["Great product"] * 200})
+        time.sleep(0.05)
+
+        report = self.client.post("/admin/profile/stop", headers=ADMIN_HEADERS).json()
+        assert report["mode"] == "sample"
+        assert report["samples"] > 0
+
+        collapsed = self.client.get("/admin/profile/collapsed", headers=ADMIN_HEADERS)
+        assert collapsed.status_code == 200
+        assert collapsed.headers["content-type"].startswith("text/plain")
+        assert collapsed.text == report["collapsed"]
+
+    def test_invalid_mode(self, monkeypatch):
+        """Test that an unknown mode is rejected."""
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        response = self.client.post("/admin/profile/start?mode=perf", headers=ADMIN_HEADERS)
+        assert response.status_code == 400
+        assert self.profiler.session is None
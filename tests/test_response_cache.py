@@ -0,0 +1,144 @@
+import os
+import sys
+from pathlib import Path
+
+import nltk
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.api.app import app
+from src.api.controllers.sentiment_controller import etag_matches, get_sentiment_analyzer_use_case
+from src.sentiment_analysis.cache import ResultCache
+from src.sentiment_analysis.emoji_utils import EmojiTable, get_emoji_table, set_emoji_table
+
+
+class TestResponseCache:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = TestClient(app)
+        self.use_case = get_sentiment_analyzer_use_case()
+        self.use_case.response_cache.clear()
+        self.use_case.not_modified = 0
+        self.payload = {"comments": ["I love this!", "This is terrible"]}
+
+    def test_repeated_request_served_from_cache(self):
+        """Test that identical requests share an ETag and the second one is a cache hit."""
+        first = self.client.post("/sentiment/analyze", json=self.payload)
+        second = self.client.post("/sentiment/analyze", json=self.payload)
+
+        assert first.status_code == second.status_code == 200
+        assert first.headers["etag"] == second.headers["etag"]
+        assert first.json() == second.json()
+        assert first.json()["summary"]["total_comments"] == 2
+        stats = self.use_case.response_cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_options_change_etag(self):
+        """Test that request options are part of the cache key."""
+        plain = self.client.post("/sentiment/analyze", json=self.payload)
+        detailed = self.client.post("/sentiment/analyze?include_details=true", json=self.payload)
+
+        assert plain.headers["etag"] != detailed.headers["etag"]
+        assert detailed.json()["results"] is not None
+
+    def test_if_none_match_returns_304(self):
+        """Test that a client holding the current ETag gets no body."""
+        etag = self.client.post("/sentiment/analyze", json=self.payload).headers["etag"]
+
+        response = self.client.post("/sentiment/analyze", json=self.payload, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        stale = self.client.post("/sentiment/analyze", json=self.payload, headers={"If-None-Match": '"other"'})
+        assert stale.status_code == 200
+
+    def test_compressed_response_etag(self):
+        """Test that compressed responses carry a weak ETag that still revalidates."""
+        payload = {"comments": [f"I love this! {i}" for i in range(50)]}
+        headers = {"Accept-Encoding": "gzip"}
+        first = self.client.post("/sentiment/analyze?include_details=true", json=payload, headers=headers)
+        identity = self.client.post("/sentiment/analyze?include_details=true", json=payload,
+                                    headers={"Accept-Encoding": "identity"})
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in first.headers["vary"]
+        etag = first.headers["etag"]
+        assert etag == "W/" + identity.headers["etag"]
+
+        response = self.client.post("/sentiment/analyze?include_details=true", json=payload,
+                                    headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert "Accept-Encoding" in response.headers["vary"]
+
+    def test_emoji_table_change_invalidates(self):
+        """Test that swapping the emoji table changes the ETag."""
+        original = get_emoji_table()
+        etag = self.client.post("/sentiment/analyze", json=self.payload).headers["etag"]
+        try:
+            set_emoji_table(EmojiTable({"😍": (0.9, 0, 0.1)}, "other"))
+            response = self.client.post("/sentiment/analyze", json=self.payload, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.headers["etag"] != etag
+        finally:
+            set_emoji_table(original)
+
+    def test_metrics_report_hit_rate(self):
+        """Test that the metrics endpoint exposes the response cache hit rate."""
+        self.client.post("/sentiment/analyze", json=self.payload)
+        self.client.post("/sentiment/analyze", json=self.payload)
+        etag = self.client.post("/sentiment/analyze", json=self.payload).headers["etag"]
+        self.client.post("/sentiment/analyze", json=self.payload, headers={"If-None-Match": etag})
+
+        metrics = self.client.get("/metrics").json()
+        assert metrics["response_cache"]["hit_rate"] == 2 / 3
+        assert metrics["response_cache"]["not_modified"] == 1
+        assert "hit_rate" in metrics["result_cache"]
+        assert isinstance(metrics["reused"], int)
+
+    def test_etag_matches(self):
+        """Test If-None-Match parsing."""
+        assert etag_matches('"a", "b"', '"b"')
+        assert etag_matches('W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches(None, '"b"')
+        assert not etag_matches('"a"', '"b"')
+
+    def test_evicted_by_size(self):
+        """Test that the cache is bounded by the total size of its bodies and skips large ones."""
+        cache = ResultCache(maxsize=100, max_bytes=250, max_entry_bytes=150)
+        for i in range(3):
+            cache.put(f"etag-{i}", bytes(100))
+
+        # The third body pushes the total past 250 bytes, evicting the oldest one
+        assert cache.get("etag-0") is None
+        assert cache.get("etag-1") == bytes(100)
+        assert cache.stats()["bytes"] == 200
+
+        cache.put("large", bytes(151))
+        assert cache.get("large") is None
+        assert cache.stats()["skipped"] == 1
+
+        # Replacing an entry counts only its new size
+        cache.put("etag-1", bytes(50))
+        assert cache.stats()["bytes"] == 150
+        assert len(cache) == 2
+
+    def test_large_responses_not_cached(self):
+        """Test that responses above the per-entry limit are served but not cached."""
+        self.use_case.response_cache.max_entry_bytes = 10
+        try:
+            response = self.client.post("/sentiment/analyze", json=self.payload)
+            assert response.status_code == 200
+            assert len(self.use_case.response_cache) == 0
+            assert self.use_case.response_cache.stats()["skipped"] == 1
+        finally:
+            self.use_case.response_cache.max_entry_bytes = 4 * 1024 * 1024
@@ -0,0 +1,186 @@
+import io
+import os
+import sys
+from pathlib import Path
+
+import nltk
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.sampling import (
+    finite_population_correction,
+    mean_margin,
+    proportion_margin,
+    required_sample_size,
+    reservoir_sample,
+    z_score
+)
+from src.api.app import app
+
+
+class TestSamplingHelpers:
+
+    def test_z_score(self):
+        """Test the normal critical values."""
+        assert z_score(0.95) == pytest.approx(1.96, abs=1e-3)
+        with pytest.raises(ValueError):
+            z_score(1.0)
+
+    def test_margins_shrink_to_zero_for_full_population(self):
+        """Test that sampling everything leaves no sampling error."""
+        assert finite_population_correction(100, 100) == 0
+        assert proportion_margin(0.3, 100, 100, 1.96) == 0
+        assert mean_margin(10.0, 5.0, 100, 100, 1.96) == 0
+
+    def test_proportion_margin(self):
+        """Test the margin of a proportion in a large population."""
+        margin = proportion_margin(0.5, 1000, 10 ** 9, 1.96)
+        assert margin == pytest.approx(1.96 * (0.25 / 1000) ** 0.5, rel=1e-6)
+
+    def test_required_sample_size(self):
+        """Test that the worst-case sample size meets the tolerance."""
+        size = required_sample_size(1.0, 0.95)
+        assert size == 9604
+        assert proportion_margin(0.5, size, 10 ** 9, z_score(0.95)) <= 0.01
+        assert required_sample_size(0, 0.95) is None
+
+    def test_reservoir_sample(self):
+        """Test that the reservoir is bounded and every item is equally likely to be kept."""
+        rng = np.random.default_rng(0)
+        kept = np.zeros(100)
+        for _ in range(2000):
+            chunks = (range(start, start + 7) for start in range(0, 98, 7))
+            sample, seen = reservoir_sample(list(chunks) + [range(98, 100)], 10, rng)
+            assert seen == 100
+            assert len(sample) == len(set(sample)) == 10
+            kept[sample] += 1
+        # Each item is kept with probability 0.1, i.e. about 200 times
+        assert kept.min() > 140 and kept.max() < 260
+
+    def test_reservoir_keeps_small_inputs(self):
+        """Test that inputs smaller than the reservoir are kept whole."""
+        sample, seen = reservoir_sample([[1, 2], [3]], 10, np.random.default_rng(0))
+        assert sorted(sample) == [1, 2, 3] and seen == 3
+        sample, seen = reservoir_sample([[1, 2], [3]], None, np.random.default_rng(0))
+        assert sample == [1, 2, 3] and seen == 3
+
+
+class TestEstimateSummaryStats:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.analyzer = SentimentAnalyzer()
+        self.comments = ["I love this!", "This is terrible", "It is a chair", "Great job"] * 1000
+
+    def test_early_stopping_within_tolerance(self):
+        """Test that sampling stops early and the estimate is within its error bounds."""
+        result = self.analyzer.estimate_summary_stats(self.comments, tolerance=3.0, random_state=0)
+        estimate = result["estimate"]
+        summary = result["summary"]
+
+        assert estimate["sampled_comments"] < len(self.comments)
+        assert not estimate["exact"]
+        assert max(estimate["margins"][k] for k in ("positive_percentage", "negative_percentage",
+                                                     "neutral_percentage")) <= 3.0
+        assert summary["total_comments"] == len(self.comments)
+        assert abs(summary["positive_percentage"] - 50) <= estimate["margins"]["positive_percentage"] * 1.5
+        assert abs(summary["negative_percentage"] - 25) <= estimate["margins"]["negative_percentage"] * 1.5
+
+    def test_zero_tolerance_is_exact(self):
+        """Test that a zero tolerance scores every comment and matches the full summary."""
+        comments = self.comments[:200]
+        result = self.analyzer.estimate_summary_stats(comments, tolerance=0, batch_size=64, random_state=1)
+        exact = self.analyzer.get_summary_stats(self.analyzer.analyze_comments(comments))
+
+        assert result["estimate"]["exact"]
+        assert result["estimate"]["margins"]["average_compound"] == 0
+        assert result["summary"]["positive_comments"] == exact["positive_comments"]
+        assert result["summary"]["average_compound"] == pytest.approx(exact["average_compound"])
+
+    def test_max_samples(self):
+        """Test that the sample size is capped."""
+        result = self.analyzer.estimate_summary_stats(self.comments, tolerance=0, max_samples=300)
+        assert result["estimate"]["sampled_comments"] == 300
+
+    def test_from_chunks(self):
+        """Test estimating from chunks without holding more than the sample in memory."""
+        chunks = (self.comments[start:start + 500] for start in range(0, len(self.comments), 500))
+        result = self.analyzer.estimate_summary_stats_from_chunks(chunks, tolerance=0, max_samples=300, random_state=0)
+        estimate = result["estimate"]
+
+        assert estimate["sampled_comments"] == 300
+        assert estimate["population"] == result["summary"]["total_comments"] == len(self.comments)
+        assert not estimate["exact"]
+        assert estimate["margins"]["positive_percentage"] > 0
+
+    def test_from_chunks_exact(self):
+        """Test that a zero tolerance without a cap reads every comment into the sample."""
+        comments = self.comments[:200]
+        chunks = [comments[:150], comments[150:]]
+        result = self.analyzer.estimate_summary_stats_from_chunks(chunks, tolerance=0, random_state=0)
+        exact = self.analyzer.get_summary_stats(self.analyzer.analyze_comments(comments))
+
+        assert result["estimate"]["exact"]
+        assert result["summary"]["positive_comments"] == exact["positive_comments"]
+
+
+class TestApproximateCSV:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = TestClient(app)
+
+    def test_approximate_csv(self):
+        """Test the approximate mode of the CSV endpoint."""
+        rows = ["I love this!", "This is terrible", "It is a chair", "Great job"] * 1000
+        csv_data = "comment\n" + "\n".join(rows) + "\n"
+        response = self.client.post(
+            "/sentiment/analyze-csv?approximate=true&tolerance=3",
+            files={"file": ("comments.csv", io.BytesIO(csv_data.encode("utf-8")), "text/csv")}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["results"] is None
+        assert data["summary"]["total_comments"] == 4000
+        assert data["estimate"]["sampled_comments"] < 4000
+        assert data["estimate"]["margins"]["positive_percentage"] <= 3
+
+    def test_approximate_rejects_group_by(self):
+        """Test that grouping can't be combined with approximate mode."""
+        response = self.client.post(
+            "/sentiment/analyze-csv?approximate=true&group_by=post_id",
+            files={"file": ("comments.csv", io.BytesIO(b"comment,post_id\nhi,1\n"), "text/csv")}
+        )
+        assert response.status_code == 400
+
+    def test_approximate_csv_in_chunks(self):
+        """Test that approximate mode samples the CSV while reading it in chunks."""
+        rows = ["I love this!", "", "This is terrible", "It is a chair"] * 3000
+        csv_data = "Comment\n" + "\n".join(f'"{row}"' if row else "" for row in rows) + "\n"
+        response = self.client.post(
+            "/sentiment/analyze-csv?approximate=true&tolerance=3&max_samples=500",
+            files={"file": ("comments.csv", io.BytesIO(csv_data.encode("utf-8")), "text/csv")}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["summary"]["total_comments"] == 9000
+        assert data["estimate"]["sampled_comments"] == 500
+
+    def test_approximate_csv_without_comments(self):
+        """Test the errors of approximate mode for CSV files without comments."""
+        for csv_data in (b"text\nhi\n", b"comment\n\n\n"):
+            response = self.client.post(
+                "/sentiment/analyze-csv?approximate=true",
+                files={"file": ("comments.csv", io.BytesIO(csv_data), "text/csv")}
+            )
+            assert response.status_code == 400
@@ -0,0 +1,213 @@
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+import nltk
+import pytest
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.api.use_cases.sentiment_analyzer_use_case import SentimentAnalyzerUseCase
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.sentiment_analysis.shared_cache import WAYS, SharedResultCache
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX shared memory and record locks only")
+
+COMMENTS = ["I love this! 😍", "This is terrible 😡", "It's okay", "🔥🔥", "", "@user nice", "meh 🤔"]
+
+
+def result_for(key):
+    """A result whose scores can be recomputed from its key, to detect torn reads."""
+    value = (sum(map(ord, key)) % 1000) / 1000
+    return {
+        "compound": value,
+        "positive": value / 2,
+        "negative": value / 3,
+        "neutral": value / 4,
+        "sentiment": "positive",
+        "emojis": []
+    }
+
+
+def hammer(name, lock_dir, worker, rounds, errors):
+    """Write and read overlapping keys from another process."""
+    cache = SharedResultCache(name, lock_dir=lock_dir)
+    for i in range(rounds):
+        key = f"comment {(i * 7 + worker) % 300}"
+        cache.put(key, result_for(key), "v1")
+        other = f"comment {(i * 13) % 300}"
+        cached = cache.get(other, "v1")
+        if cached is not None and cached != result_for(other):
+            errors.value += 1
+    cache.close()
+
+
+class TestSharedResultCache:
+
+    def setup_method(self):
+        """Use a unique segment name with its lock file in a temporary directory."""
+        self.name = f"sentiment-test-{uuid.uuid4().hex[:12]}"
+        self.lock_dir = tempfile.mkdtemp()
+        self.caches = []
+
+    def teardown_method(self):
+        if self.caches:
+            self.caches[0].unlink()
+        for cache in self.caches:
+            cache.close()
+        shutil.rmtree(self.lock_dir, ignore_errors=True)
+        # Left by caches opened with the default lock directory
+        default_lock = os.path.join(tempfile.gettempdir(), f"{self.name}.lock")
+        if os.path.exists(default_lock):
+            os.remove(default_lock)
+
+    def open_cache(self, capacity=1024):
+        cache = SharedResultCache(self.name, capacity, lock_dir=self.lock_dir)
+        self.caches.append(cache)
+        return cache
+
+    def test_put_and_get(self):
+        """Test that results round-trip through the packed slots."""
+        cache = self.open_cache()
+        result = {"compound": 0.6249, "positive": 0.5, "negative": 0, "neutral": 0.5, "sentiment": "positive", "emojis": ["😍"]}
+        cache.put("I love this! 😍", result, "v1")
+
+        assert cache.get("I love this! 😍", "v1") == result
+        assert cache.get("Something else", "v1") is None
+        assert len(cache) == 1
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["workers"] == 1
+
+    def test_version_mismatch(self):
+        """Test that results of another emoji table version are stale and overwritten."""
+        cache = self.open_cache()
+        cache.put("🔥", result_for("🔥"), "v1")
+
+        assert cache.get("🔥", "v2") is None
+        assert cache.stats()["stale"] == 1
+        cache.put("🔥", result_for("🔥"), "v2")
+        assert cache.get("🔥", "v2") == result_for("🔥")
+        assert len(cache) == 1
+
+    def test_attach_shares_entries(self):
+        """Test that a second instance attaches to the same table and keeps its capacity."""
+        first = self.open_cache(capacity=100)
+        first.put("shared comment", result_for("shared comment"), "v1")
+
+        second = self.open_cache(capacity=5000)
+        assert second.maxsize == first.maxsize == 104
+        assert second.get("shared comment", "v1") == result_for("shared comment")
+        assert first.stats()["hits"] == 1
+
+    def test_eviction(self):
+        """Test that a full bucket evicts its least recently accessed entry."""
+        cache = self.open_cache(capacity=WAYS)
+        keys = [f"comment {i}" for i in range(WAYS)]
+        for key in keys:
+            cache.put(key, result_for(key), "v1")
+        # Touch every entry but the first, so it's the least recently used one
+        for key in keys[1:]:
+            assert cache.get(key, "v1") is not None
+
+        cache.put("one more", result_for("one more"), "v1")
+        assert len(cache) == WAYS
+        assert cache.get(keys[0], "v1") is None
+        assert cache.get("one more", "v1") == result_for("one more")
+        assert cache.stats()["evictions"] == 1
+
+    def test_clear(self):
+        """Test that clearing empties the table and resets the statistics."""
+        cache = self.open_cache()
+        cache.put("a", result_for("a"), "v1")
+        cache.get("a", "v1")
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get("a", "v1") is None
+        assert cache.stats()["hits"] == 0
+
+    def test_invalid_arguments(self):
+        """Test rejecting unsafe names and empty caches."""
+        with pytest.raises(ValueError):
+            SharedResultCache("../etc/passwd", lock_dir=self.lock_dir)
+        with pytest.raises(ValueError):
+            SharedResultCache(self.name, 0, lock_dir=self.lock_dir)
+
+    def test_processes(self):
+        """Test concurrent writers and readers in several processes never see torn results."""
+        cache = self.open_cache(capacity=256)
+        context = multiprocessing.get_context("fork")
+        errors = context.Value("i", 0)
+        workers = [
+            context.Process(target=hammer, args=(self.name, self.lock_dir, worker, 2000, errors))
+            for worker in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            assert worker.exitcode == 0
+
+        assert errors.value == 0
+        stats = cache.stats()
+        # Each process counts into its own stats row
+        assert stats["workers"] == 4
+        assert stats["hits"] + stats["misses"] == 4 * 2000
+        assert stats["hits"] > 0
+        assert stats["evictions"] > 0
+
+    def test_analyzer_parity(self):
+        """Test that analyzers sharing the cache return what a private cache returns."""
+        expected = SentimentAnalyzer(cache_size=0).analyze_comments(COMMENTS)
+
+        first = SentimentAnalyzer(cache=self.open_cache())
+        assert first.analyze_comments(COMMENTS).equals(expected)
+
+        # Another worker's analyzer gets hits for comments it never scored
+        second = SentimentAnalyzer(cache=self.open_cache())
+        results = second.analyze_comments(COMMENTS)
+        assert results.to_dict("records") == expected.to_dict("records")
+        assert second.get_cache_stats()["hits"] == len(set(COMMENTS))
+        assert second.route_counts == {route: 0 for route in second.route_counts}
+
+    def test_use_case(self):
+        """Test that the use case uses the shared cache when it's given a name."""
+        use_case = SentimentAnalyzerUseCase(shared_cache_name=self.name, shared_cache_size=64)
+        self.caches.append(use_case.analyzer.cache)
+
+        assert isinstance(use_case.analyzer.cache, SharedResultCache)
+        assert use_case.get_cache_stats()["capacity"] == 64
+
+    def test_namespaces(self):
+        """Test that workers with different analyzer configurations don't serve each other's results."""
+        vader = SharedResultCache(self.name, lock_dir=self.lock_dir, namespace="weight=0.3")
+        weighted = SharedResultCache(self.name, lock_dir=self.lock_dir, namespace="weight=0.9")
+        self.caches += [vader, weighted]
+        vader.put("🔥", result_for("🔥"), "v1")
+
+        assert weighted.get("🔥", "v1") is None
+        assert weighted.stats()["stale"] == 1
+        assert vader.get("🔥", "v1") == result_for("🔥")
+
+    def test_use_case_configs(self):
+        """Test that use cases with different emoji weights sharing a segment score independently."""
+        first = SentimentAnalyzerUseCase(emoji_weight=0.3, shared_cache_name=self.name, shared_cache_size=64)
+        second = SentimentAnalyzerUseCase(emoji_weight=0.9, shared_cache_name=self.name)
+        self.caches += [first.analyzer.cache, second.analyzer.cache]
+
+        first.analyzer.analyze_comment("nice 😍")
+        result = second.analyzer.analyze_comment("nice 😍")
+        assert result == SentimentAnalyzer(emoji_weight=0.9, cache_size=0).analyze_comment("nice 😍")
+        assert second.get_cache_stats()["hits"] == 0
@@ -0,0 +1,69 @@
+import os
+import sys
+from pathlib import Path
+
+import nltk
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.sentiment_analysis.analyzer import SentimentAnalyzer
+from src.api.app import app
+
+
+class TestEmojiWeightSweep:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.analyzer = SentimentAnalyzer()
+        self.comments = pd.read_csv(project_root / "sample_comments.csv")["comment"].tolist() + [
+            "", None, "😍", "😍😍 love it", "@bob", "good 🦄", "meh 😐", "bad 😍"
+        ]
+
+    def test_matches_separate_analyzers(self):
+        """Test that each sweep row equals a full run with that emoji weight."""
+        weights = [0.0, 0.1, 0.3, 0.5, 0.9]
+        table = self.analyzer.sweep_emoji_weights(self.comments, weights)
+
+        assert table["emoji_weight"].tolist() == weights
+        for row in table.to_dict("records"):
+            analyzer = SentimentAnalyzer(emoji_weight=row["emoji_weight"])
+            expected = analyzer.get_summary_stats(analyzer.analyze_comments(self.comments))
+            for key, value in expected.items():
+                assert row[key] == pytest.approx(value)
+
+    def test_empty_comments(self):
+        """Test the sweep of an empty comment list."""
+        table = self.analyzer.sweep_emoji_weights([], [0.3])
+        assert table.iloc[0]["total_comments"] == 0
+
+
+class TestSweepAPI:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = TestClient(app)
+
+    def test_sweep_endpoint(self):
+        """Test the per-weight summary table endpoint."""
+        response = self.client.post(
+            "/sentiment/sweep?emoji_weights=0.1&emoji_weights=0.9",
+            json={"comments": ["meh 😍😍", "I hate it"]}
+        )
+
+        assert response.status_code == 200
+        configs = response.json()["configs"]
+        assert [c["emoji_weight"] for c in configs] == [0.1, 0.9]
+        assert all(c["total_comments"] == 2 for c in configs)
+        assert configs[0]["average_compound"] < configs[1]["average_compound"]
+
+    def test_sweep_rejects_invalid_weight(self):
+        """Test that weights outside 0-1 are rejected."""
+        response = self.client.post("/sentiment/sweep?emoji_weights=1.5", json={"comments": ["hi"]})
+        assert response.status_code == 400
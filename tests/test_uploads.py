@@ -0,0 +1,301 @@
+import csv
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import nltk
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.api.app import app
+from src.api.controllers.sentiment_controller import get_sentiment_analyzer_use_case
+from src.api.controllers.upload_controller import get_upload_use_case
+from src.api.use_cases.upload_use_case import UploadNotFoundError, UploadOrderError, UploadUseCase
+
+CHUNK_SIZE = 100
+
+
+def make_csv(n=60, header=("comment", "post_id"), bom=False):
+    comments = [
+        "I love this! 😍😍",
+        "Terrible,\nwould not buy again 😡",
+        "It's okay I guess",
+        "\"Best\" post ever 👏",
+        "",
+        "42",
+        "meh 🤔",
+    ]
+    output = io.StringIO(newline="")
+    writer = csv.writer(output)
+    writer.writerow(header)
+    for i in range(n):
+        writer.writerow((comments[i % len(comments)], f"post-{i % 3}"))
+    data = output.getvalue().encode("utf-8")
+    return b"\xef\xbb\xbf" + data if bom else data
+
+
+class TestUploads:
+
+    def setup_method(self):
+        """Set up test client with uploads kept in a temporary directory."""
+        self.upload_dir = Path(tempfile.mkdtemp())
+        self.uploads = self.make_use_case()
+        app.dependency_overrides[get_upload_use_case] = lambda: self.uploads
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        app.dependency_overrides.pop(get_upload_use_case, None)
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def make_use_case(self, **kwargs):
+        return UploadUseCase(
+            get_sentiment_analyzer_use_case(), upload_dir=str(self.upload_dir), chunk_size=CHUNK_SIZE, **kwargs
+        )
+
+    def create(self, data, **body):
+        response = self.client.post("/sentiment/uploads", json={"filename": "comments.csv", "size": len(data), **body})
+        assert response.status_code == 201
+        return response.json()
+
+    def put(self, status, index, data):
+        start = index * status["chunk_size"]
+        return self.client.put(
+            f"/sentiment/uploads/{status['upload_id']}/chunks/{index}",
+            content=data[start:start + status["chunk_size"]],
+            headers={"Content-Type": "application/octet-stream"}
+        )
+
+    def upload(self, data, **body):
+        status = self.create(data, **body)
+        for index in range(status["total_chunks"]):
+            assert self.put(status, index, data).status_code == 200
+        return status["upload_id"]
+
+    def analyze_csv(self, data, **params):
+        response = self.client.post(
+            "/sentiment/analyze-csv", params=params, files={"file": ("comments.csv", data, "text/csv")}
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    def test_matches_analyze_csv(self):
+        """Test that a chunked upload gives the /analyze-csv summary and /download-csv file."""
+        data = make_csv(bom=True)
+        upload_id = self.upload(data)
+
+        status = self.client.get(f"/sentiment/uploads/{upload_id}").json()
+        assert status["received_bytes"] == len(data)
+        assert status["total_chunks"] == -(-len(data) // CHUNK_SIZE)
+        # Complete records are scored as chunks arrive
+        assert status["scored_comments"] > 0
+
+        response = self.client.post(f"/sentiment/uploads/{upload_id}/finalize")
+        assert response.status_code == 200
+        expected = self.analyze_csv(data)
+        assert response.json()["summary"] == expected["summary"]
+        assert response.json()["results"] is None
+
+        download = self.client.get(f"/sentiment/uploads/{upload_id}/results.csv")
+        assert download.status_code == 200
+        assert download.headers["content-type"].startswith("text/csv")
+        assert download.content == self.client.post("/sentiment/download-csv", json=expected).content
+
+        # Finalizing again returns the same response
+        assert self.client.post(f"/sentiment/uploads/{upload_id}/finalize").json() == response.json()
+        assert self.client.get(f"/sentiment/uploads/{upload_id}").json()["complete"] is True
+
+    def test_insights(self):
+        """Test that insights accumulate across chunks."""
+        data = make_csv()
+        upload_id = self.upload(data, top_k=2)
+
+        response = self.client.post(f"/sentiment/uploads/{upload_id}/finalize").json()
+        assert response["insights"] == self.analyze_csv(data, top_k=2)["insights"]
+
+    def test_chunk_order(self):
+        """Test that chunks are accepted in order only, and resent chunks are ignored."""
+        data = make_csv()
+        status = self.create(data)
+
+        assert self.put(status, 0, data).status_code == 200
+        scored = self.put(status, 1, data).json()["scored_comments"]
+
+        response = self.put(status, 3, data)
+        assert response.status_code == 409
+        assert response.json()["next_chunk"] == 2
+
+        resent = self.put(status, 1, data)
+        assert resent.status_code == 200
+        assert resent.json()["next_chunk"] == 2
+        assert resent.json()["scored_comments"] == scored
+
+    def test_chunk_size(self):
+        """Test that chunks must have the exact size the session expects."""
+        data = make_csv()
+        status = self.create(data)
+        upload_url = f"/sentiment/uploads/{status['upload_id']}/chunks/0"
+
+        assert self.client.put(upload_url, content=data[:CHUNK_SIZE - 1]).status_code == 400
+        assert self.client.put(upload_url, content=data[:CHUNK_SIZE + 1]).status_code == 413
+        assert self.client.put(upload_url, content=data[:CHUNK_SIZE]).status_code == 200
+
+    def test_incomplete_upload(self):
+        """Test that finalize and download wait for every chunk."""
+        data = make_csv()
+        status = self.create(data)
+        self.put(status, 0, data)
+
+        response = self.client.post(f"/sentiment/uploads/{status['upload_id']}/finalize")
+        assert response.status_code == 400
+        assert "next chunk is 1" in response.json()["detail"]
+        assert self.client.get(f"/sentiment/uploads/{status['upload_id']}/results.csv").status_code == 409
+
+    def test_invalid_uploads(self):
+        """Test rejecting non-CSV files, oversized files and files without a comment column."""
+        assert self.client.post("/sentiment/uploads", json={"filename": "a.txt", "size": 10}).status_code == 400
+
+        self.uploads = self.make_use_case(max_upload_size=1000)
+        assert self.client.post("/sentiment/uploads", json={"filename": "a.csv", "size": 1001}).status_code == 413
+
+        data = make_csv(n=5, header=("text", "post_id"))
+        status = self.create(data)
+        response = self.put(status, 0, data)
+        assert response.status_code == 400
+        assert "'comment' or 'Comment' column" in response.json()["detail"]
+
+    def test_comment_length_limit(self):
+        """Test that uploaded comments are held to the maximum comment length."""
+        self.uploads = self.make_use_case(max_comment_length=5)
+        data = b"comment\nshort\nmuch too long\n"
+        status = self.create(data)
+        response = self.put(status, 0, data)
+
+        assert response.status_code == 400
+        assert "Comment 1 exceeds the maximum length" in response.json()["detail"]
+
+    def test_unknown_sessions(self):
+        """Test that unknown, malformed and deleted session IDs are not found."""
+        assert self.client.get(f"/sentiment/uploads/{'a' * 22}").status_code == 404
+        assert self.client.get("/sentiment/uploads/..%2F..%2Fetc").status_code == 404
+
+        status = self.create(make_csv())
+        assert self.client.delete(f"/sentiment/uploads/{status['upload_id']}").status_code == 204
+        assert self.client.get(f"/sentiment/uploads/{status['upload_id']}").status_code == 404
+        assert not (self.upload_dir / status["upload_id"]).exists()
+
+    def test_resume_after_restart(self):
+        """Test that an upload continues where it stopped with a new use case instance."""
+        data = make_csv()
+        status = self.create(data)
+        for index in range(3):
+            self.put(status, index, data)
+
+        # A restarted server only has what is on disk
+        self.uploads = self.make_use_case()
+        resumed = self.client.get(f"/sentiment/uploads/{status['upload_id']}").json()
+        assert resumed["next_chunk"] == 3
+        for index in range(3, resumed["total_chunks"]):
+            assert self.put(status, index, data).status_code == 200
+
+        response = self.client.post(f"/sentiment/uploads/{status['upload_id']}/finalize")
+        assert response.json()["summary"] == self.analyze_csv(data)["summary"]
+
+    def test_failed_chunk_is_rolled_back(self, monkeypatch):
+        """Test that rows of a chunk that failed to save are discarded when it is resent."""
+        data = make_csv()
+        status = self.uploads.create("comments.csv", len(data))
+        upload_id = status["upload_id"]
+        chunks = [data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+        self.uploads.put_chunk(upload_id, 0, chunks[0])
+
+        def failing_save(session):
+            raise OSError("Disk full")
+
+        save = self.uploads._save
+        monkeypatch.setattr(self.uploads, "_save", failing_save)
+        with pytest.raises(OSError):
+            self.uploads.put_chunk(upload_id, 1, chunks[1])
+        monkeypatch.setattr(self.uploads, "_save", save)
+
+        with pytest.raises(UploadOrderError):
+            self.uploads.put_chunk(upload_id, 2, chunks[2])
+        for index, chunk in enumerate(chunks[1:], start=1):
+            self.uploads.put_chunk(upload_id, index, chunk)
+
+        response = self.uploads.finalize(upload_id)
+        assert response.summary.model_dump() == self.analyze_csv(data)["summary"]
+        with open(self.uploads.results_path(upload_id), "rb") as f:
+            expected = self.client.post("/sentiment/download-csv", json=self.analyze_csv(data)).content
+            assert f.read() == expected
+
+    def test_expire_sessions(self):
+        """Test that inactive sessions are deleted."""
+        status = self.uploads.create("comments.csv", 10)
+        assert self.uploads.expire_sessions() == 0
+
+        old = time.time() - 2 * self.uploads.session_ttl
+        os.utime(self.upload_dir / status["upload_id"] / "state.json", (old, old))
+        assert self.uploads.expire_sessions() == 1
+        with pytest.raises(UploadNotFoundError):
+            self.uploads.status(status["upload_id"])
+
+    def test_state_is_json(self):
+        """Test that session state is stored as JSON, insights included, and survives a reload."""
+        data = make_csv()
+        status = self.create(data, top_k=2)
+        self.put(status, 0, data)
+
+        with open(self.upload_dir / status["upload_id"] / "state.json", encoding="utf-8") as f:
+            state = json.load(f)
+        assert state["next_chunk"] == 1
+        assert state["insights"]["top_k"] == 2
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX ownership checks only")
+    def test_private_upload_dir(self):
+        """Test that the upload root is made private and a symlinked root is refused."""
+        loose = self.upload_dir / "loose"
+        loose.mkdir(mode=0o777)
+        os.chmod(loose, 0o777)
+        UploadUseCase(get_sentiment_analyzer_use_case(), upload_dir=str(loose))
+        assert loose.stat().st_mode & 0o777 == 0o700
+
+        planted = self.upload_dir / "planted"
+        planted.symlink_to(loose)
+        with pytest.raises(PermissionError):
+            UploadUseCase(get_sentiment_analyzer_use_case(), upload_dir=str(planted))
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Needs fork")
+    def test_concurrent_workers(self):
+        """Test that workers sending the same chunks at once don't score records twice."""
+        data = make_csv()
+        status = self.uploads.create("comments.csv", len(data))
+        chunks = [data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+
+        def send_all():
+            # Each worker process has its own use case instance
+            uploads = self.make_use_case()
+            for index, chunk in enumerate(chunks):
+                uploads.put_chunk(status["upload_id"], index, chunk)
+
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=send_all) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            assert worker.exitcode == 0
+
+        response = self.uploads.finalize(status["upload_id"])
+        assert response.summary.model_dump() == self.analyze_csv(data)["summary"]
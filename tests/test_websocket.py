@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import nltk
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+nltk.data.path.insert(0, os.path.join(project_root, "nltk_data"))
+
+from src.api.app import app
+from src.api.controllers.sentiment_controller import sentiment_websocket
+
+
+class SlowUseCase:
+    """Use case stub whose scoring takes a while, to fill the message queue."""
+
+    def score_comments(self, comments):
+        time.sleep(0.02)
+        return []
+
+
+class FakeWebSocket:
+    """WebSocket whose client goes away after some replies or once its messages are sent."""
+
+    def __init__(self, count, replies=None):
+        self.messages = [json.dumps({"comment": f"comment {i}"}) for i in range(count)]
+        self.replies = replies
+        self.sent = []
+        self.late_sends = 0
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def receive_text(self):
+        if not self.messages:
+            self.closed = True
+            raise WebSocketDisconnect(1000)
+        return self.messages.pop(0)
+
+    async def send_json(self, data):
+        if self.replies is not None and len(self.sent) >= self.replies:
+            self.closed = True
+        if self.closed:
+            self.late_sends += 1
+            raise WebSocketDisconnect(1006)
+        self.sent.append(data)
+
+
+def run_session(websocket):
+    """Run a WebSocket session and return the reader tasks still alive once it ends."""
+    async def session():
+        await sentiment_websocket(websocket, SlowUseCase())
+        await asyncio.sleep(0)
+        return [task for task in asyncio.all_tasks() if task.get_coro().__name__ == "read_messages"]
+
+    return asyncio.run(asyncio.wait_for(session(), timeout=10))
+
+
+class TestSentimentWebSocket:
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = TestClient(app)
+
+    def test_single_comment_and_batch(self):
+        """Test scoring single comments and small batches over one session."""
+        with self.client.websocket_connect("/sentiment/ws") as ws:
+            ws.send_json({"id": "a1", "comment": "I love this! 😍"})
+            reply = ws.receive_json()
+            assert reply["id"] == "a1"
+            assert reply["results"][0]["sentiment"] == "positive"
+            assert reply["results"][0]["emojis"] == ["😍"]
+
+            ws.send_json({"id": "a2", "comments": ["This is terrible", "It is a chair"]})
+            reply = ws.receive_json()
+            assert reply["id"] == "a2"
+            assert [r["sentiment"] for r in reply["results"]] == ["negative", "neutral"]
+
+    def test_replies_in_order_with_default_ids(self):
+        """Test that pipelined messages are answered in order, numbered by position."""
+        with self.client.websocket_connect("/sentiment/ws") as ws:
+            for comment in ["good", "bad", "fine"]:
+                ws.send_json({"comment": comment})
+            assert [ws.receive_json()["id"] for _ in range(3)] == [0, 1, 2]
+
+    def test_invalid_messages(self):
+        """Test that invalid messages get an error reply and keep the session open."""
+        with self.client.websocket_connect("/sentiment/ws") as ws:
+            ws.send_text("not json")
+            assert "error" in ws.receive_json()
+
+            ws.send_json({"id": 7, "comments": [1, 2]})
+            reply = ws.receive_json()
+            assert reply["id"] == 7
+            assert "error" in reply
+
+            ws.send_json({"id": 8, "comment": "still works"})
+            assert "results" in ws.receive_json()
+
+    def test_message_limits(self, monkeypatch):
+        """Test that per-request limits apply to each message."""
+        monkeypatch.setenv("MAX_COMMENTS_PER_REQUEST", "2")
+        with self.client.websocket_connect("/sentiment/ws") as ws:
+            ws.send_json({"id": 1, "comments": ["a", "b", "c"]})
+            reply = ws.receive_json()
+            assert reply["id"] == 1
+            assert "Too many comments" in reply["error"]
+
+    def test_binary_frame(self):
+        """Test that a binary frame closes the session with 1003 instead of stalling it."""
+        with self.client.websocket_connect("/sentiment/ws") as ws:
+            ws.send_bytes(b"\x00\x01")
+            with pytest.raises(WebSocketDisconnect) as error:
+                ws.receive_json()
+            assert error.value.code == 1003
+
+    def test_disconnect_with_full_queue(self, monkeypatch):
+        """Test that a client leaving while the queue is full leaves no reader stuck on it."""
+        monkeypatch.setenv("WS_MAX_PENDING_MESSAGES", "1")
+        websocket = FakeWebSocket(10, replies=2)
+
+        assert run_session(websocket) == []
+        assert len(websocket.sent) == 2
+
+    def test_queued_messages_dropped_after_disconnect(self):
+        """Test that messages still queued when the reader sees a disconnect aren't answered."""
+        websocket = FakeWebSocket(5)
+
+        assert run_session(websocket) == []
+        assert websocket.late_sends == 0
+        assert len(websocket.sent) < 5
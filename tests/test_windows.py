@@ -0,0 +1,79 @@
+import pytest
+import sys
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.api.app import app
+from src.sentiment_analysis.windows import RollingSentimentAggregator
+
+
+class TestRollingWindows:
+
+    def setup_method(self):
+        """Set up the test environment before each test method."""
+        self.aggregator = RollingSentimentAggregator(windows=(60, 900, 3600))
+        self.start = 1_000_000.0
+
+    def test_windows_expire(self):
+        """Test that comments drop out of each window as time passes."""
+        self.aggregator.add_many("post", ["positive", "negative"], [0.8, -0.4], timestamp=self.start)
+        self.aggregator.add("post", "neutral", 0.0, timestamp=self.start + 120)
+
+        one_min, fifteen_min, one_hour = self.aggregator.summary("post", timestamp=self.start + 130)
+        assert one_min["total_comments"] == 1
+        assert one_min["neutral_comments"] == 1
+        assert fifteen_min["total_comments"] == 3
+        assert fifteen_min["average_compound"] == pytest.approx(0.4 / 3)
+        assert one_hour["total_comments"] == 3
+
+        later = self.aggregator.summary("post", timestamp=self.start + 2000)
+        assert [w["total_comments"] for w in later] == [0, 0, 3]
+
+        expired = self.aggregator.summary("post", timestamp=self.start + 4000)
+        assert [w["total_comments"] for w in expired] == [0, 0, 0]
+
+    def test_ring_buffer_reuses_buckets(self):
+        """Test that a wrapped-around bucket is reset before reuse."""
+        self.aggregator.add("post", "positive", 1.0, timestamp=self.start)
+        self.aggregator.add("post", "negative", -1.0, timestamp=self.start + 60)
+
+        one_min = self.aggregator.summary("post", timestamp=self.start + 60)[0]
+        assert one_min["total_comments"] == 1
+        assert one_min["negative_comments"] == 1
+
+    def test_keys_are_independent(self):
+        """Test that posts are aggregated separately and unknown keys are empty."""
+        self.aggregator.add("a", "positive", 0.5, timestamp=self.start)
+
+        assert self.aggregator.summary("a", timestamp=self.start)[0]["total_comments"] == 1
+        assert self.aggregator.summary("b", timestamp=self.start)[0]["total_comments"] == 0
+
+    def test_max_keys(self):
+        """Test that the least recently updated key is dropped when full."""
+        aggregator = RollingSentimentAggregator(max_keys=2)
+        for key in ("a", "b", "c"):
+            aggregator.add(key, "neutral", 0.0, timestamp=self.start)
+
+        assert aggregator.keys() == ["b", "c"]
+
+    def test_stream_endpoints(self):
+        """Test pushing comments to a stream and reading its windows."""
+        client = TestClient(app)
+        response = client.post(
+            "/sentiment/stream/post-123",
+            json={"comments": ["This is amazing! I love it!", "This is terrible, I hate it."]}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["stream_id"] == "post-123"
+        assert [w["window_seconds"] for w in data["windows"]] == [60, 900, 3600]
+        assert data["windows"][0]["total_comments"] == 2
+
+        data = client.get("/sentiment/stream/post-123").json()
+        assert data["windows"][0]["positive_comments"] == 1
+        assert data["windows"][0]["negative_comments"] == 1